@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import gzip
+import json
+import os
+from queue import Queue
+from threading import Thread, Lock
+
+from logs import Logger
+
+
+class PageArchive:
+    """
+    Arquivo das páginas (html) dos artigos, gravadas exatamente como foram recebidas, sem reformatação.
+
+    A gravação é feita por uma thread própria, iniciada na primeira página, de modo que os workers de download apenas
+    enfileiram a página e seguem para a próxima. Cada página é gravada com os bytes originais da resposta (ou o DOM
+    renderizado, quando baixada pelo navegador), opcionalmente comprimida (gzip), e registrada no índice do diretório
+    (JSON Lines) com a url, a url final, a data/hora do download, a codificação e o tamanho.
+
+    Constants:
+        - INDEX_FILENAME (str): Nome do arquivo de índice das páginas gravadas.
+        - QUEUE_SIZE (int): Quantidade máxima de páginas aguardando gravação.
+        - COMPRESS_LEVEL (int): Nível de compressão do gzip (1 a 9).
+    """
+
+    INDEX_FILENAME = 'index.jsonl'
+    QUEUE_SIZE = 100
+    COMPRESS_LEVEL = 6
+
+    def __init__(self, dir_path: str, compress: bool = True):
+        self.dir_path = dir_path
+        self.compress = compress
+        self._queue = Queue(maxsize=PageArchive.QUEUE_SIZE)
+        self._writer = None
+        self._lock = Lock()
+
+    def add(self, file_name: str, page_source: str, document_url: str):
+        """
+        Enfileira a página para gravação.
+
+        :param file_name: Nome do arquivo, sem extensão.
+        :param page_source: O código-fonte da página (preferencialmente um `PageSource`, com os dados da captura).
+        :param document_url: A url requisitada.
+        """
+        with self._lock:
+            if not self._writer:
+                self._writer = Thread(target=self._write_loop, name='page-archive-writer')
+                self._writer.start()
+        self._queue.put((file_name, page_source, document_url))
+
+    def close(self):
+        """Aguarda a gravação das páginas enfileiradas e encerra a thread de gravação."""
+        with self._lock:
+            writer = self._writer
+            self._writer = None
+        if writer:
+            self._queue.put(None)
+            writer.join()
+
+    def _write_loop(self):
+        while True:
+            page = self._queue.get()
+            if page is None:
+                break
+            try:
+                self._write(*page)
+            except Exception as err:
+                Logger.error(f"PAGE ARCHIVE: {str(err)}")
+
+    def _write(self, file_name: str, page_source: str, document_url: str):
+        encoding = getattr(page_source, 'encoding', None) or 'utf-8'
+        content = getattr(page_source, 'content', None)
+        raw = content is not None
+        if not raw:
+            content = str(page_source).encode(encoding)
+
+        os.makedirs(self.dir_path, exist_ok=True)
+        file_name = f'{file_name}.html.gz' if self.compress else f'{file_name}.html'
+        if self.compress:
+            with gzip.open(os.path.join(self.dir_path, file_name), 'wb', compresslevel=PageArchive.COMPRESS_LEVEL) as arq:
+                arq.write(content)
+        else:
+            with open(os.path.join(self.dir_path, file_name), 'wb') as arq:
+                arq.write(content)
+
+        with open(os.path.join(self.dir_path, PageArchive.INDEX_FILENAME), 'a', encoding='utf-8') as index:
+            index.write(json.dumps({
+                'file': file_name,
+                'url': document_url,
+                'final_url': getattr(page_source, 'final_url', None) or document_url,
+                'fetched_at': getattr(page_source, 'fetched_at', None),
+                'encoding': encoding,
+                'raw': raw,
+                'size': len(content),
+            }, ensure_ascii=False) + '\n')
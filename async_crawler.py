@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from typing import List
+
+import aiohttp
+
+from browser_session import BrowserSessionManager
+from fetcher import AsyncHttpFetcher, FallbackFetcher
+from logs import Logger
+from scheduler import PolitenessScheduler
+from scraper import WebScraper
+
+
+class AsyncCrawler:
+    """
+    Executor assíncrono (asyncio) alternativo ao `WebScraper.start`.
+
+    A busca de links e o download dos artigos de todos os scrapers informados são executados como corrotinas, limitadas por
+    um semáforo por host e por um limite global de requisições simultâneas, e cada requisição respeita o limite de taxa do
+    host no `PolitenessScheduler`. Cada requisição obtém primeiro a vaga do host, depois a ficha do host no scheduler e só
+    então a vaga global, mantida apenas durante a requisição: um host limitado (ex.: a paginação do G1) nunca ocupa as
+    vagas globais que os downloads de outro host poderiam usar.
+
+    Os downloads seguem as mesmas regras dos workers síncronos do scraper: novas tentativas pela `RetryPolicy`, disjuntor
+    (`CircuitBreaker`) do site, arquivo de falhas, requisições condicionais e verificação de páginas sem alterações no modo
+    de atualização. O processamento das páginas baixadas reutiliza os métodos de extração e gravação de cada scraper,
+    executados num pool de threads (e no pool de processos de extração do scraper, se configurado) para não bloquear o
+    event loop. Cada scraper é preparado com `WebScraper.begin_run` e encerrado com `WebScraper.finish_run`.
+
+    Artigos cuja resposta HTTP não contém os seletores obrigatórios do site são baixados ao final pelo navegador,
+    através dos workers síncronos do próprio scraper.
+    """
+
+    def __init__(self, scrapers: List[WebScraper], max_in_flight: int = 100, max_per_host: int = 8, process_workers: int = 4):
+        self._scrapers = scrapers
+        self._max_in_flight = max_in_flight
+        self._max_per_host = max_per_host
+        self._process_workers = process_workers
+        self._in_flight = None
+        self._host_semaphores = {}
+        self._executor = None
+        self._fetcher = None
+
+    def run(self, search_terms: List[str]):
+        """
+        Executa a busca e o download dos artigos dos termos informados em todos os scrapers.
+
+        :param search_terms: Lista com os termos de busca.
+        :return: Um dicionário, por scraper, com as estatísticas da execução (`WebScraper.finish_run`) e a quantidade de
+            artigos enviados ao navegador (`browser`).
+        """
+        try:
+            return asyncio.run(self._crawl(search_terms))
+        finally:
+            # os navegadores só são abertos para os artigos enviados ao navegador, e são encerrados ao final da execução
+            BrowserSessionManager.get_instance().shutdown()
+
+    async def _crawl(self, search_terms: List[str]):
+        self._in_flight = asyncio.Semaphore(self._max_in_flight)
+        self._host_semaphores = {}
+        self._fetcher = AsyncHttpFetcher(pool_size=self._max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=self._process_workers, thread_name_prefix='async-crawler')
+        for scraper in self._scrapers:
+            scraper.begin_run()
+        await self._fetcher.open()
+        try:
+            fallbacks = await asyncio.gather(*[self._crawl_scraper(scraper, search_terms) for scraper in self._scrapers])
+        finally:
+            await self._fetcher.close()
+            self._executor.shutdown(wait=True)
+
+        summary = {}
+        for scraper, fallback_urls in zip(self._scrapers, fallbacks):
+            try:
+                if fallback_urls:
+                    self._download_with_browser(scraper, fallback_urls)
+            finally:
+                stats = scraper.finish_run()
+            stats['browser'] = len(fallback_urls)
+            summary[scraper.get_scrapper_name()] = stats
+            Logger.info(f"[{scraper.get_scrapper_name()}]: FINISHED (ASYNC) {stats}")
+        return summary
+
+    def _get_host_semaphore(self, url: str):
+        host = urllib.parse.urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self._max_per_host)
+        return self._host_semaphores[host]
+
+    async def _fetch(self, scraper: WebScraper, url: str, headers=None):
+        scheduler = scraper.get_scheduler()
+        async with self._get_host_semaphore(url):
+            await scheduler.acquire_async(url)
+            async with self._in_flight:
+                try:
+                    return await self._fetcher.fetch(url, headers)
+                except aiohttp.ClientResponseError as err:
+                    if err.status in PolitenessScheduler.THROTTLING_STATUS:
+                        scheduler.retry_after(url, err.headers.get('Retry-After') if err.headers else None)
+                    raise
+
+    async def _download_with_retry(self, scraper: WebScraper, page_url: str):
+        # mesmas regras de `WebScraper._download_with_retry`, aguardando sem bloquear o event loop
+        document_url = scraper._get_document_url(page_url)
+        headers = await self._run_blocking(scraper._get_request_headers, document_url)
+        circuit_breaker = scraper.get_circuit_breaker()
+        attempt = 1
+        while True:
+            pause = scraper._get_circuit_pause(page_url)
+            while pause > 0:
+                await asyncio.sleep(pause)
+                pause = circuit_breaker.retry_in()
+            try:
+                Logger.info(f"DOWNLOADING ARTICLE: {document_url}")
+                page_source = await self._fetch(scraper, document_url, headers)
+                circuit_breaker.record_success()
+                return document_url, page_source
+            except Exception as err:
+                delay = scraper._record_attempt_failure(page_url, err, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _run_blocking(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _crawl_scraper(self, scraper: WebScraper, search_terms: List[str]):
+        Logger.info(f"[{scraper.get_scrapper_name()}]: STARTED (ASYNC)")
+        fallback_urls = []
+        seen = set()
+        downloads = []
+        known_urls = await self._run_blocking(scraper._load_known_urls) if scraper.is_incremental() else frozenset()
+
+        async def discover(term: str):
+            Logger.info(f'GETTING ARTICLES FOR SEARCH TERM="{term}" ')
+            page = scraper.FIRST_LISTING_PAGE
+            while True:
+                try:
+                    listing_url = scraper._get_listing_url(term, page)
+                    page_source = await self._fetch(scraper, listing_url)
+                    links, has_next = await self._run_blocking(scraper._parse_listing, page_source, listing_url)
+                except Exception as err:
+                    Logger.error(f"[{scraper.get_scrapper_name()}]: {str(err)}")
+                    return
+                for page_url in links:
+                    if scraper._accept_link(page_url, seen, known_urls):
+                        Logger.info(f'\tARTICLE FOUND: {page_url}')
+                        downloads.append(asyncio.create_task(download(page_url)))
+                if not has_next:
+                    return
+                page += 1
+
+        async def download(page_url: str):
+            try:
+                document_url, page_source = await self._download_with_retry(scraper, page_url)
+                if await self._run_blocking(scraper._is_unchanged_page, document_url, page_source):
+                    scraper._record_unchanged(document_url)
+                    return
+                if not await self._run_blocking(FallbackFetcher.has_selectors, page_source, scraper.DOCUMENT_REQUIRED_SELECTORS):
+                    Logger.warn(f"\tREQUIRED SELECTORS NOT FOUND, DEFERRING TO BROWSER: {document_url}")
+                    fallback_urls.append(page_url)
+                    return
+            except Exception as err:
+                scraper._record_download(page_url, err)
+                Logger.error(f"[{scraper.get_scrapper_name()}]: {str(err)}")
+                return
+            future = await self._run_blocking(scraper._submit_document, document_url, page_source)
+            # a extração pode estar no pool de processos do scraper: o resultado é aguardado sem bloquear o event loop
+            await asyncio.wait([asyncio.wrap_future(future)])
+            await self._run_blocking(scraper._complete_document, 0, page_url, document_url, page_source, future)
+
+        await asyncio.gather(*[discover(term) for term in search_terms])
+        # os downloads são criados durante a busca, por isso só são aguardados depois que ela termina
+        await asyncio.gather(*downloads)
+        return fallback_urls
+
+    @staticmethod
+    def _download_with_browser(scraper: WebScraper, page_urls: List[str]):
+        Logger.info(f"[{scraper.get_scrapper_name()}]: DOWNLOADING {len(page_urls)} ARTICLES WITH THE BROWSER")
+        page_queue = Queue()
+        for page_url in page_urls:
+            page_queue.put(page_url)
+        page_queue.put(None)
+        scraper._download_worker(1, page_queue, scraper._create_browser_fetcher())
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Compara o tempo e o pico de memória da leitura (parse) das páginas salvas em disco, entre a leitura completa com o
+`html.parser` (comportamento anterior) e a leitura direcionada do `HtmlParser` de cada scraper, com e sem a extração dos
+campos (`ArticleExtractor`). As páginas de resultados da busca (arquivos `listing*`) são medidas com as regras da listagem
+e as demais com as regras do artigo.
+
+Por padrão são utilizadas as páginas de exemplo de cada site, em `fixtures/<site>`.
+
+Uso:
+    python benchmark_parser.py <acritica|portalamazonia|g1> [diretorio_com_paginas_html] [repeticoes]
+"""
+import gzip
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+from bs4 import BeautifulSoup
+
+from scraper import AcriticaScraper, PortalAmazoniaScraper, G1Scraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+LISTING_PREFIX = 'listing'
+
+SCRAPERS = {
+    'acritica': AcriticaScraper,
+    'portalamazonia': PortalAmazoniaScraper,
+    'g1': G1Scraper,
+}
+
+
+def measure(parse, page_source: str, repeat: int):
+    started = perf_counter()
+    for _ in range(repeat):
+        parse(page_source)
+    elapsed = (perf_counter() - started) / repeat
+
+    tracemalloc.start()
+    parse(page_source)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(site: str, fixtures_dir: str, repeat: int):
+    scraper = SCRAPERS[site](0, 0, 0, False, False, False)
+    full_parser = lambda page_source: BeautifulSoup(page_source, 'html.parser')
+    document_parsers = {
+        'html.parser (full)': full_parser,
+        'lxml (targeted)': scraper.RULES.document.parser.parse,
+        'lxml + extractor': scraper.RULES.document.extract,
+    }
+    listing_parsers = {
+        'html.parser (full)': full_parser,
+        'lxml (targeted)': scraper.RULES.listing.parser.parse,
+        'lxml + extractor': scraper.RULES.listing.extract,
+    }
+    file_names = sorted(x for x in os.listdir(fixtures_dir) if x.endswith('.html') or x.endswith('.html.gz'))
+    if not file_names:
+        print(f'NO .html/.html.gz FILES FOUND IN {fixtures_dir}')
+        return
+
+    totals = {name: [0.0, 0] for name in document_parsers}
+    print(f"{'PAGE':<50} {'PARSER':<20} {'TIME (ms)':>10} {'PEAK (KB)':>10}")
+    for file_name in file_names:
+        # as páginas gravadas pelo PageArchive podem estar comprimidas
+        open_file = gzip.open if file_name.endswith('.gz') else open
+        with open_file(os.path.join(fixtures_dir, file_name), 'rt', encoding='utf-8') as arq:
+            page_source = arq.read()
+        parsers = listing_parsers if file_name.startswith(LISTING_PREFIX) else document_parsers
+        for name, parse in parsers.items():
+            elapsed, peak = measure(parse, page_source, repeat)
+            totals[name][0] += elapsed
+            totals[name][1] = max(totals[name][1], peak)
+            print(f'{file_name[:50]:<50} {name:<20} {elapsed * 1000:>10.2f} {peak / 1024:>10.0f}')
+
+    print()
+    for name, (elapsed, peak) in totals.items():
+        print(f'{name:<20} MEAN={elapsed / len(file_names) * 1000:.2f}ms/PAGE MAX PEAK={peak / 1024:.0f}KB')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] not in SCRAPERS:
+        print(__doc__)
+        sys.exit(1)
+    main(
+        sys.argv[1],
+        sys.argv[2] if len(sys.argv) > 2 else os.path.join(FIXTURES_DIR, sys.argv[1]),
+        int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    )
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+import atexit
+import json
+import os
+import shutil
+from threading import Lock
+
+from selenium import webdriver
+
+from logs import Logger
+
+
+class BrowserSessionManager:
+    """
+    Classe responsável por fornecer navegadores (Chrome) já abertos aos scrapers e por reaproveitá-los entre eles.
+
+    O gerenciador segue o pattern Singleton (`get_instance`): todos os scrapers de um processo compartilham o mesmo pool
+    de navegadores. O pool não é compartilhado entre processos: no `MultiSiteOrchestrator` cada portal é executado num
+    processo próprio, com os seus próprios navegadores, e o reaproveitamento se dá entre os workers e as páginas do mesmo
+    portal. Os navegadores só são compartilhados entre portais quando eles são executados no mesmo processo (ex.:
+    `AsyncCrawler`, que baixa pelo navegador os artigos de todos os portais ao final). Um navegador devolvido com `release` fica disponível para o próximo `acquire`, e é reciclado (fechado)
+    quando atinge o limite de páginas carregadas ou de memória (RSS), para limitar o crescimento de memória em buscas longas.
+
+    O caminho do chromedriver é resolvido uma única vez, na seguinte ordem: variável de ambiente `CHROMEDRIVER_PATH`,
+    arquivo de cache local, `chromedriver` no PATH do sistema e, por último, download pelo `webdriver_manager` (o único
+    passo que requer acesso à internet). O caminho encontrado é gravado no cache, de modo que as próximas execuções
+    funcionam offline.
+
+    Constants:
+        - DRIVER_PATH_ENV (str): Nome da variável de ambiente com o caminho do chromedriver.
+        - DRIVER_CACHE_FILENAME (str): Nome do arquivo de cache com o caminho do chromedriver.
+        - MAX_PAGES (int): Quantidade padrão de páginas carregadas antes de reciclar um navegador.
+        - MAX_RSS_MB (int): Memória padrão (MB), somada de todos os processos do navegador, antes de reciclá-lo.
+    """
+
+    DRIVER_PATH_ENV = 'CHROMEDRIVER_PATH'
+    DRIVER_CACHE_FILENAME = 'driver_cache.json'
+    MAX_PAGES = 200
+    MAX_RSS_MB = 1500
+    __instance = None
+    __instance_lock = Lock()
+
+    def __init__(self, max_pages: int = MAX_PAGES, max_rss_mb: int = MAX_RSS_MB):
+        self._max_pages = max_pages
+        self._max_rss_mb = max_rss_mb
+        self._driver_path = None
+        self._idle = {}
+        self._pages = {}
+        self._lock = Lock()
+
+    @classmethod
+    def get_instance(cls):
+        with cls.__instance_lock:
+            if not cls.__instance:
+                cls.__instance = BrowserSessionManager()
+                atexit.register(cls.__instance.shutdown)
+            return cls.__instance
+
+    def get_driver_path(self):
+        """Retorna o caminho do chromedriver, resolvendo-o apenas na primeira chamada."""
+        with self._lock:
+            if not self._driver_path:
+                self._driver_path = BrowserSessionManager._resolve_driver_path()
+                Logger.info(f"CHROMEDRIVER: {self._driver_path}")
+            return self._driver_path
+
+    @staticmethod
+    def _resolve_driver_path():
+        driver_path = os.environ.get(BrowserSessionManager.DRIVER_PATH_ENV)
+        if driver_path and os.path.exists(driver_path):
+            return driver_path
+
+        if os.path.exists(BrowserSessionManager.DRIVER_CACHE_FILENAME):
+            with open(BrowserSessionManager.DRIVER_CACHE_FILENAME, 'r', encoding='utf-8') as cache_file:
+                driver_path = json.load(cache_file).get('driver_path')
+            if driver_path and os.path.exists(driver_path):
+                return driver_path
+
+        driver_path = shutil.which('chromedriver')
+        if not driver_path:
+            # importado aqui pois só é necessário quando o driver ainda não está disponível localmente
+            from webdriver_manager.chrome import ChromeDriverManager
+            driver_path = ChromeDriverManager().install()
+
+        with open(BrowserSessionManager.DRIVER_CACHE_FILENAME, 'w', encoding='utf-8') as cache_file:
+            json.dump({'driver_path': driver_path}, cache_file)
+        return driver_path
+
+    def acquire(self, profile):
+        """
+        Retorna um navegador configurado com o perfil informado, reaproveitando um navegador ocioso quando existir.
+
+        :param profile: O `BrowserProfile` do navegador.
+        :return: O objeto `WebDriver` do navegador.
+        """
+        with self._lock:
+            idle = self._idle.get(profile.get_key())
+            if idle:
+                return idle.pop()
+        browser = webdriver.Chrome(self.get_driver_path(), options=profile.get_options())
+        profile.configure(browser)
+        with self._lock:
+            self._pages[id(browser)] = 0
+        return browser
+
+    def release(self, browser, profile):
+        """Devolve ao pool um navegador obtido com `acquire`, para que seja reaproveitado."""
+        with self._lock:
+            self._idle.setdefault(profile.get_key(), []).append(browser)
+
+    def page_loaded(self, browser):
+        """
+        Registra o carregamento de uma página pelo navegador e o recicla caso tenha atingido os limites configurados.
+
+        :param browser: O navegador que carregou a página.
+        :return: `True` se o navegador foi fechado e não deve mais ser utilizado.
+        """
+        with self._lock:
+            self._pages[id(browser)] = self._pages.get(id(browser), 0) + 1
+            pages = self._pages[id(browser)]
+        rss_mb = BrowserSessionManager._get_rss_mb(browser)
+        if pages >= self._max_pages or rss_mb >= self._max_rss_mb:
+            Logger.info(f"RECYCLING BROWSER AFTER {pages} PAGES ({rss_mb:.0f}MB)")
+            self.discard(browser)
+            return True
+        return False
+
+    def discard(self, browser):
+        """Fecha o navegador informado, sem devolvê-lo ao pool."""
+        with self._lock:
+            self._pages.pop(id(browser), None)
+        try:
+            browser.quit()
+        except Exception as err:
+            Logger.error(str(err))
+
+    def shutdown(self):
+        """Fecha todos os navegadores ociosos do pool."""
+        with self._lock:
+            browsers = [browser for idle in self._idle.values() for browser in idle]
+            self._idle = {}
+        for browser in browsers:
+            self.discard(browser)
+
+    @staticmethod
+    def _get_rss_mb(browser):
+        # soma a memória residente do chromedriver e de todos os processos filhos (chrome), lendo o /proc (Linux)
+        try:
+            pids = [browser.service.process.pid]
+        except AttributeError:
+            return 0.0
+        rss_kb = 0
+        while pids:
+            pid = pids.pop()
+            try:
+                with open(f'/proc/{pid}/status', 'r') as status:
+                    for line in status:
+                        if line.startswith('VmRSS:'):
+                            rss_kb += int(line.split()[1])
+                            break
+                for tid in os.listdir(f'/proc/{pid}/task'):
+                    with open(f'/proc/{pid}/task/{tid}/children', 'r') as children:
+                        pids.extend(int(child) for child in children.read().split())
+            except (OSError, ValueError):
+                continue
+        return rss_kb / 1024
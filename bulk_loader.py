@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+import csv
+import tempfile
+from threading import Lock
+from time import perf_counter
+
+from database import DatabaseManager, ArticleController, ArticleTopicController, ArticleHyperlinkController, \
+    ArticleCategoryController, ArticleMediaController
+from logs import Logger
+from model import Article, ArticleTopic, ArticleHyperlink, ArticleCategory, ArticleMedia, ArticleBundle
+
+
+class BulkLoader:
+    """
+    Carga em massa de artigos (ex.: cargas históricas), alternativa à gravação artigo a artigo do
+    `ArticleBundleController`.
+
+    Os registros dos artigos e das entidades relacionadas são acumulados em arquivos temporários (CSV) por tabela, mantidos
+    em memória até `SPOOL_MAX_SIZE` bytes e gravados em disco a partir daí. A cada `BATCH_SIZE` artigos (e em `close`) os
+    arquivos são enviados ao SGBD com `COPY ... FROM STDIN` para tabelas temporárias (staging) e incorporados às tabelas
+    definitivas numa única transação, ignorando os registros já existentes (mesma chave). A quantidade de registros por
+    segundo de cada carga é registrada no log, com a quantidade de artigos gravados e de artigos ignorados por já estarem
+    no banco de dados. Cada artigo pode ser acumulado com um contexto (ex.: a url da página), entregue à função `on_saved`
+    depois que o artigo for gravado, à função `on_skipped` se ele já estava gravado (e não foi alterado), ou à função
+    `on_failure` (junto com o erro) se a carga do lote falhar.
+
+    Apenas o acúmulo dos registros é serializado: o lote completo é retirado do acumulador e carregado fora do lock, de
+    modo que os demais workers continuam acumulando artigos durante a carga.
+
+    Constants:
+        - BATCH_SIZE (int): Quantidade de artigos acumulados antes de cada carga.
+        - SPOOL_MAX_SIZE (int): Tamanho (em bytes) a partir do qual o arquivo temporário de uma tabela é gravado em disco.
+        - NULL_VALUE (str): Representação do valor nulo nos arquivos CSV.
+    """
+
+    BATCH_SIZE = 5000
+    SPOOL_MAX_SIZE = 16 * 1024 * 1024
+    NULL_VALUE = r'\N'
+
+    # tabela definitiva, entidade e chave única de cada tabela, na ordem de incorporação (o artigo antes das entidades)
+    TABLES = (
+        (ArticleController, Article, 'article_url'),
+        (ArticleTopicController, ArticleTopic, None),
+        (ArticleHyperlinkController, ArticleHyperlink, None),
+        (ArticleCategoryController, ArticleCategory, None),
+        (ArticleMediaController, ArticleMedia, None),
+    )
+
+    def __init__(self, batch_size: int = BATCH_SIZE, on_saved=None, on_skipped=None, on_failure=None):
+        self.batch_size = batch_size
+        self._on_saved = on_saved
+        self._on_skipped = on_skipped
+        self._on_failure = on_failure
+        self._files = None
+        self._contexts = []
+        self._articles = 0
+        self._rows = 0
+        self._total_rows = 0
+        self._total_seconds = 0.0
+        self._lock = Lock()
+        self._totals_lock = Lock()
+
+    @staticmethod
+    def _get_columns(entity):
+        return [name for name in entity.attr_list() if name != getattr(entity, 'KEY_NAME', None)]
+
+    def _new_files(self):
+        files = {}
+        for controller, entity, _ in BulkLoader.TABLES:
+            spool = tempfile.SpooledTemporaryFile(
+                max_size=BulkLoader.SPOOL_MAX_SIZE, mode='w+', newline='', encoding='utf-8'
+            )
+            files[controller.get_table_name()] = (spool, csv.writer(spool))
+        return files
+
+    def _write(self, controller, entity, elements):
+        spool, writer = self._files[controller.get_table_name()]
+        columns = BulkLoader._get_columns(entity)
+        for element in elements:
+            writer.writerow([
+                BulkLoader.NULL_VALUE if getattr(element, name) is None else getattr(element, name) for name in columns
+            ])
+        self._rows += len(elements)
+
+    def add(self, bundle: ArticleBundle, context=None):
+        """Acumula os registros do artigo e das suas entidades relacionadas, carregando o lote quando ele estiver completo."""
+        batch = None
+        with self._lock:
+            if self._files is None:
+                self._files = self._new_files()
+            for (controller, entity, _), elements in zip(BulkLoader.TABLES, (
+                [bundle.article], bundle.topics, bundle.hyperlinks, bundle.categories, bundle.medias
+            )):
+                self._write(controller, entity, elements)
+            self._articles += 1
+            self._contexts.append((bundle.article.article_url, context))
+            if self._articles >= self.batch_size:
+                batch = self._take_batch()
+        if batch:
+            self._load(*batch)
+
+    def flush(self):
+        """Carrega os registros acumulados."""
+        with self._lock:
+            batch = self._take_batch()
+        self._load(*batch)
+
+    def close(self):
+        """Carrega os registros acumulados e registra no log o resumo de todas as cargas."""
+        self.flush()
+        with self._totals_lock:
+            rows, seconds = self._total_rows, self._total_seconds
+        Logger.info(f"BULK LOAD: {rows} ROWS IN {seconds:.1f}s ({rows / seconds if seconds else 0:.0f} ROWS/s)")
+
+    def _take_batch(self):
+        # retira o lote do acumulador (sob o lock), para que ele seja carregado fora do lock
+        batch = self._files, self._articles, self._rows, self._contexts
+        self._files, self._articles, self._rows, self._contexts = None, 0, 0, []
+        return batch
+
+    def _load(self, files, articles: int, rows: int, contexts):
+        if not files:
+            return
+        started = perf_counter()
+        inserted_rows = 0
+        saved_urls = set()
+        try:
+            with DatabaseManager.transaction(DatabaseManager.POSTGRESQL_DB) as cursor:
+                for controller, entity, key_name in BulkLoader.TABLES:
+                    table_name = controller.get_table_name()
+                    count, keys = BulkLoader._copy_and_merge(cursor, table_name, entity, key_name, files[table_name][0])
+                    inserted_rows += count
+                    if key_name:
+                        saved_urls = keys
+        except Exception as error:
+            Logger.error(f"BULK LOAD OF {articles} ARTICLES FAILED: {str(error)}")
+            if self._on_failure:
+                for _, context in contexts:
+                    self._on_failure(context, error)
+            return
+        finally:
+            for spool, _ in files.values():
+                spool.close()
+        seconds = perf_counter() - started
+        with self._totals_lock:
+            self._total_rows += inserted_rows
+            self._total_seconds += seconds
+        saved = [context for article_url, context in contexts if article_url in saved_urls]
+        skipped = [context for article_url, context in contexts if article_url not in saved_urls]
+        Logger.info(
+            f"BULK LOAD: {len(saved)} ARTICLES SAVED, {len(skipped)} ALREADY IN DATABASE, {inserted_rows}/{rows} ROWS "
+            f"IN {seconds:.1f}s ({inserted_rows / seconds if seconds else 0:.0f} ROWS/s)"
+        )
+        for callback, batch_contexts in ((self._on_saved, saved), (self._on_skipped, skipped)):
+            if callback:
+                for context in batch_contexts:
+                    callback(context)
+
+    @staticmethod
+    def _copy_and_merge(cursor, table_name: str, entity, key_name: str, spool):
+        """
+        Copia o arquivo para a tabela temporária e incorpora os registros novos à tabela definitiva. Retorna a quantidade de
+        registros incorporados e, para a tabela com chave única, o conjunto das chaves incorporadas.
+        """
+        columns = ', '.join(BulkLoader._get_columns(entity))
+        staging_table = f'staging_{table_name}'
+        # tabela temporária sem restrições, com as mesmas colunas da definitiva, descartada ao final da transação
+        cursor.execute(f'CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS SELECT {columns} FROM {table_name} WITH NO DATA')
+        spool.seek(0)
+        cursor.copy_expert(
+            f"COPY {staging_table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{BulkLoader.NULL_VALUE}')", spool
+        )
+        if key_name:
+            # um artigo repetido no lote é incorporado uma única vez
+            query = f'INSERT INTO {table_name} ({columns}) SELECT DISTINCT ON ({key_name}) {columns} FROM {staging_table}'
+        else:
+            # as entidades de artigos que não estão na tabela de artigos são descartadas
+            query = (
+                f'INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {staging_table} s '
+                f'WHERE EXISTS (SELECT 1 FROM {ArticleController.get_table_name()} a WHERE a.article_url = s.article_url)'
+            )
+        if not key_name:
+            cursor.execute(f'{query} ON CONFLICT DO NOTHING')
+            return cursor.rowcount, None
+        cursor.execute(f'{query} ON CONFLICT DO NOTHING RETURNING {key_name}')
+        keys = {row[0] for row in cursor.fetchall()}
+        return len(keys), keys
@@ -1,6 +1,6 @@
 CREATE TABLE IF NOT EXISTS article
 (
-    article_id varchar(40) PRIMARY KEY NOT NULL,
+    article_id integer PRIMARY KEY GENERATED ALWAYS AS IDENTITY,
     article_url text UNIQUE NOT NULL,
     site_name text NOT NULL,
     published timestamp,
@@ -59,4 +59,29 @@ CREATE TABLE IF NOT EXISTS article_category
     description text NOT NULL,
     UNIQUE (category_source, article_url),
     FOREIGN KEY (article_url) REFERENCES article(article_url)
-);
\ No newline at end of file
+);
+
+-- Migração dos bancos criados antes de article_id ser gerado pelo SGBD: a coluna era varchar(40), sem valor padrão, e os
+-- INSERT que a omitem falhariam. A coluna é convertida em identidade na mesma posição (Article.from_tuple depende da
+-- ordem das colunas), com novos números para os artigos existentes. Nenhuma tabela referencia article_id (as entidades
+-- referenciam article_url), por isso as demais tabelas não mudam. Em bancos já convertidos o bloco não faz nada.
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'article' AND column_name = 'article_id'
+            AND is_identity = 'NO'
+    ) THEN
+        CREATE TEMPORARY SEQUENCE article_id_migration;
+        ALTER TABLE article ALTER COLUMN article_id DROP DEFAULT;
+        ALTER TABLE article ALTER COLUMN article_id TYPE integer USING nextval('article_id_migration');
+        ALTER TABLE article ALTER COLUMN article_id ADD GENERATED ALWAYS AS IDENTITY;
+        PERFORM setval(
+            pg_get_serial_sequence('article', 'article_id'),
+            (SELECT COALESCE(MAX(article_id), 0) + 1 FROM article),
+            false
+        );
+        DROP SEQUENCE article_id_migration;
+    END IF;
+END
+$$;
@@ -1,32 +1,192 @@
 # -*- coding: utf-8 -*-
+from collections import deque
 from configparser import ConfigParser
+from contextlib import contextmanager
+from threading import Condition, Lock
+from time import perf_counter, monotonic
 from typing import List
 
 import psycopg2
 import os
 
-from psycopg2 import extras
+from psycopg2 import extras, extensions
 
 from logs import Logger
-from model import Article, ArticleTopic, ArticleMedia, ArticleHyperlink, ArticleCategory
+from metrics import LatencyHistogram
+from model import Article, ArticleTopic, ArticleMedia, ArticleHyperlink, ArticleCategory, ArticleBundle
+
+
+class ConnectionPool:
+    """
+    Pool de conexões com o SGBD, que pode ser compartilhado por várias threads: cada conexão é utilizada por uma única
+    thread de cada vez (`connection`), e devolvida ao pool ao final do bloco `with`.
+
+    As primeiras `min_size` conexões são abertas no primeiro uso do pool e as demais sob demanda, até `max_size`. Quando
+    todas as conexões estão em uso, a thread aguarda (no máximo `timeout` segundos) a devolução de uma delas.
+
+    Antes de ser entregue, a conexão é verificada: uma conexão fechada ou ociosa há mais de `HEALTH_CHECK_INTERVAL` segundos
+    que não responde a um `SELECT 1` é descartada e substituída por uma nova (reconexão). Uma conexão devolvida após um erro
+    de comunicação com o SGBD também é descartada, e uma devolvida com uma transação em aberto é desfeita (ROLLBACK).
+
+    Constants:
+        - HEALTH_CHECK_INTERVAL (float): Tempo (em segundos) de ociosidade a partir do qual a conexão é testada antes do uso.
+        - WAIT_LATENCY_NAME (str): Nome do histograma com o tempo de espera por uma conexão livre.
+    """
+
+    HEALTH_CHECK_INTERVAL = 30.0
+    WAIT_LATENCY_NAME = 'DATABASE POOL WAIT'
+
+    def __init__(self, connect, min_size: int = 1, max_size: int = 10, timeout: float = 30.0):
+        """
+        :param connect: Função sem argumentos que abre uma nova conexão com o SGBD.
+        :param min_size: Quantidade de conexões abertas no primeiro uso do pool.
+        :param max_size: Quantidade máxima de conexões abertas ao mesmo tempo.
+        :param timeout: Tempo máximo (em segundos) de espera por uma conexão livre.
+        """
+        self._connect = connect
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.timeout = timeout
+        self._idle = deque()
+        self._size = 0
+        self._started = False
+        self._closed = False
+        self._condition = Condition(Lock())
+
+    def _open(self):
+        connection = self._connect()
+        connection.autocommit = True
+        return connection
+
+    @staticmethod
+    def _discard(connection):
+        try:
+            if not connection.closed:
+                connection.close()
+        except Exception as error:
+            Logger.warn(f"ERROR CLOSING DATABASE CONNECTION: {str(error)}")
+
+    @staticmethod
+    def _is_healthy(connection, idle_since: float):
+        if connection.closed:
+            return False
+        if monotonic() - idle_since < ConnectionPool.HEALTH_CHECK_INTERVAL:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except Exception as error:
+            Logger.warn(f"DATABASE CONNECTION LOST, RECONNECTING: {str(error)}")
+            return False
+
+    def _start(self):
+        # abre as `min_size` primeiras conexões (chamada com o lock adquirido)
+        while self._size < self.min_size:
+            self._idle.append((self._open(), monotonic()))
+            self._size += 1
+        self._started = True
+
+    def _checkout(self):
+        started = perf_counter()
+        with self._condition:
+            if not self._started and not self._closed:
+                self._start()
+            while not self._closed and not self._idle and self._size >= self.max_size:
+                remaining = self.timeout - (perf_counter() - started)
+                if remaining <= 0:
+                    LatencyHistogram.get(ConnectionPool.WAIT_LATENCY_NAME).observe_timeout()
+                    raise TimeoutError(f'NO DATABASE CONNECTION AVAILABLE AFTER {self.timeout}s')
+                self._condition.wait(remaining)
+            if self._closed:
+                raise psycopg2.InterfaceError('DATABASE CONNECTION POOL IS CLOSED')
+            item = self._idle.popleft() if self._idle else None
+            # a vaga é reservada antes de abrir (fora do lock) uma nova conexão
+            if item is None:
+                self._size += 1
+        LatencyHistogram.get(ConnectionPool.WAIT_LATENCY_NAME).observe(perf_counter() - started)
+        if item and ConnectionPool._is_healthy(*item):
+            return item[0]
+        if item:
+            ConnectionPool._discard(item[0])
+        try:
+            return self._open()
+        except Exception:
+            self._release_slot()
+            raise
+
+    def _release_slot(self):
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def _checkin(self, connection, broken: bool = False):
+        if not broken and not connection.closed:
+            status = connection.info.transaction_status
+            if status in (extensions.TRANSACTION_STATUS_INTRANS, extensions.TRANSACTION_STATUS_INERROR):
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute('ROLLBACK')
+                except Exception:
+                    broken = True
+            elif status != extensions.TRANSACTION_STATUS_IDLE:
+                broken = True
+        if broken or connection.closed or self._closed:
+            ConnectionPool._discard(connection)
+            self._release_slot()
+            return
+        with self._condition:
+            self._idle.append((connection, monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """Fornece uma conexão exclusiva (em modo autocommit) durante o bloco `with`, devolvendo-a ao pool ao final."""
+        connection = self._checkout()
+        broken = False
+        try:
+            yield connection
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self._checkin(connection, broken)
+
+    def close(self):
+        """Fecha as conexões livres do pool. As conexões em uso são fechadas quando forem devolvidas."""
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._closed = True
+            self._condition.notify_all()
+        for connection, _ in idle:
+            ConnectionPool._discard(connection)
 
 
 class DatabaseManager:
     """
     Classe responsável pela criação do banco de dados e gerenciamento das conexões com o SGBD.
 
-    As conexões com o SGBD seguem o pattern Singleton.
+    As conexões com o SGBD são fornecidas por um `ConnectionPool` (Singleton), compartilhado pelas threads do processo.
 
     Constants:
         - POSTGRESQL_DB (str): String constante com o nome do SGBD postgresql, para uso na requisição de uma conexão.
         - DATABASE_NAME (str): String constante com o nome do banco de dados utilizado nesta aplicação.
+        - POOL_MIN_SIZE (int): Quantidade de conexões abertas no primeiro uso do pool.
+        - POOL_MAX_SIZE (int): Quantidade máxima de conexões abertas ao mesmo tempo (por processo).
+        - POOL_TIMEOUT (float): Tempo máximo (em segundos) de espera por uma conexão livre.
 
     """
 
     POSTGRESQL_DB = 'postgres'
     DATABASE_NAME = 'news_scraper'
+    POOL_MIN_SIZE = 1
+    POOL_MAX_SIZE = 10
+    POOL_TIMEOUT = 30.0
     __db_config_filename = 'database.ini'
-    __connection = None
+    __pool = None
+    __pool_lock = Lock()
 
     @classmethod
     def __load_connection_params(cls, sgbd_name: str):
@@ -53,33 +213,72 @@ class DatabaseManager:
             raise FileNotFoundError(f'O arquivo {DatabaseManager.__db_config_filename} de configurações para o sgbd {sgbd_name} não foi encontrado!')
 
     @classmethod
-    def get_connection(cls, sgbd_name: str):
+    def get_pool(cls, sgbd_name: str):
         """
-        Esta função é responsável por fonecer o objeto Singleton de conexão com o SGBD.
+        Esta função é responsável por fornecer o objeto Singleton do pool de conexões com o SGBD.
 
-        Caso o objeto de conexão não exista ou a conexão estiver fechada, abre uma nova conexão num novo objeto.
+        Args:
+            sgbd_name (str): Nome do SGDB a ser utilizado (POSTGRESQL_DB).
+        """
+        with DatabaseManager.__pool_lock:
+            if not DatabaseManager.__pool:
+                params = DatabaseManager.__load_connection_params(sgbd_name)
+                DatabaseManager.__pool = ConnectionPool(
+                    lambda: psycopg2.connect(**params),
+                    DatabaseManager.POOL_MIN_SIZE,
+                    DatabaseManager.POOL_MAX_SIZE,
+                    DatabaseManager.POOL_TIMEOUT
+                )
+            return DatabaseManager.__pool
+
+    @classmethod
+    @contextmanager
+    def connection(cls, sgbd_name: str):
+        """
+        Esta função fornece uma conexão do pool, em modo autocommit, de uso exclusivo da thread até o final do bloco `with`.
 
         Args:
-            sgbd_name (str): Nome do SGDB a ser utilizado (POSTGRESQL_DB | MYSQL_DB).
+            sgbd_name (str): Nome do SGDB a ser utilizado (POSTGRESQL_DB).
         """
-        if not DatabaseManager.__connection or DatabaseManager.__connection.closed:
-            DatabaseManager.__connection = psycopg2.connect(**DatabaseManager.__load_connection_params(sgbd_name))
-            DatabaseManager.__connection.autocommit = True
-        return DatabaseManager.__connection
+        with DatabaseManager.get_pool(sgbd_name).connection() as connection:
+            yield connection
 
     @classmethod
     def close_connection(cls):
         """
-        Esta função é responsável por fechar a conexão ativa com o SGBD.
+        Esta função é responsável por fechar as conexões com o SGBD, descartando o pool.
 
-        Caso o objeto de conexão não exista ou a conexão estiver fechada, abre uma nova conexão num novo objeto.
+        As conexões em uso por outras threads são fechadas quando forem devolvidas ao pool.
+        """
+        with DatabaseManager.__pool_lock:
+            pool = DatabaseManager.__pool
+            DatabaseManager.__pool = None
+        if pool:
+            pool.close()
+
+    @classmethod
+    @contextmanager
+    def transaction(cls, sgbd_name: str):
+        """
+        Esta função fornece um cursor cujos comandos são executados numa única transação: confirmada (COMMIT) ao final do
+        bloco `with`, ou desfeita (ROLLBACK) se o bloco lançar uma exceção.
+
+        Como a conexão está em modo autocommit, a transação é aberta explicitamente (BEGIN).
 
         Args:
-            sgbd_name (str): Nome do SGDB a ser utilizado (POSTGRESQL_DB | MYSQL_DB).
+            sgbd_name (str): Nome do SGDB a ser utilizado (POSTGRESQL_DB).
         """
-        if DatabaseManager.__connection and not DatabaseManager.__connection.closed:
-            DatabaseManager.__connection.close()
-        DatabaseManager.__connection = None
+        with DatabaseManager.connection(sgbd_name) as connection:
+            cursor = connection.cursor()
+            cursor.execute('BEGIN')
+            try:
+                yield cursor
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+            finally:
+                cursor.close()
 
     @classmethod
     def create_database(cls, sgbd_name: str):
@@ -104,11 +303,9 @@ class DatabaseManager:
         # lê e executa o script de criação das tabelas do banco de dados
         with open('create_tables.sql', 'r') as db_file:
             sql = ''.join(db_file.readlines())
-            conn = DatabaseManager.get_connection(sgbd_name)
-            cursor = conn.cursor()
-            cursor.execute(sql)
-            conn.commit()
-            conn.close()
+            with DatabaseManager.connection(sgbd_name) as conn:
+                cursor = conn.cursor()
+                cursor.execute(sql)
 
     @classmethod
     def check_connection(cls, sgbd_name: str):
@@ -135,60 +332,162 @@ class DatabaseManager:
 class ModelController:
     """Classe controller que implementa as funções de CRUD de objetos no banco de dados"""
 
+    @staticmethod
+    def _get_insert_columns(row, attr_list, generated_key: str = None):
+        # o campo gerado pelo SGBD (se houver) não recebe valor no INSERT, é retornado por ele (RETURNING)
+        columns = [name for name in attr_list if name != generated_key]
+        values = tuple(value for name, value in zip(attr_list, row) if name != generated_key)
+        return columns, values
+
     @classmethod
-    def _insert_one(cls, row, table_name: str, attr_list):
+    def _insert_one(cls, row, table_name: str, attr_list, generated_key: str = None):
         """
         Esta função recebe um registro (tupla) e o insere na respectiva tabela do banco de dados.
 
         :param row: Uma tupla de valores (registro) a serem inseridos na tabela
         :param table_name: Nome da tabela
         :param attr_list: Uma lista com os nomes dos respectivos atributos (campos da tabela) cujos valores estão no registro.
-        :return:
+        :param generated_key: Nome do campo gerado pelo SGBD, cujo valor é ignorado no registro e retornado pela inserção.
+        :return: O valor gerado do campo `generated_key` (ou `None` em caso de falha) ou, sem campo gerado, um booleano que
+            indica se o registro foi inserido.
         """
         row_count = 0
-        connection = DatabaseManager.get_connection(DatabaseManager.POSTGRESQL_DB)
-        try:
-            # constroi o comando SQL para inserção do registro na tabela
-            fields = ', '.join(attr_list[1:])
-            params = ', '.join(['%s' for _ in attr_list[1:]])
-            query = f"INSERT INTO {table_name} ({fields}) VALUES ({params})"
-            # recupera a conexão com o sgbd
-            cursor = connection.cursor()
-            # executa o comando SQL
-            cursor.execute(query, row[1:])
-            connection.commit()
-            row_count = cursor.rowcount
-        except Exception as error:
-            connection.rollback()
-            Logger.error(str(error))
-        return row_count > 0
+        key = None
+        with DatabaseManager.connection(DatabaseManager.POSTGRESQL_DB) as connection:
+            try:
+                # constroi o comando SQL para inserção do registro na tabela
+                columns, values = ModelController._get_insert_columns(row, attr_list, generated_key)
+                params = ', '.join(['%s' for _ in columns])
+                query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({params})"
+                if generated_key:
+                    query += f' RETURNING {generated_key}'
+                # recupera a conexão com o sgbd
+                cursor = connection.cursor()
+                # executa o comando SQL
+                cursor.execute(query, values)
+                if generated_key:
+                    key = cursor.fetchone()[0]
+                connection.commit()
+                row_count = cursor.rowcount
+            except Exception as error:
+                connection.rollback()
+                Logger.error(str(error))
+        return key if generated_key else row_count > 0
 
     @classmethod
-    def _insert_many(cls, rows, table_name: str, attr_list):
+    def _insert_many(cls, rows, table_name: str, attr_list, generated_key: str = None):
         """
         Esta função recebe registros (tuplas) e os insere na respectiva tabela do banco de dados.
 
         :param rows: As tuplas de valores (registros) a serem inseridos na tabela
         :param table_name: Nome da tabela
         :param attr_list: Uma lista com os nomes dos respectivos atributos (campos da tabela) cujos valores estão no registro.
-        :return:
+        :param generated_key: Nome do campo gerado pelo SGBD, cujo valor é ignorado nos registros e retornado pela inserção.
+        :return: A lista com os valores gerados do campo `generated_key`, na ordem dos registros (vazia em caso de falha) ou,
+            sem campo gerado, um booleano que indica se os registros foram inseridos.
         """
         row_count = 0
-        connection = DatabaseManager.get_connection(DatabaseManager.POSTGRESQL_DB)
-        try:
-            # constroi o comando SQL para inserção do registro na tabela
-            attr_names = ','.join(attr_list[1:])
-            sql_query = f'INSERT INTO {table_name} ({attr_names}) VALUES %s'
-            # recupera a conexão com o sgbd
-            cursor = connection.cursor()
-            # executa o comando SQL
-            extras.execute_values(cursor, sql_query, rows)
-            connection.commit()
-            row_count = cursor.rowcount
-        except Exception as error:
-            connection.rollback()
-            Logger.error(str(error))
-        return row_count > 0
+        keys = []
+        with DatabaseManager.connection(DatabaseManager.POSTGRESQL_DB) as connection:
+            try:
+                cursor = connection.cursor()
+                keys = ModelController._insert_rows(cursor, rows, table_name, attr_list, generated_key=generated_key)
+                connection.commit()
+                row_count = cursor.rowcount
+            except Exception as error:
+                connection.rollback()
+                Logger.error(str(error))
+        return keys if generated_key else row_count > 0
+
+    @classmethod
+    def _insert_rows(cls, cursor, rows, table_name: str, attr_list, ignore_conflicts: bool = False, generated_key: str = None):
+        """
+        Esta função insere registros (tuplas) na respectiva tabela do banco de dados num único comando (`execute_values`),
+        utilizando o cursor (e a transação) informado, sem confirmar a transação.
+
+        :param cursor: O cursor da transação em andamento.
+        :param rows: As tuplas de valores (registros) a serem inseridos na tabela
+        :param table_name: Nome da tabela
+        :param attr_list: Uma lista com os nomes dos atributos (campos da tabela) cujos valores estão nos registros.
+        :param ignore_conflicts: Se `True` os registros que violam uma restrição de unicidade são ignorados.
+        :param generated_key: Nome do campo gerado pelo SGBD, cujo valor é ignorado nos registros e retornado pela inserção.
+        :return: A lista com os valores gerados do campo `generated_key` ou, sem campo gerado, a quantidade de registros inseridos.
+        """
+        if not rows:
+            return [] if generated_key else 0
+        columns = [name for name in attr_list if name != generated_key]
+        values = [ModelController._get_insert_columns(row, attr_list, generated_key)[1] for row in rows]
+        sql_query = f'INSERT INTO {table_name} ({", ".join(columns)}) VALUES %s'
+        if ignore_conflicts:
+            sql_query += ' ON CONFLICT DO NOTHING'
+        if generated_key:
+            sql_query += f' RETURNING {generated_key}'
+            return [row[0] for row in extras.execute_values(cursor, sql_query, values, page_size=len(values), fetch=True)]
+        extras.execute_values(cursor, sql_query, values, page_size=len(values))
+        return cursor.rowcount
+
+    @staticmethod
+    def _get_upsert_query(table_name: str, attr_list, key_name: str, generated_key: str = None):
+        # constroi o comando SQL para inserção ou atualização (pelo campo único `key_name`) de um registro na tabela
+        columns = [name for name in attr_list if name != generated_key]
+        params = ', '.join(['%s' for _ in columns])
+        updates = ', '.join(f'{name} = EXCLUDED.{name}' for name in columns if name != key_name)
+        query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({params}) ON CONFLICT ({key_name}) DO UPDATE SET {updates}"
+        return f'{query} RETURNING {generated_key}' if generated_key else query
+
+    @classmethod
+    def _upsert_one(cls, row, table_name: str, attr_list, key_name: str, generated_key: str = None):
+        """
+        Esta função recebe um registro (tupla) e o insere na respectiva tabela do banco de dados, ou atualiza o registro
+        existente com o mesmo valor no campo único informado.
+
+        :param row: Uma tupla de valores (registro) a serem inseridos ou atualizados na tabela
+        :param table_name: Nome da tabela
+        :param attr_list: Uma lista com os nomes dos respectivos atributos (campos da tabela) cujos valores estão no registro.
+        :param key_name: Nome do campo único (chave) que identifica o registro existente.
+        :param generated_key: Nome do campo gerado pelo SGBD, cujo valor é ignorado no registro e retornado pelo comando.
+        :return: O valor do campo `generated_key` do registro inserido ou atualizado (ou `None` em caso de falha) ou, sem
+            campo gerado, um booleano que indica se o registro foi inserido ou atualizado.
+        """
+        row_count = 0
+        key = None
+        with DatabaseManager.connection(DatabaseManager.POSTGRESQL_DB) as connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute(
+                    ModelController._get_upsert_query(table_name, attr_list, key_name, generated_key),
+                    ModelController._get_insert_columns(row, attr_list, generated_key)[1]
+                )
+                if generated_key:
+                    key = cursor.fetchone()[0]
+                connection.commit()
+                row_count = cursor.rowcount
+            except Exception as error:
+                connection.rollback()
+                Logger.error(str(error))
+        return key if generated_key else row_count > 0
+
+    @classmethod
+    def _delete_by_text_field(cls, table_name: str, field_value: str, field_name: str):
+        """
+        Esta função remove os registros de uma tabela do banco de dados cujo campo informado tem exatamente o valor textual informado.
+
+        :param table_name: Nome da tabela do banco de dados.
+        :param field_value: Valor do campo dos registros a serem removidos.
+        :param field_name: Nome do compo da tabela.
+        :return: A quantidade de registros removidos.
+        """
+        row_count = 0
+        with DatabaseManager.connection(DatabaseManager.POSTGRESQL_DB) as connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute(f'DELETE FROM {table_name} WHERE {field_name} = %s', (field_value,))
+                connection.commit()
+                row_count = cursor.rowcount
+            except Exception as error:
+                connection.rollback()
+                Logger.error(str(error))
+        return row_count
 
     @classmethod
     def _fetch_all(cls, table_name: str):
@@ -198,10 +497,10 @@ class ModelController:
         :param table_name: Nome da tabela do banco de dados.
         :return: Os registros (tuplas) encontrados na tabela.
         """
-        connection = DatabaseManager.get_connection(DatabaseManager.POSTGRESQL_DB)
-        cursor = connection.cursor()
-        cursor.execute(f'SELECT * FROM {table_name}')
-        return cursor.fetchall()
+        with DatabaseManager.connection(DatabaseManager.POSTGRESQL_DB) as connection:
+            cursor = connection.cursor()
+            cursor.execute(f'SELECT * FROM {table_name}')
+            return cursor.fetchall()
 
     @classmethod
     def _fetch_by_text_field(cls, table_name: str, field_value: str, field_name: str, exact=True, limit=None):
@@ -218,13 +517,39 @@ class ModelController:
         params = [field_value]
         if limit:
             params.append(limit)
-        connection = DatabaseManager.get_connection(DatabaseManager.POSTGRESQL_DB)
-        cursor = connection.cursor()
-        cursor.execute(
-            f'SELECT * FROM {table_name} WHERE {field_name} {"LIKE %s" if not exact else "= %s"}{"" if not limit else " LIMIT %s"}',
-            tuple(params)
-        )
-        return cursor.fetchall()
+        with DatabaseManager.connection(DatabaseManager.POSTGRESQL_DB) as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                f'SELECT * FROM {table_name} WHERE {field_name} {"LIKE %s" if not exact else "= %s"}{"" if not limit else " LIMIT %s"}',
+                tuple(params)
+            )
+            return cursor.fetchall()
+
+    @classmethod
+    def _fetch_field_values(cls, table_name: str, field_name: str, prefix: str = None, batch_size: int = 10000, ignore_case: bool = False):
+        """
+        Esta função percorre os valores de um campo de uma tabela do banco de dados, em lotes, sem carregar todos os registros
+        na memória de uma só vez.
+
+        :param table_name: Nome da tabela do banco de dados.
+        :param field_name: Nome do campo da tabela.
+        :param prefix: Prefixo textual dos valores desejados. Caso seja "None", todos os valores serão retornados.
+        :param batch_size: Quantidade de registros trazidos do SGBD a cada lote.
+        :param ignore_case: Se `True` o prefixo é comparado sem diferenciar maiúsculas e minúsculas.
+        :return: Um gerador com os valores do campo.
+        """
+        with DatabaseManager.connection(DatabaseManager.POSTGRESQL_DB) as connection:
+            # cursor nomeado (server-side): o SGBD envia os registros em lotes de `batch_size`. Como a conexão está em modo
+            # autocommit, o cursor precisa ser declarado WITH HOLD
+            with connection.cursor(name=f'{table_name}_{field_name}_values', withhold=True) as cursor:
+                cursor.itersize = batch_size
+                if prefix:
+                    condition = f'lower({field_name}) LIKE lower(%s)' if ignore_case else f'{field_name} LIKE %s'
+                    cursor.execute(f'SELECT {field_name} FROM {table_name} WHERE {condition}', (f'{prefix}%',))
+                else:
+                    cursor.execute(f'SELECT {field_name} FROM {table_name}')
+                for row in cursor:
+                    yield row[0]
 
     @classmethod
     def _fetch_by_numerical_field(cls, table_name: str, field_value: int, field_name: str, limit=None):
@@ -240,28 +565,49 @@ class ModelController:
         params = [field_value]
         if limit:
             params.append(limit)
-        connection = DatabaseManager.get_connection(DatabaseManager.POSTGRESQL_DB)
-        cursor = connection.cursor()
-        cursor.execute(
-            f'SELECT * FROM {table_name}{f" WHERE {field_name}=%s"}{"" if not limit else " LIMIT %s"}',
-            tuple(params)
-        )
-        return cursor.fetchall()
+        with DatabaseManager.connection(DatabaseManager.POSTGRESQL_DB) as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                f'SELECT * FROM {table_name}{f" WHERE {field_name}=%s"}{"" if not limit else " LIMIT %s"}',
+                tuple(params)
+            )
+            return cursor.fetchall()
 
 
 class ArticleController(ModelController):
     """Classe que implementa as funções de CRUD para objetos `Article`."""
     __TABLE_NAME = 'article'
 
+    @classmethod
+    def get_table_name(cls):
+        return cls.__TABLE_NAME
+
     @classmethod
     def insert_one(cls, element: Article):
         """
         Esta função insere um novo registro na tabela `article` com o valores provenientes de um objeto `Article`.
 
+        O `article_id` gerado pelo SGBD é retornado pelo próprio comando de inserção (RETURNING) e atribuído ao objeto.
+
         :param element: O objeto `Article` cujos valores deverão ser inseridos.
-        :return: Um inteiro maior que `zero` se registro foi inserido com sucesso.
+        :return: O `article_id` gerado, ou `None` se o registro não foi inserido.
         """
-        return ModelController._insert_one(element.to_tuple(), cls.__TABLE_NAME, Article.attr_list())
+        element.article_id = ModelController._insert_one(element.to_tuple(), cls.__TABLE_NAME, Article.attr_list(), Article.KEY_NAME)
+        return element.article_id
+
+    @classmethod
+    def upsert_one(cls, element: Article):
+        """
+        Esta função insere um novo registro na tabela `article` com os valores provenientes de um objeto `Article`, ou atualiza
+        o registro existente com a mesma `article_url`.
+
+        :param element: O objeto `Article` cujos valores deverão ser inseridos ou atualizados.
+        :return: O `article_id` do registro inserido ou atualizado, ou `None` em caso de falha.
+        """
+        element.article_id = ModelController._upsert_one(
+            element.to_tuple(), cls.__TABLE_NAME, Article.attr_list(), 'article_url', Article.KEY_NAME
+        )
+        return element.article_id
 
     @classmethod
     def insert_batch(cls, elements: List[Article]):
@@ -269,9 +615,12 @@ class ArticleController(ModelController):
         Esta função insere novos registros na tabela `Article` com os valores provenientes de uma lista de objetos `Article`.
 
         :param elements: A lista com os objetos `Article` cujos valores deverão ser inseridos como novos registros da tabela.
-        :return: Um inteiro maior que `zero` se registros foram inseridos com sucesso.
+        :return: A lista com os `article_id` gerados, na ordem dos objetos (também atribuídos a eles), vazia em caso de falha.
         """
-        return ModelController._insert_many([x.to_tuple() for x in elements], cls.__TABLE_NAME, Article.attr_list())
+        keys = ModelController._insert_many([x.to_tuple() for x in elements], cls.__TABLE_NAME, Article.attr_list(), Article.KEY_NAME)
+        for element, key in zip(elements, keys):
+            element.article_id = key
+        return keys
 
     @classmethod
     def fetch_all(cls):
@@ -309,11 +658,26 @@ class ArticleController(ModelController):
         """
         return ModelController._fetch_by_numerical_field(cls.__TABLE_NAME, field_value, field_name, limit)
 
+    @classmethod
+    def fetch_urls(cls, prefix: str = None):
+        """
+        Esta função percorre as urls dos artigos da tabela `article`, em lotes, sem carregar os registros completos.
+
+        :param prefix: Prefixo das urls desejadas (ex.: o endereço do portal), comparado sem diferenciar maiúsculas e
+            minúsculas. Caso seja "None", todas as urls serão retornadas.
+        :return: Um gerador com as urls dos artigos.
+        """
+        return ModelController._fetch_field_values(cls.__TABLE_NAME, 'article_url', prefix, ignore_case=True)
+
 
 class ArticleTopicController(ModelController):
     """Classe que implementa as funções de CRUD para objetos `ArticleTopic`."""
     __TABLE_NAME = 'article_topic'
 
+    @classmethod
+    def get_table_name(cls):
+        return cls.__TABLE_NAME
+
     @classmethod
     def insert_one(cls, element: ArticleTopic):
         """
@@ -334,6 +698,17 @@ class ArticleTopicController(ModelController):
         """
         return ModelController._insert_many([x.to_tuple() for x in elements], cls.__TABLE_NAME, ArticleTopic.attr_list())
 
+    @classmethod
+    def delete_by_text_field(cls, field_value: str, field_name: str):
+        """
+        Esta função remove os registros da tabela `article_topic` cujo campo informado tem exatamente o valor textual informado.
+
+        :param field_value: O valor textual do campo nos registros a serem removidos.
+        :param field_name: O nome do campo a ser utilizado na busca.
+        :return: A quantidade de registros removidos.
+        """
+        return ModelController._delete_by_text_field(cls.__TABLE_NAME, field_value, field_name)
+
     @classmethod
     def fetch_all(cls):
         """
@@ -377,6 +752,10 @@ class ArticleMediaController(ModelController):
     """Classe que implementa as funções de CRUD para objetos `ArticleMedia`."""
     __TABLE_NAME = 'article_media'
 
+    @classmethod
+    def get_table_name(cls):
+        return cls.__TABLE_NAME
+
     @classmethod
     def insert_one(cls, element: ArticleMedia):
         """
@@ -397,6 +776,17 @@ class ArticleMediaController(ModelController):
         """
         return ModelController._insert_many([x.to_tuple() for x in elements], cls.__TABLE_NAME, ArticleMedia.attr_list())
 
+    @classmethod
+    def delete_by_text_field(cls, field_value: str, field_name: str):
+        """
+        Esta função remove os registros da tabela `article_media` cujo campo informado tem exatamente o valor textual informado.
+
+        :param field_value: O valor textual do campo nos registros a serem removidos.
+        :param field_name: O nome do campo a ser utilizado na busca.
+        :return: A quantidade de registros removidos.
+        """
+        return ModelController._delete_by_text_field(cls.__TABLE_NAME, field_value, field_name)
+
     @classmethod
     def fetch_all(cls):
         """
@@ -440,6 +830,10 @@ class ArticleHyperlinkController(ModelController):
     """Classe que implementa as funções de CRUD para objetos `ArticleHyperlink`."""
     __TABLE_NAME = 'article_hyperlink'
 
+    @classmethod
+    def get_table_name(cls):
+        return cls.__TABLE_NAME
+
     @classmethod
     def insert_one(cls, element: ArticleHyperlink):
         """
@@ -460,6 +854,17 @@ class ArticleHyperlinkController(ModelController):
         """
         return ModelController._insert_many([x.to_tuple() for x in elements], cls.__TABLE_NAME, ArticleHyperlink.attr_list())
 
+    @classmethod
+    def delete_by_text_field(cls, field_value: str, field_name: str):
+        """
+        Esta função remove os registros da tabela `article_hyperlink` cujo campo informado tem exatamente o valor textual informado.
+
+        :param field_value: O valor textual do campo nos registros a serem removidos.
+        :param field_name: O nome do campo a ser utilizado na busca.
+        :return: A quantidade de registros removidos.
+        """
+        return ModelController._delete_by_text_field(cls.__TABLE_NAME, field_value, field_name)
+
     @classmethod
     def fetch_all(cls):
         """
@@ -503,6 +908,10 @@ class ArticleCategoryController(ModelController):
     """Classe que implementa as funções de CRUD para objetos `ArticleCategory`."""
     __TABLE_NAME = 'article_category'
 
+    @classmethod
+    def get_table_name(cls):
+        return cls.__TABLE_NAME
+
     @classmethod
     def insert_one(cls, element: ArticleCategory):
         """
@@ -523,6 +932,17 @@ class ArticleCategoryController(ModelController):
         """
         return ModelController._insert_many([x.to_tuple() for x in elements], cls.__TABLE_NAME, ArticleCategory.attr_list())
 
+    @classmethod
+    def delete_by_text_field(cls, field_value: str, field_name: str):
+        """
+        Esta função remove os registros da tabela `article_category` cujo campo informado tem exatamente o valor textual informado.
+
+        :param field_value: O valor textual do campo nos registros a serem removidos.
+        :param field_name: O nome do campo a ser utilizado na busca.
+        :return: A quantidade de registros removidos.
+        """
+        return ModelController._delete_by_text_field(cls.__TABLE_NAME, field_value, field_name)
+
     @classmethod
     def fetch_all(cls):
         """
@@ -559,3 +979,97 @@ class ArticleCategoryController(ModelController):
         """
         rows = ModelController._fetch_by_numerical_field(cls.__TABLE_NAME, field_value, field_name, limit)
         return [ArticleCategory.from_tuple(x) for x in rows]
+
+
+class ArticleBundleController(ModelController):
+    """
+    Classe que implementa a gravação de um artigo e de todas as entidades extraídas da sua página (`ArticleBundle`) como
+    uma unidade de trabalho: o artigo, os tópicos, os hyperlinks, as categorias e as mídias são gravados juntos, com um
+    comando (em lote) por tabela, e são todos descartados se qualquer um dos comandos falhar.
+
+    Os artigos são gravados em lotes (`save_many`), cada artigo no seu próprio ponto de salvamento da transação do lote. O
+    tempo de gravação de cada artigo é registrado no `LatencyHistogram` `DATABASE_LATENCY_NAME`, e o de cada lote no
+    `BATCH_LATENCY_NAME`.
+
+    Constants:
+        - DATABASE_LATENCY_NAME (str): Nome do histograma com o tempo de gravação de cada artigo.
+        - BATCH_LATENCY_NAME (str): Nome do histograma com o tempo de gravação de cada lote de artigos.
+    """
+
+    DATABASE_LATENCY_NAME = 'DATABASE ARTICLE TRANSACTION'
+    BATCH_LATENCY_NAME = 'DATABASE BATCH TRANSACTION'
+
+    @staticmethod
+    def _write(cursor, bundle: ArticleBundle, replace: bool):
+        # grava o artigo e as suas entidades com o cursor (e a transação) informado, retornando o id do artigo
+        children = (
+            (ArticleTopicController, ArticleTopic, bundle.topics),
+            (ArticleHyperlinkController, ArticleHyperlink, bundle.hyperlinks),
+            (ArticleCategoryController, ArticleCategory, bundle.categories),
+            (ArticleMediaController, ArticleMedia, bundle.medias),
+        )
+        attr_list = Article.attr_list()
+        if replace:
+            cursor.execute(
+                ModelController._get_upsert_query(
+                    ArticleController.get_table_name(), attr_list, 'article_url', Article.KEY_NAME
+                ),
+                ModelController._get_insert_columns(bundle.article.to_tuple(), attr_list, Article.KEY_NAME)[1]
+            )
+            article_id = cursor.fetchone()[0]
+            for controller, _, _ in children:
+                cursor.execute(
+                    f'DELETE FROM {controller.get_table_name()} WHERE article_url = %s', (bundle.article.article_url,)
+                )
+        else:
+            article_id = ModelController._insert_rows(
+                cursor, [bundle.article.to_tuple()], ArticleController.get_table_name(), attr_list,
+                generated_key=Article.KEY_NAME
+            )[0]
+        # as entidades já gravadas por outro artigo (mesma chave) são ignoradas, como na gravação registro a registro
+        for controller, entity, elements in children:
+            ModelController._insert_rows(
+                cursor, [x.to_tuple() for x in elements], controller.get_table_name(), entity.attr_list(), True
+            )
+        return article_id
+
+    @classmethod
+    def save_many(cls, bundles: List[ArticleBundle], replace: bool = False):
+        """
+        Esta função grava um lote de artigos (e as suas entidades relacionadas) numa única transação, com um ponto de
+        salvamento (SAVEPOINT) por artigo: um artigo cuja gravação falha é descartado sem desfazer os demais do lote.
+
+        :param bundles: Os `ArticleBundle` com os artigos e as entidades a serem gravadas.
+        :param replace: Se `True` o artigo já gravado (mesma `article_url`) é atualizado e as suas entidades relacionadas
+            são substituídas, caso contrário a gravação de um artigo já gravado falha.
+        :return: A lista com o erro da gravação de cada artigo, na ordem dos artigos (`None` para os artigos gravados).
+        """
+        article_ids = []
+        errors = []
+        started = perf_counter()
+        try:
+            with DatabaseManager.transaction(DatabaseManager.POSTGRESQL_DB) as cursor:
+                for bundle in bundles:
+                    bundle_started = perf_counter()
+                    cursor.execute('SAVEPOINT article_bundle')
+                    try:
+                        article_ids.append(ArticleBundleController._write(cursor, bundle, replace))
+                        cursor.execute('RELEASE SAVEPOINT article_bundle')
+                        errors.append(None)
+                    except Exception as error:
+                        cursor.execute('ROLLBACK TO SAVEPOINT article_bundle')
+                        Logger.error(f'{bundle.article.article_url}: {str(error)}')
+                        article_ids.append(None)
+                        errors.append(error)
+                    finally:
+                        LatencyHistogram.get(cls.DATABASE_LATENCY_NAME).observe(perf_counter() - bundle_started)
+        except Exception as error:
+            Logger.error(f'BATCH OF {len(bundles)} ARTICLES NOT SAVED: {str(error)}')
+            return [error] * len(bundles)
+        finally:
+            LatencyHistogram.get(cls.BATCH_LATENCY_NAME).observe(perf_counter() - started)
+        # os ids gerados só são atribuídos aos artigos depois da confirmação da transação
+        for bundle, article_id in zip(bundles, article_ids):
+            if article_id is not None:
+                bundle.article.article_id = article_id
+        return errors
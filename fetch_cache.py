@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+from datetime import datetime
+from threading import Lock
+
+
+class FetchCache:
+    """
+    Cache local, por url, dos dados de validação dos artigos já baixados: os cabeçalhos `ETag` e `Last-Modified` da
+    resposta, o resumo (hash) do conteúdo da página e a data/hora de modificação (`modified`) gravada do artigo.
+
+    É utilizado pelo modo de atualização (re-crawl) para enviar requisições condicionais (`If-None-Match` e
+    `If-Modified-Since`) e para identificar os artigos que não mudaram desde o último download, que não são extraídos nem
+    gravados novamente.
+
+    O cache é mantido num arquivo JSON Lines, no qual cada atualização é acrescentada ao final (a última linha de cada url
+    prevalece, e uma linha com `removed` retira a url do cache), e é compactado (uma linha por url) ao ser fechado.
+
+    Constants:
+        - HASH_DIGEST_SIZE (int): Tamanho (em bytes) do resumo do conteúdo das páginas.
+    """
+
+    HASH_DIGEST_SIZE = 16
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._entries = None
+        self._lock = Lock()
+
+    @staticmethod
+    def get_content_hash(page_source: str):
+        """Retorna o resumo dos bytes originais da página (ou do texto, quando os bytes não estão disponíveis)."""
+        content = getattr(page_source, 'content', None)
+        if content is None:
+            content = str(page_source).encode('utf-8')
+        return hashlib.blake2b(content, digest_size=FetchCache.HASH_DIGEST_SIZE).hexdigest()
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.file_path):
+                with open(self.file_path, 'r', encoding='utf-8') as arq:
+                    for line in arq:
+                        if line.strip():
+                            entry = json.loads(line)
+                            if entry.get('removed'):
+                                self._entries.pop(entry['url'], None)
+                            else:
+                                self._entries[entry['url']] = entry
+        return self._entries
+
+    def get(self, url: str):
+        """Retorna os dados de validação da url informada, ou `None` se ela ainda não está no cache."""
+        with self._lock:
+            return self._load().get(url)
+
+    def get_conditional_headers(self, url: str):
+        """Retorna os cabeçalhos da requisição condicional da url informada (vazio se ela não está no cache)."""
+        entry = self.get(url)
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    @staticmethod
+    def new_entry(url: str, page_source: str, modified=None):
+        """Retorna os dados de validação da página baixada e a data/hora de modificação do artigo, para gravação (`put`)."""
+        headers = getattr(page_source, 'headers', None) or {}
+        return {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'content_hash': FetchCache.get_content_hash(page_source),
+            'modified': str(modified) if modified is not None else None,
+            'checked_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def update(self, url: str, page_source: str, modified=None):
+        """Registra os dados de validação da página baixada e a data/hora de modificação do artigo gravado."""
+        self.put(FetchCache.new_entry(url, page_source, modified))
+
+    def put(self, entry: dict):
+        """Registra os dados de validação criados por `new_entry`."""
+        url = entry['url']
+        with self._lock:
+            self._load()[url] = entry
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            with open(self.file_path, 'a', encoding='utf-8') as arq:
+                arq.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def remove(self, url: str):
+        """Retira a url do cache (ex.: o artigo não foi gravado), para que ela seja baixada e gravada novamente."""
+        with self._lock:
+            if self._load().pop(url, None) is None:
+                return
+            with open(self.file_path, 'a', encoding='utf-8') as arq:
+                arq.write(json.dumps({'url': url, 'removed': True}, ensure_ascii=False) + '\n')
+
+    def close(self):
+        """Compacta o arquivo do cache, mantendo apenas a linha mais recente de cada url."""
+        with self._lock:
+            if self._entries is None:
+                return
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            temp_path = f'{self.file_path}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as arq:
+                for entry in self._entries.values():
+                    arq.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            os.replace(temp_path, self.file_path)
+            self._entries = None
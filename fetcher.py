@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+import urllib.parse
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Dict, Sequence
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from logs import Logger
+from metrics import LatencyHistogram, TransferCounter
+from parsing import HtmlParser
+from scheduler import PolitenessScheduler
+
+
+class PageSource(str):
+    """
+    Código-fonte de uma página baixada, acompanhado dos dados da captura: a url final (após redirecionamentos), a data/hora
+    do download (UTC), os bytes exatamente como recebidos (`content`, apenas no download HTTP), a codificação do texto e,
+    no download HTTP, o status e os cabeçalhos da resposta.
+
+    Por ser um `str`, pode ser utilizado em qualquer lugar que espera o código-fonte da página. Uma resposta de requisição
+    condicional sem alterações (`is_not_modified`) tem o código-fonte vazio.
+
+    Constants:
+        - HTTP_NOT_MODIFIED (int): Status HTTP da resposta a uma requisição condicional de uma página que não mudou.
+    """
+
+    HTTP_NOT_MODIFIED = 304
+
+    def __new__(cls, text: str, final_url: str = None, content: bytes = None, encoding: str = None, fetched_at: str = None,
+                status: int = None, headers=None):
+        page_source = str.__new__(cls, text)
+        page_source.final_url = final_url
+        page_source.content = content
+        page_source.encoding = encoding
+        page_source.fetched_at = fetched_at if fetched_at else datetime.now(timezone.utc).isoformat(timespec='seconds')
+        page_source.status = status
+        page_source.headers = headers
+        return page_source
+
+    @staticmethod
+    def is_not_modified(page_source: str):
+        return getattr(page_source, 'status', None) == PageSource.HTTP_NOT_MODIFIED
+
+
+class PageFetcher:
+    """Interface que especifica os métodos que um mecanismo de download de páginas necessita implementar"""
+
+    def fetch(self, url: str, selectors: Sequence[str] = (), headers: Dict[str, str] = None):
+        """
+        Retorna o código-fonte (html) da página informada.
+
+        :param url: Endereço da página.
+        :param selectors: Seletores CSS que a página precisa conter para ser considerada completa.
+        :param headers: Cabeçalhos adicionais da requisição (ex.: de requisição condicional), quando suportados.
+        :return: O código-fonte da página.
+        """
+        pass
+
+    def close(self):
+        """Libera os recursos (conexões, navegadores) utilizados pelo mecanismo"""
+        pass
+
+
+class BrowserProfile:
+    """
+    Perfil de configuração do navegador (Chrome) utilizado pelos scrapers.
+
+    O perfil de produção executa o navegador sem interface gráfica (headless) e bloqueia o download de recursos que não
+    são utilizados na leitura do DOM: imagens, vídeos, fontes e scripts de rastreamento/anúncios. Com a estratégia de
+    carregamento `eager` (padrão), a navegação termina quando o DOM está pronto, sem aguardar o evento `load` (anúncios,
+    iframes e demais recursos), e a prontidão da página é decidida pelos seletores obrigatórios (`BrowserFetcher`).
+
+    Constants:
+        - BLOCKED_RESOURCE_PATTERNS (tuple): Padrões de url de imagens, mídias e fontes.
+        - BLOCKED_TRACKER_PATTERNS (tuple): Padrões de url de scripts de terceiros (anúncios, métricas, redes sociais).
+        - PAGE_LOAD_EAGER (str): Estratégia de carregamento que aguarda apenas o DOM (DOMContentLoaded).
+        - PAGE_LOAD_NONE (str): Estratégia de carregamento que não aguarda o documento.
+    """
+
+    BLOCKED_RESOURCE_PATTERNS = (
+        '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+        '*.mp4', '*.webm', '*.m3u8', '*.ts', '*.mp3', '*.ogg',
+        '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    )
+    BLOCKED_TRACKER_PATTERNS = (
+        '*doubleclick.net*', '*googlesyndication.com*', '*googletagmanager.com*', '*googletagservices.com*',
+        '*google-analytics.com*', '*adservice.google.*', '*facebook.net*', '*connect.facebook.*', '*scorecardresearch.com*',
+        '*chartbeat.com*', '*chartbeat.net*', '*hotjar.com*', '*taboola.com*', '*outbrain.com*', '*amazon-adsystem.com*',
+        '*criteo.com*', '*criteo.net*', '*youtube.com/embed*', '*player.vimeo.com*',
+    )
+
+    PAGE_LOAD_EAGER = 'eager'
+    PAGE_LOAD_NONE = 'none'
+
+    def __init__(self, headless: bool = True, block_resources: bool = True, disable_cache: bool = False,
+                 page_load_strategy: str = PAGE_LOAD_EAGER):
+        self.headless = headless
+        self.block_resources = block_resources
+        self.disable_cache = disable_cache
+        self.page_load_strategy = page_load_strategy
+
+    def get_key(self):
+        return self.headless, self.block_resources, self.disable_cache, self.page_load_strategy
+
+    def get_options(self):
+        op = webdriver.ChromeOptions()
+        op.page_load_strategy = self.page_load_strategy
+        if self.headless:
+            op.add_argument('--headless=new')
+            op.add_argument('--window-size=1920,1080')
+        if self.block_resources:
+            op.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        if self.disable_cache:
+            op.add_argument('--disk-cache-size=1')
+        return op
+
+    def configure(self, browser):
+        """Aplica ao navegador já aberto as configurações que dependem do protocolo DevTools (CDP)."""
+        if not self.headless:
+            browser.maximize_window()
+        if self.block_resources or self.disable_cache:
+            browser.execute_cdp_cmd('Network.enable', {})
+        if self.block_resources:
+            browser.execute_cdp_cmd(
+                'Network.setBlockedURLs',
+                {'urls': list(BrowserProfile.BLOCKED_RESOURCE_PATTERNS + BrowserProfile.BLOCKED_TRACKER_PATTERNS)}
+            )
+        if self.disable_cache:
+            browser.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
+        return browser
+
+
+class BrowserFetcher(PageFetcher):
+    """
+    Mecanismo de download que renderiza as páginas num navegador controlado pelo Selenium.
+
+    Em vez de aguardar um tempo fixo após cada carregamento, a página é devolvida assim que todos os seletores obrigatórios
+    estiverem presentes (ou, sem seletores, assim que o DOM estiver pronto), respeitando o tempo máximo `wait_time`,
+    que vale para a navegação e a espera juntas: a navegação que excede esse tempo é interrompida (`window.stop`) e a
+    página é avaliada pelos seletores com o tempo restante.
+    O tempo até a página ficar pronta é registrado num `LatencyHistogram` por condição de espera.
+
+    O navegador é obtido do `BrowserSessionManager` apenas na primeira requisição, de modo que um `BrowserFetcher` que
+    nunca é utilizado não tem custo, e é devolvido ao gerenciador em `close` para ser reaproveitado por outro scraper.
+    """
+
+    DOCUMENT_READY_CONDITION = 'document.readyState!=loading'
+    POLL_FREQUENCY = 0.1
+    PAGE_STATS_SCRIPT = """
+        const navigation = performance.getEntriesByType('navigation')[0];
+        const entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+        return [
+            entries.reduce((total, entry) => total + (entry.transferSize || 0), 0),
+            navigation ? navigation.duration / 1000 : null
+        ];
+    """
+
+    def __init__(self, session_manager, profile: BrowserProfile, wait_time: int):
+        self._session_manager = session_manager
+        self._profile = profile
+        self._wait_time = wait_time
+        self._browser = None
+
+    def get_browser(self):
+        if not self._browser:
+            self._browser = self._session_manager.acquire(self._profile)
+            # o tempo máximo de navegação é o do fetcher, pois o navegador é compartilhado por scrapers com tempos diferentes
+            self._browser.set_page_load_timeout(self._wait_time)
+        return self._browser
+
+    @staticmethod
+    def _is_ready(selectors: Sequence[str]):
+        def condition(browser):
+            if not selectors:
+                # o DOM está pronto (`interactive`), sem aguardar o evento `load`, como na estratégia `eager`
+                return browser.execute_script('return document.readyState') != 'loading'
+            return all(browser.find_elements(By.CSS_SELECTOR, selector) for selector in selectors)
+        return condition
+
+    def fetch(self, url: str, selectors: Sequence[str] = (), headers: Dict[str, str] = None):
+        # o navegador não envia requisições condicionais, a página é sempre baixada por completo
+        browser = self.get_browser()
+        histogram = LatencyHistogram.get(' & '.join(selectors) if selectors else BrowserFetcher.DOCUMENT_READY_CONDITION)
+        started = perf_counter()
+        try:
+            try:
+                browser.get(url)
+            except TimeoutException:
+                # a navegação excedeu o tempo máximo: o carregamento é interrompido e a prontidão é decidida pelos seletores
+                browser.execute_script('window.stop();')
+            remaining = max(BrowserFetcher.POLL_FREQUENCY, self._wait_time - (perf_counter() - started))
+            try:
+                WebDriverWait(browser, remaining, poll_frequency=BrowserFetcher.POLL_FREQUENCY).until(BrowserFetcher._is_ready(selectors))
+                histogram.observe(perf_counter() - started)
+            except TimeoutException:
+                histogram.observe_timeout()
+                Logger.warn(f"\tPAGE NOT READY AFTER {self._wait_time}s ({histogram.name}): {url}")
+            BrowserFetcher._record_page_stats(browser, url)
+            # o navegador não expõe os bytes recebidos, apenas o DOM renderizado
+            page_source = PageSource(browser.page_source, final_url=browser.current_url, encoding='utf-8')
+        except WebDriverException:
+            # navegador travado ou encerrado: é descartado (não volta ao pool) e a próxima tentativa abre outro navegador
+            self._session_manager.discard(browser)
+            self._browser = None
+            raise
+        if self._session_manager.page_loaded(browser):
+            self._browser = None
+        return page_source
+
+    @staticmethod
+    def _record_page_stats(browser, url: str):
+        host = urllib.parse.urlparse(url).netloc
+        try:
+            n_bytes, load_time = browser.execute_script(BrowserFetcher.PAGE_STATS_SCRIPT)
+        except WebDriverException:
+            return
+        TransferCounter.get(f'{host} (browser)').add(int(n_bytes or 0))
+        if load_time:
+            LatencyHistogram.get(f'PAGE LOAD {host}').observe(load_time)
+
+    def close(self):
+        if self._browser:
+            self._session_manager.release(self._browser, self._profile)
+        self._browser = None
+
+
+class HttpFetcher(PageFetcher):
+    """
+    Mecanismo de download que faz requisições HTTP simples, sem renderizar a página.
+
+    As conexões são mantidas abertas (keep-alive) num pool por host e as respostas são transferidas comprimidas (gzip).
+    """
+
+    DEFAULT_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/111.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Encoding': 'gzip, deflate',
+        'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+    }
+
+    def __init__(self, pool_size: int = 10, timeout: float = 15):
+        self._timeout = timeout
+        self._session = requests.Session()
+        self._session.headers.update(HttpFetcher.DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    def fetch(self, url: str, selectors: Sequence[str] = (), headers: Dict[str, str] = None):
+        response = self._session.get(url, headers=headers, timeout=self._timeout)
+        response.raise_for_status()
+        if response.status_code == PageSource.HTTP_NOT_MODIFIED:
+            TransferCounter.get(f'{urllib.parse.urlparse(url).netloc} (http)').add(0)
+            return PageSource('', final_url=response.url, status=response.status_code, headers=dict(response.headers))
+        # sem charset no cabeçalho o requests assume ISO-8859-1, mas os portais publicam em UTF-8
+        if 'charset' not in response.headers.get('Content-Type', '').lower():
+            response.encoding = 'utf-8'
+        n_bytes = response.headers.get('Content-Length')
+        TransferCounter.get(f'{urllib.parse.urlparse(url).netloc} (http)').add(int(n_bytes) if n_bytes else len(response.content))
+        return PageSource(
+            response.text, final_url=response.url, content=response.content, encoding=response.encoding,
+            status=response.status_code, headers=dict(response.headers)
+        )
+
+    def close(self):
+        self._session.close()
+
+
+class FallbackFetcher(PageFetcher):
+    """
+    Mecanismo de download que tenta primeiro o mecanismo principal (HTTP) e só recorre ao secundário (navegador)
+    quando a conexão falha (erro de rede ou tempo esgotado) ou quando algum dos seletores obrigatórios não está presente
+    na página recebida. Respostas com status de erro (`requests.HTTPError`, ex.: 404, 429, 503) são repassadas a quem
+    chamou, para que a política de novas tentativas e o disjuntor as classifiquem, sem custar um download pelo navegador.
+    """
+
+    # parsers restritos às tags dos seletores obrigatórios, por conjunto de seletores
+    _selector_parsers = {}
+
+    def __init__(self, primary: PageFetcher, fallback: PageFetcher):
+        self._primary = primary
+        self._fallback = fallback
+
+    @staticmethod
+    def has_selectors(page_source: str, selectors: Sequence[str]):
+        if not selectors:
+            return True
+        key = tuple(selectors)
+        parser = FallbackFetcher._selector_parsers.get(key)
+        if parser is None:
+            parser = FallbackFetcher._selector_parsers.setdefault(key, HtmlParser.for_selectors(key))
+        soup = parser.parse(page_source)
+        return all(soup.select_one(selector) for selector in selectors)
+
+    def fetch(self, url: str, selectors: Sequence[str] = (), headers: Dict[str, str] = None):
+        try:
+            page_source = self._primary.fetch(url, selectors, headers)
+            if PageSource.is_not_modified(page_source) or FallbackFetcher.has_selectors(page_source, selectors):
+                return page_source
+            Logger.warn(f"\tREQUIRED SELECTORS NOT FOUND, FALLING BACK TO BROWSER: {url}")
+        except (requests.ConnectionError, requests.Timeout) as err:
+            Logger.warn(f"\tHTTP FETCH FAILED ({str(err)}), FALLING BACK TO BROWSER: {url}")
+        return self._fallback.fetch(url, selectors)
+
+    def close(self):
+        self._primary.close()
+        self._fallback.close()
+
+
+class PoliteFetcher(PageFetcher):
+    """
+    Mecanismo de download que submete cada requisição do mecanismo interno ao `PolitenessScheduler`, respeitando o limite
+    de requisições por host e pausando o host quando o servidor responde com limitação (429/503 e Retry-After).
+    """
+
+    def __init__(self, fetcher: PageFetcher, scheduler: PolitenessScheduler):
+        self._fetcher = fetcher
+        self._scheduler = scheduler
+
+    def fetch(self, url: str, selectors: Sequence[str] = (), headers: Dict[str, str] = None):
+        self._scheduler.acquire(url)
+        try:
+            return self._fetcher.fetch(url, selectors, headers)
+        except requests.HTTPError as err:
+            if err.response is not None and err.response.status_code in PolitenessScheduler.THROTTLING_STATUS:
+                self._scheduler.retry_after(url, err.response.headers.get('Retry-After'))
+            raise
+
+    def close(self):
+        self._fetcher.close()
+
+
+class AsyncHttpFetcher:
+    """
+    Mecanismo de download HTTP assíncrono (asyncio), para uso pelo `AsyncCrawler`.
+
+    Todas as requisições compartilham uma única sessão com pool de conexões keep-alive e respostas comprimidas (gzip).
+    """
+
+    def __init__(self, pool_size: int = 100, timeout: float = 15):
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._session = None
+
+    async def open(self):
+        self._session = aiohttp.ClientSession(
+            headers=HttpFetcher.DEFAULT_HEADERS,
+            connector=aiohttp.TCPConnector(limit=self._pool_size),
+            timeout=aiohttp.ClientTimeout(total=self._timeout)
+        )
+
+    async def fetch(self, url: str, headers: Dict[str, str] = None):
+        async with self._session.get(url, headers=headers) as response:
+            response.raise_for_status()
+            if response.status == PageSource.HTTP_NOT_MODIFIED:
+                return PageSource('', final_url=str(response.url), status=response.status, headers=dict(response.headers))
+            encoding = response.charset or 'utf-8'
+            content = await response.read()
+            # bytes inválidos na codificação declarada (ex.: trechos de outra codificação) não descartam a página
+            return PageSource(
+                content.decode(encoding, errors='replace'), final_url=str(response.url), content=content, encoding=encoding,
+                status=response.status, headers=dict(response.headers)
+            )
+
+    async def close(self):
+        if self._session:
+            await self._session.close()
+        self._session = None
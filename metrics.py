@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+from bisect import bisect_left
+from threading import Lock
+
+from logs import Logger
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências (em segundos) com faixas fixas, seguro para uso por múltiplas threads.
+
+    Os histogramas são identificados por nome e mantidos num registro da própria classe, acessado por `LatencyHistogram.get`.
+
+    Constants:
+        - BUCKETS (tuple): Limites superiores (em segundos) das faixas do histograma.
+    """
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+    __histograms = {}
+    __registry_lock = Lock()
+
+    def __init__(self, name: str, buckets=BUCKETS):
+        self.name = name
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.timeouts = 0
+        self._lock = Lock()
+
+    @classmethod
+    def get(cls, name: str):
+        """Retorna o histograma com o nome informado, criando-o caso ainda não exista."""
+        with cls.__registry_lock:
+            if name not in cls.__histograms:
+                cls.__histograms[name] = LatencyHistogram(name)
+            return cls.__histograms[name]
+
+    @classmethod
+    def log_all(cls):
+        """Registra no log o resumo de todos os histogramas existentes."""
+        with cls.__registry_lock:
+            histograms = list(cls.__histograms.values())
+        for histogram in histograms:
+            Logger.info(histogram.summary())
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+
+    def observe_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        with self._lock:
+            labels = [f'<={bound}s' for bound in self.buckets] + [f'>{self.buckets[-1]}s']
+            buckets = ', '.join(f'{label}: {count}' for label, count in zip(labels, self.counts) if count)
+            return f'LATENCY [{self.name}]: COUNT={self.count} MEAN={self.mean():.3f}s TIMEOUTS={self.timeouts} {{{buckets}}}'
+
+
+class TransferCounter:
+    """
+    Contador de páginas e bytes transferidos, seguro para uso por múltiplas threads.
+
+    Os contadores são identificados por nome (ex.: o host do portal) e mantidos num registro da própria classe.
+    """
+
+    __counters = {}
+    __registry_lock = Lock()
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pages = 0
+        self.bytes = 0
+        self._lock = Lock()
+
+    @classmethod
+    def get(cls, name: str):
+        """Retorna o contador com o nome informado, criando-o caso ainda não exista."""
+        with cls.__registry_lock:
+            if name not in cls.__counters:
+                cls.__counters[name] = TransferCounter(name)
+            return cls.__counters[name]
+
+    @classmethod
+    def log_all(cls):
+        """Registra no log o resumo de todos os contadores existentes."""
+        with cls.__registry_lock:
+            counters = list(cls.__counters.values())
+        for counter in counters:
+            Logger.info(counter.summary())
+
+    def add(self, n_bytes: int):
+        with self._lock:
+            self.pages += 1
+            self.bytes += n_bytes
+
+    def summary(self):
+        with self._lock:
+            average = self.bytes / self.pages if self.pages else 0
+            return f'TRANSFER [{self.name}]: PAGES={self.pages} BYTES={self.bytes} AVG={average / 1024:.1f}KB/PAGE'
+
+
+class HitCounter:
+    """
+    Contador de acertos (ex.: campos obtidos pelo caminho rápido) sobre o total de tentativas, com a quantidade por origem,
+    seguro para uso por múltiplas threads.
+
+    Os contadores são identificados por nome e mantidos num registro da própria classe.
+    """
+
+    __counters = {}
+    __registry_lock = Lock()
+
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.total = 0
+        self.labels = {}
+        self._lock = Lock()
+
+    @classmethod
+    def get(cls, name: str):
+        """Retorna o contador com o nome informado, criando-o caso ainda não exista."""
+        with cls.__registry_lock:
+            if name not in cls.__counters:
+                cls.__counters[name] = HitCounter(name)
+            return cls.__counters[name]
+
+    @classmethod
+    def log_all(cls):
+        """Registra no log o resumo de todos os contadores existentes."""
+        with cls.__registry_lock:
+            counters = list(cls.__counters.values())
+        for counter in counters:
+            Logger.info(counter.summary())
+
+    def record(self, hit: bool, label: str = None):
+        with self._lock:
+            self.total += 1
+            if hit:
+                self.hits += 1
+            if label:
+                self.labels[label] = self.labels.get(label, 0) + 1
+
+    def rate(self):
+        return self.hits / self.total if self.total else 0.0
+
+    def summary(self):
+        with self._lock:
+            labels = ', '.join(f'{label}: {count}' for label, count in self.labels.items())
+            return f'HIT RATE [{self.name}]: {self.rate() * 100:.1f}% ({self.hits}/{self.total}) {{{labels}}}'
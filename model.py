@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 
 class ModelEntity:
@@ -21,8 +21,19 @@ class ModelEntity:
 
 
 class Article(ModelEntity):
+    """
+    Artigo de um portal de notícias.
 
-    def __init__(self, aurl: str, site_name: str, pub_date: str, author: str, title: str, subtitle: str, atype: str = None, hat: str = None, mod_date: str = None):
+    O `article_id` é gerado pelo SGBD na gravação do artigo (`ArticleController.insert_one`), por isso é `None` até lá.
+
+    Constants:
+        - KEY_NAME (str): Nome do atributo (campo) gerado pelo SGBD.
+    """
+
+    KEY_NAME = 'article_id'
+
+    def __init__(self, aurl: str, site_name: str, pub_date: str, author: str, title: str, subtitle: str, atype: str = None, hat: str = None, mod_date: str = None, aid: int = None):
+        self.article_id = aid
         self.article_url = aurl
         self.site_name = site_name
         self.published = pub_date
@@ -40,7 +51,6 @@ class Article(ModelEntity):
     @classmethod
     def from_tuple(cls, values: Tuple):
         return Article(
-            values[0],
             values[1],
             values[2],
             values[3],
@@ -48,7 +58,9 @@ class Article(ModelEntity):
             values[5],
             values[6],
             values[7],
-            values[8]
+            values[8],
+            values[9],
+            values[0]
         )
 
     @staticmethod
@@ -99,7 +111,7 @@ class ArticleTopic(ModelEntity):
 class ArticleMedia(ModelEntity):
 
     def __init__(self, msrc: str, aurl: str, order: int, media_type: str):
-        self.media_src = msrc
+        self.media_source = msrc
         self.article_url = aurl
         self.media_order = order
         self.media_type = media_type
@@ -132,7 +144,7 @@ class ArticleMedia(ModelEntity):
 class ArticleHyperlink(ModelEntity):
 
     def __init__(self, hsrc: str, aurl: str, order: int, description: str):
-        self.hyperlink_src = hsrc
+        self.hyperlink_source = hsrc
         self.article_url = aurl
         self.link_order = order
         self.link_description = description
@@ -165,7 +177,7 @@ class ArticleHyperlink(ModelEntity):
 class ArticleCategory(ModelEntity):
 
     def __init__(self, csrc: str, aurl: str, desc: str):
-        self.category_src = csrc
+        self.category_source = csrc
         self.article_url = aurl
         self.description = desc
 
@@ -228,6 +240,30 @@ class ArticleComment(ModelEntity):
         return '\n'.join(list_str)
 
 
+class ArticleBundle:
+    """
+    Conjunto com o artigo e todas as entidades extraídas da sua página (tópicos, hyperlinks, categorias e mídias), além do
+    conteúdo (texto) do artigo.
+
+    Contém apenas objetos simples, de modo que pode ser serializado (pickle) e retornado pelos processos de extração. As
+    entidades relacionadas referenciam o artigo pela sua url (`article_url`).
+    `metadata_sources` informa a origem (JSON-LD, OpenGraph ou DOM) de cada metadado extraído e `missing_fields` os campos
+    das regras do site que não foram encontrados na página.
+    """
+
+    def __init__(self, article: Article, content: str, topics: List[ArticleTopic] = None, hyperlinks: List[ArticleHyperlink] = None,
+                 categories: List[ArticleCategory] = None, medias: List[ArticleMedia] = None, metadata_sources: Dict = None,
+                 missing_fields: List[str] = None):
+        self.article = article
+        self.content = content
+        self.metadata_sources = metadata_sources if metadata_sources else {}
+        self.missing_fields = missing_fields if missing_fields else []
+        self.topics = topics if topics else []
+        self.hyperlinks = hyperlinks if hyperlinks else []
+        self.categories = categories if categories else []
+        self.medias = medias if medias else []
+
+
 class ArticleParser:
 
     ARTICLE_SITENAME_PROPERTY = 'og:site_name'
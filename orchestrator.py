@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List
+
+from browser_session import BrowserSessionManager
+from database import DatabaseManager
+from logs import Logger
+from scraper import WebScraper
+
+
+def _run_scraper(scraper: WebScraper, search_terms: List[str]):
+    """
+    Executa um scraper num processo filho, com o seu próprio log, navegador e conexão com o banco de dados. Sem termos de
+    busca (`None`), o scraper reprocessa as urls do seu arquivo de falhas (`WebScraper.replay_dead_letters`).
+    """
+    Logger.configure()
+    try:
+        if search_terms is None:
+            return scraper.replay_dead_letters()
+        return scraper.start(search_terms)
+    finally:
+        BrowserSessionManager.get_instance().shutdown()
+        DatabaseManager.close_connection()
+
+
+class MultiSiteOrchestrator:
+    """
+    Classe responsável por executar os scrapers de vários portais ao mesmo tempo, cada um num processo separado.
+
+    Cada processo abre os seus próprios navegadores e a sua própria conexão com o SGBD, de modo que o tempo total da busca
+    passa a ser o do portal mais lento, e não a soma dos tempos de todos os portais. Os processos são criados com o método
+    `spawn`, para que nenhum estado (conexões, navegadores) do processo principal seja herdado. Por isso o pool de
+    navegadores (`BrowserSessionManager`) é do processo de cada portal, e não é compartilhado entre os portais.
+    """
+
+    def __init__(self, scrapers: List[WebScraper], max_processes: int = None):
+        self._scrapers = scrapers
+        self._max_processes = max_processes if max_processes else max(1, len(scrapers))
+
+    def run(self, search_terms: List[str]):
+        """
+        Executa todos os scrapers com os termos de busca informados e aguarda o término de todos eles.
+
+        :param search_terms: Lista com os termos de busca.
+        :return: Um dicionário com o resultado (artigos encontrados, ignorados, baixados, com falha e erros) de cada scraper.
+        """
+        return self._execute(search_terms)
+
+    def replay_dead_letters(self):
+        """
+        Baixa novamente, em todos os scrapers, os artigos cujo download falhou definitivamente nas execuções anteriores
+        (arquivo de falhas de cada scraper) e aguarda o término de todos eles.
+
+        :return: Um dicionário com o resultado de cada scraper, no mesmo formato de `run`.
+        """
+        return self._execute(None)
+
+    def _execute(self, search_terms: List[str]):
+        results = {}
+        if not self._scrapers:
+            return results
+
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self._max_processes, mp_context=context) as pool:
+            futures = {pool.submit(_run_scraper, scraper, search_terms): scraper for scraper in self._scrapers}
+            for future in as_completed(futures):
+                name = futures[future].get_scrapper_name()
+                try:
+                    results[name] = future.result()
+                except Exception as err:
+                    Logger.error(f"[{name}]: {str(err)}")
+                    results[name] = WebScraper._new_stats()
+                    results[name]['errors'].append(str(err))
+
+        for name, result in results.items():
+            Logger.info(
+                f"[{name}]: FOUND={result['found']} SKIPPED={result['skipped']} PRUNED={result['pruned']} DOWNLOADED={result['downloaded']} UNCHANGED={result['unchanged']} "
+                f"FAILED={result['failed']} ERRORS={len(result['errors'])}"
+            )
+        return results
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+import json
+import re
+from datetime import datetime, timezone
+from typing import Dict, Sequence, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import Tag
+
+
+class ElementRule:
+    """
+    Regra que identifica um elemento html pelo nome da tag e pelos seus atributos, no formato dos argumentos do `find`
+    do BeautifulSoup: `(nome_da_tag, {atributo: valor})`.
+
+    O valor de um atributo pode ser `True` (atributo presente), um texto (valor exato) ou uma expressão regular compilada.
+    Para o atributo `class`, todas as classes informadas precisam estar presentes no elemento, em qualquer ordem.
+    """
+
+    def __init__(self, name: str, attrs: Dict = None):
+        self.name = name
+        self.attrs = {}
+        for attr_name, value in (attrs or {}).items():
+            if attr_name == 'class' and isinstance(value, str):
+                value = frozenset(value.split())
+            self.attrs[attr_name] = value
+
+    def matches(self, tag_name: str, tag_attrs: Dict):
+        if tag_name != self.name:
+            return False
+        for attr_name, value in self.attrs.items():
+            tag_value = tag_attrs.get(attr_name) if tag_attrs else None
+            if tag_value is None:
+                return False
+            if value is True:
+                continue
+            if isinstance(value, frozenset):
+                classes = tag_value if isinstance(tag_value, (list, tuple)) else str(tag_value).split()
+                if not value.issubset(classes):
+                    return False
+            elif isinstance(value, re.Pattern):
+                if not value.search(str(tag_value)):
+                    return False
+            elif tag_value != value:
+                return False
+        return True
+
+    def __str__(self):
+        # representação no formato de seletor CSS, utilizada nos relatórios de regras
+        description = self.name
+        for attr_name, value in self.attrs.items():
+            if attr_name == 'class' and isinstance(value, frozenset):
+                description += ''.join(f'.{class_name}' for class_name in sorted(value))
+            elif attr_name == 'id' and isinstance(value, str):
+                description += f'#{value}'
+            elif value is True:
+                description += f'[{attr_name}]'
+            elif isinstance(value, re.Pattern):
+                description += f'[{attr_name}~=/{value.pattern}/]'
+            else:
+                description += f'[{attr_name}="{value}"]'
+        return description
+
+
+class HtmlParser:
+    """
+    Classe responsável pela conversão do código-fonte (html) das páginas em objetos `BeautifulSoup`.
+
+    Utiliza o parser `lxml` (implementado em C) e, opcionalmente, uma lista de regras (`ElementRule`) que restringe a árvore
+    construída aos elementos (e respectivas subárvores) que o scraper realmente utiliza, descartando o restante da página
+    durante a leitura.
+
+    Constants:
+        - PARSER_BACKEND (str): Nome do parser utilizado pelo BeautifulSoup.
+    """
+
+    PARSER_BACKEND = 'lxml'
+
+    def __init__(self, rules: Sequence[Tuple[str, Dict]] = ()):
+        self._rules = [ElementRule(name, attrs) for name, attrs in rules]
+        self._strainer = SoupStrainer(self._match) if self._rules else None
+
+    def _match(self, tag_name: str, tag_attrs: Dict):
+        return any(rule.matches(tag_name, tag_attrs) for rule in self._rules)
+
+    def parse(self, page_source: str):
+        """Retorna o objeto `BeautifulSoup` da página, restrito às regras do parser (se houver)."""
+        return BeautifulSoup(page_source, HtmlParser.PARSER_BACKEND, parse_only=self._strainer)
+
+    @staticmethod
+    def for_selectors(selectors: Sequence[str]):
+        """
+        Retorna o parser restrito às tags (e respectivas subárvores) citadas nos seletores CSS, suficiente para avaliá-los
+        com `select_one`. Se algum seletor não identificar a tag de todos os seus elementos (ex.: `.classe`, `*`), o
+        parser retornado não tem restrições.
+        """
+        tag_names = set()
+        for selector in selectors:
+            # valores de atributos e argumentos de pseudo-classes podem conter os separadores dos elementos
+            selector = re.sub(r'\[[^\]]*\]|\([^)]*\)', '', selector)
+            for compound in re.split(r'[\s,>+~]+', selector.strip()):
+                match = re.match(r'[A-Za-z][\w-]*', compound)
+                if not match:
+                    return HtmlParser()
+                tag_names.add(match.group().lower())
+        return HtmlParser([(tag_name, {}) for tag_name in sorted(tag_names)])
+
+
+class ExtractionField:
+    """
+    Campo extraído de um artigo pelo `ArticleExtractor`.
+
+    :param rules: Regras alternativas `(nome_da_tag, {atributo: valor})`, em ordem de prioridade.
+    :param within: Nome do campo dentro do qual o elemento precisa estar (ex.: links dentro do conteúdo do artigo).
+    :param multiple: Se `True` todos os elementos encontrados são retornados, caso contrário apenas o primeiro.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[str, Dict]], within: str = None, multiple: bool = False):
+        self.rules = [ElementRule(name, attrs) for name, attrs in rules]
+        self.within = within
+        self.multiple = multiple
+
+
+class ExtractionResult:
+    """Resultado da extração de um artigo: os elementos encontrados para cada campo, na ordem do documento."""
+
+    def __init__(self, elements: Dict, containers: Dict):
+        self._elements = elements
+        self._containers = containers
+
+    def first(self, field_name: str):
+        elements = self._elements.get(field_name)
+        return elements[0] if elements else None
+
+    def all(self, field_name: str):
+        return list(self._elements.get(field_name, []))
+
+    def has(self, field_name: str):
+        return bool(self._elements.get(field_name))
+
+    def grouped(self, field_name: str):
+        """Retorna os elementos do campo agrupados pelo elemento do campo que os contém (`within`), na ordem do documento."""
+        groups = {}
+        for element, container in zip(self._elements.get(field_name, []), self._containers.get(field_name, [])):
+            groups.setdefault(id(container), (container, []))[1].append(element)
+        return list(groups.values())
+
+
+class ArticleExtractor:
+    """
+    Extrator que percorre a árvore do artigo uma única vez e coleta, ao mesmo tempo, todos os campos configurados
+    (propriedades meta, links, mídias, categorias, etc.), em vez de uma busca (`find`/`findAll`) completa por campo.
+
+    O custo da extração é proporcional ao tamanho do DOM, independentemente da quantidade de campos.
+
+    Entre as regras alternativas de um campo simples vence a de maior prioridade, como nas buscas encadeadas
+    (`find(...) or find(...)`) que o extrator substitui. Os campos com `within` consideram apenas os elementos que estão
+    dentro do(s) elemento(s) escolhido(s) para o campo que os contém.
+    """
+
+    def __init__(self, fields: Dict[str, ExtractionField]):
+        self._fields = fields
+        self._order = ArticleExtractor._sort_fields(fields)
+        # regras indexadas pelo nome da tag, para que cada elemento seja comparado apenas com as regras que podem casar
+        self._rules_by_tag = {}
+        for field_name, field in fields.items():
+            for priority, rule in enumerate(field.rules):
+                self._rules_by_tag.setdefault(rule.name, []).append((field_name, field.within, priority, rule))
+
+    @staticmethod
+    def _sort_fields(fields: Dict[str, ExtractionField]):
+        order = []
+
+        def visit(name: str):
+            if name not in order:
+                if fields[name].within:
+                    visit(fields[name].within)
+                order.append(name)
+
+        for field_name in fields:
+            visit(field_name)
+        return order
+
+    def extract(self, soup):
+        """Percorre a árvore uma única vez e retorna o `ExtractionResult` com os elementos de todos os campos."""
+        # candidatos por campo: (prioridade da regra, posição no documento, elemento, elemento que o contém)
+        candidates = {field_name: [] for field_name in self._fields}
+        position = 0
+        stack = [(child, {}) for child in reversed(soup.contents)]
+        while stack:
+            element, context = stack.pop()
+            if not isinstance(element, Tag):
+                continue
+            position += 1
+            matched = None
+            for field_name, within, priority, rule in self._rules_by_tag.get(element.name, ()):
+                if within and within not in context:
+                    continue
+                if matched is not None and matched.get(field_name) is element:
+                    continue
+                if rule.matches(element.name, element.attrs):
+                    candidates[field_name].append((priority, position, element, context.get(within)))
+                    if matched is None:
+                        matched = dict(context)
+                    matched[field_name] = element
+            child_context = matched if matched is not None else context
+            stack.extend((child, child_context) for child in reversed(element.contents))
+        return self._resolve(candidates)
+
+    def _resolve(self, candidates: Dict):
+        elements = {}
+        containers = {}
+        chosen = {}
+        for field_name in self._order:
+            field = self._fields[field_name]
+            valid = [
+                candidate for candidate in candidates[field_name]
+                if not field.within or id(candidate[3]) in chosen.get(field.within, set())
+            ]
+            if not field.multiple and valid:
+                valid = [min(valid, key=lambda candidate: (candidate[0], candidate[1]))]
+            elements[field_name] = [candidate[2] for candidate in valid]
+            containers[field_name] = [candidate[3] for candidate in valid]
+            chosen[field_name] = {id(candidate[2]) for candidate in valid}
+        return ExtractionResult(elements, containers)
+
+
+class LinkedDataReader:
+    """
+    Leitura dos metadados do artigo publicados pelos portais em blocos JSON-LD (`<script type="application/ld+json">`),
+    no vocabulário do schema.org (`NewsArticle` e tipos semelhantes).
+
+    Constants:
+        - SCRIPT_TYPE (str): Tipo (atributo `type`) das tags script com JSON-LD.
+        - ARTICLE_TYPES (frozenset): Tipos do schema.org que descrevem um artigo.
+    """
+
+    SCRIPT_TYPE = 'application/ld+json'
+    ARTICLE_TYPES = frozenset({
+        'NewsArticle', 'Article', 'ReportageNewsArticle', 'AnalysisNewsArticle', 'OpinionNewsArticle', 'BlogPosting'
+    })
+
+    @staticmethod
+    def read_article(scripts: Sequence[Tag]):
+        """Retorna o primeiro objeto (dict) do tipo artigo encontrado nas tags script informadas, ou um dict vazio."""
+        for script in scripts:
+            try:
+                data = json.loads(script.string or '')
+            except ValueError:
+                continue
+            for node in LinkedDataReader._iter_nodes(data):
+                types = node.get('@type')
+                if not isinstance(types, list):
+                    types = [types]
+                if any(isinstance(x, str) and x in LinkedDataReader.ARTICLE_TYPES for x in types):
+                    return node
+        return {}
+
+    @staticmethod
+    def _iter_nodes(data):
+        if isinstance(data, list):
+            for item in data:
+                yield from LinkedDataReader._iter_nodes(item)
+        elif isinstance(data, dict):
+            yield data
+            if '@graph' in data:
+                yield from LinkedDataReader._iter_nodes(data['@graph'])
+
+    @staticmethod
+    def get_author(node: Dict):
+        """Retorna o(s) nome(s) do(s) autor(es) do artigo, separados por vírgula, ou `None`."""
+        authors = node.get('author')
+        if not isinstance(authors, list):
+            authors = [authors]
+        names = []
+        for author in authors:
+            name = author.get('name') if isinstance(author, dict) else author
+            if isinstance(name, str) and name.strip():
+                names.append(name.strip())
+        return ', '.join(names) if names else None
+
+    @staticmethod
+    def parse_datetime(value, to_utc: bool = False):
+        """
+        Converte uma data/hora no formato ISO 8601 num `datetime` sem fuso horário, retornando `None` se o valor não estiver
+        nesse formato. Com `to_utc` a data/hora é convertida para UTC, caso contrário é mantido o horário local informado.
+        """
+        if not isinstance(value, str) or not value.strip():
+            return None
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace('z', 'Z').replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        if to_utc and parsed.tzinfo:
+            parsed = parsed.astimezone(timezone.utc)
+        return parsed.replace(tzinfo=None)
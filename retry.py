@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import os
+import random
+from datetime import datetime
+from threading import Lock
+from time import monotonic
+
+import aiohttp
+import requests
+from selenium.common.exceptions import WebDriverException
+
+
+class RetryPolicy:
+    """
+    Política de novas tentativas para falhas transitórias no download de páginas.
+
+    O intervalo entre as tentativas cresce exponencialmente (`base_delay * 2^(tentativa-1)`, limitado a `max_delay`) e é
+    sorteado entre zero e esse limite (full jitter), para que vários workers não repitam as requisições ao mesmo tempo.
+
+    Constants:
+        - RETRY_STATUS (tuple): Códigos de status HTTP considerados transitórios.
+    """
+
+    RETRY_STATUS = (408, 429, 500, 502, 503, 504)
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 2.0, max_delay: float = 60.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def get_delay(self, attempt: int):
+        """Retorna o tempo (segundos) a aguardar antes da tentativa seguinte à tentativa `attempt` (a partir de 1)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    @staticmethod
+    def is_transient(err: Exception):
+        """Retorna `True` se o erro é de rede/servidor (transitório) e a requisição pode ser repetida."""
+        if isinstance(err, requests.HTTPError):
+            return err.response is not None and err.response.status_code in RetryPolicy.RETRY_STATUS
+        if isinstance(err, aiohttp.ClientResponseError):
+            return err.status in RetryPolicy.RETRY_STATUS
+        return isinstance(err, (requests.ConnectionError, requests.Timeout, aiohttp.ClientError, WebDriverException,
+                                asyncio.TimeoutError, TimeoutError, ConnectionError))
+
+
+class CircuitBreaker:
+    """
+    Disjuntor (circuit breaker) que suspende as requisições a um site após falhas transitórias consecutivas.
+
+    Após `failure_threshold` falhas seguidas o disjuntor abre e `retry_in` passa a informar quanto tempo falta para a
+    próxima tentativa. Passado `reset_timeout`, uma única requisição de teste é liberada (meio aberto): as demais continuam
+    aguardando, em intervalos de `PROBE_POLL_INTERVAL` segundos, até que o resultado do teste seja registrado. Se o teste
+    tiver sucesso o disjuntor fecha, se falhar ele abre novamente. Um teste sem resultado registrado em `reset_timeout`
+    segundos (ex.: o worker foi interrompido) é considerado perdido, e outra requisição de teste é liberada.
+
+    Constants:
+        - PROBE_POLL_INTERVAL (float): Intervalo máximo (segundos) de espera enquanto a requisição de teste não termina.
+    """
+
+    PROBE_POLL_INTERVAL = 1.0
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probe_started_at = None
+        self._lock = Lock()
+
+    def is_open(self):
+        with self._lock:
+            return self._opened_at is not None
+
+    def retry_in(self):
+        """
+        Retorna quantos segundos faltam para que novas requisições sejam permitidas (zero se o disjuntor está fechado).
+
+        Com o disjuntor meio aberto, apenas quem recebe zero faz a requisição de teste, e deve registrar o seu resultado
+        (`record_success` ou `record_failure`).
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            now = monotonic()
+            remaining = self._opened_at + self.reset_timeout - now
+            if remaining > 0:
+                return remaining
+            if self._probe_started_at is not None and now - self._probe_started_at < self.reset_timeout:
+                return min(CircuitBreaker.PROBE_POLL_INTERVAL, self._probe_started_at + self.reset_timeout - now)
+            self._probe_started_at = now
+            return 0.0
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started_at = None
+
+    def record_failure(self):
+        """Registra uma falha transitória e retorna `True` se o disjuntor abriu (ou reabriu) com ela."""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = monotonic()
+                self._probe_started_at = None
+                return True
+            return False
+
+
+class DeadLetterFile:
+    """
+    Arquivo (JSON Lines) com as urls cujo download falhou definitivamente, para que possam ser reprocessadas depois.
+
+    Cada linha contém a url, o erro, a quantidade de tentativas e a data/hora da falha.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._lock = Lock()
+
+    def add(self, page_url: str, err: Exception, attempts: int):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            with open(self.file_path, 'a', encoding='utf-8') as arq:
+                arq.write(json.dumps({
+                    'url': page_url,
+                    'error': f'{err.__class__.__name__}: {str(err)}',
+                    'attempts': attempts,
+                    'failed_at': datetime.now().isoformat(timespec='seconds'),
+                }, ensure_ascii=False) + '\n')
+
+    def pop_all(self):
+        """Retorna as urls (sem repetição) registradas no arquivo e o esvazia."""
+        with self._lock:
+            if not os.path.exists(self.file_path):
+                return []
+            with open(self.file_path, 'r', encoding='utf-8') as arq:
+                page_urls = list(dict.fromkeys(json.loads(line)['url'] for line in arq if line.strip()))
+            os.remove(self.file_path)
+            return page_urls
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import re
+from typing import Dict, List
+
+import soupsieve
+
+from metrics import HitCounter
+from parsing import HtmlParser, ArticleExtractor, ExtractionField
+
+
+class RuleMismatchError(Exception):
+    """
+    Erro lançado quando uma página não contém os elementos obrigatórios das regras do site, o que normalmente indica que
+    o layout do portal mudou.
+    """
+
+    def __init__(self, site_name: str, section: str, url: str, missing_fields: List[str], rules: Dict[str, str]):
+        Exception.__init__(self, site_name, section, url, missing_fields, rules)
+        self.site_name = site_name
+        self.section = section
+        self.url = url
+        self.missing_fields = missing_fields
+        self.rules = rules
+
+    def __str__(self):
+        fields = ', '.join(f'{name} ({self.rules[name]})' for name in self.missing_fields if name in self.rules)
+        return f'[{self.site_name}] {self.section.upper()} PAGE DOES NOT MATCH THE SITE RULES ({self.url}): {fields}'
+
+
+class RuleSet:
+    """
+    Regras compiladas de uma seção (listagem ou artigo) das páginas de um site: os seletores CSS que indicam que a página
+    está pronta, os campos extraídos (`ExtractionField`), os formatos de data e o parser (`HtmlParser`) restrito às
+    subárvores dos campos de primeiro nível. Na listagem, `sorted_by_date` indica que os resultados da busca são
+    ordenados do mais recente para o mais antigo.
+
+    Cada campo tem contadores de acerto (`HitCounter`), e a ausência de um campo obrigatório (`required`) lança um
+    `RuleMismatchError` descrevendo as regras que não foram encontradas.
+    """
+
+    def __init__(self, site_name: str, section: str, config: Dict):
+        self.site_name = site_name
+        self.section = section
+        self.required_selectors = tuple(config.get('required_selectors', ()))
+        self.date_formats = dict(config.get('date_formats', {}))
+        self.datetime_utc = bool(config.get('datetime_utc', False))
+        self.sorted_by_date = bool(config.get('sorted_by_date', False))
+
+        fields = config.get('fields', {})
+        RuleSet._validate(site_name, section, fields, self.required_selectors)
+        self.fields = {
+            name: ExtractionField(
+                [RuleSet._compile_rule(rule) for rule in field['rules']],
+                field.get('within'),
+                field.get('multiple', False)
+            )
+            for name, field in fields.items()
+        }
+        self.required_fields = [name for name, field in fields.items() if field.get('required', False)]
+        self.parser = HtmlParser([
+            RuleSet._compile_rule(rule) for field in fields.values() if not field.get('within') for rule in field['rules']
+        ])
+        self.extractor = ArticleExtractor(self.fields)
+
+    @staticmethod
+    def _compile_rule(rule):
+        name, attrs = rule
+        compiled = {}
+        for attr_name, value in attrs.items():
+            if isinstance(value, dict):
+                value = re.compile(value['regex'], re.IGNORECASE if value.get('ignore_case') else 0)
+            compiled[attr_name] = value
+        return name, compiled
+
+    @staticmethod
+    def _validate(site_name: str, section: str, fields: Dict, required_selectors):
+        def error(msg: str):
+            return ValueError(f'[{site_name}] INVALID {section.upper()} RULES: {msg}')
+
+        for selector in required_selectors:
+            try:
+                soupsieve.compile(selector)
+            except Exception as err:
+                raise error(f'SELECTOR "{selector}" ({str(err)})')
+        for name, field in fields.items():
+            if not field.get('rules'):
+                raise error(f'FIELD "{name}" HAS NO RULES')
+            for rule in field['rules']:
+                if len(rule) != 2 or not isinstance(rule[0], str) or not isinstance(rule[1], dict):
+                    raise error(f'FIELD "{name}" RULE {rule} IS NOT [TAG, {{ATTRIBUTES}}]')
+            # a cadeia de campos `within` deve terminar num campo de primeiro nível
+            visited = [name]
+            within = field.get('within')
+            while within:
+                if within not in fields:
+                    raise error(f'FIELD "{name}" IS WITHIN UNKNOWN FIELD "{within}"')
+                if within in visited:
+                    raise error(f'FIELD "{name}" HAS A CIRCULAR "within" CHAIN')
+                visited.append(within)
+                within = fields[within].get('within')
+
+    def describe(self, field_name: str):
+        """Retorna as regras do campo no formato de seletores CSS (alternativas separadas por `|`)."""
+        return ' | '.join(str(rule) for rule in self.fields[field_name].rules)
+
+    def extract(self, page_source: str, url: str = None):
+        """
+        Retorna o `ExtractionResult` da página e a lista dos campos não encontrados, lançando `RuleMismatchError` se algum
+        campo obrigatório não for encontrado.
+        """
+        result = self.extractor.extract(self.parser.parse(page_source))
+        missing = self.get_missing_fields(result)
+        if any(name in missing for name in self.required_fields):
+            raise RuleMismatchError(
+                self.site_name, self.section, url, missing,
+                {name: self.describe(name) for name in self.required_fields}
+            )
+        return result, missing
+
+    def get_missing_fields(self, result):
+        return [name for name in self.fields if not result.has(name)]
+
+    def record_matches(self, missing_fields: List[str]):
+        """Registra o acerto (ou a falha) de cada campo da seção, dados os campos não encontrados numa página."""
+        for name in self.fields:
+            HitCounter.get(f'{self.site_name} RULE {self.section}.{name}').record(name not in missing_fields)
+
+
+class SiteRules:
+    """
+    Regras de extração de um site, lidas de um arquivo declarativo (JSON) do diretório `rules` e compiladas uma única vez,
+    na carga do scraper: `listing` (páginas de resultados da busca) e `document` (páginas dos artigos).
+
+    Um arquivo inválido (campo sem regras, `within` inexistente, seletor CSS inválido) impede a carga do scraper, com uma
+    mensagem que indica o problema.
+
+    Constants:
+        - RULES_DIR (str): Diretório com os arquivos de regras dos sites.
+    """
+
+    RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules')
+
+    def __init__(self, site_name: str, config: Dict):
+        self.site_name = site_name
+        self.listing = RuleSet(site_name, 'listing', config.get('listing', {}))
+        self.document = RuleSet(site_name, 'document', config.get('document', {}))
+
+    @classmethod
+    def load(cls, file_name: str):
+        """Lê e compila o arquivo de regras informado (ex.: `g1.json`)."""
+        with open(os.path.join(cls.RULES_DIR, file_name), 'r', encoding='utf-8') as rules_file:
+            config = json.load(rules_file)
+        return SiteRules(config.get('site', file_name), config)
+
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import urllib.parse
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from time import monotonic, sleep
+
+from logs import Logger
+
+
+class TokenBucket:
+    """
+    Balde de fichas (token bucket) que limita a taxa de requisições a um host.
+
+    Cada requisição reserva uma ficha; quando o balde está vazio a reserva fica "em débito" e retorna o tempo que o
+    solicitante deve aguardar, o que garante a ordem de chegada (FIFO) entre threads e corrotinas concorrentes.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = monotonic()
+        self._paused_until = 0.0
+        self._lock = Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Reserva uma ficha e retorna quantos segundos o solicitante deve aguardar antes de fazer a requisição."""
+        with self._lock:
+            now = monotonic()
+            if now < self._paused_until:
+                # durante a pausa o balde não acumula fichas
+                self._updated = max(self._updated, self._paused_until)
+            else:
+                self._refill(now)
+            self._tokens -= 1
+            wait = max(0.0, self._paused_until - now)
+            if self._tokens < 0:
+                wait = max(wait, (self._updated - now) + (-self._tokens / self.rate))
+            return wait
+
+    def pause(self, seconds: float):
+        """Suspende a liberação de fichas pelo tempo informado (ex.: cabeçalho Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, monotonic() + seconds)
+            # ao fim da pausa apenas uma requisição é liberada de imediato, as demais seguem a taxa do balde
+            self._tokens = min(self._tokens, 1)
+
+
+class PolitenessScheduler:
+    """
+    Escalonador de requisições que aplica, por domínio, um limite de taxa (`TokenBucket`).
+
+    Toda requisição (busca de links ou download de artigos) deve chamar `acquire` (ou `acquire_async`) antes de ser feita.
+    Como cada host possui o seu próprio balde, a espera por um host nunca atrasa as requisições a outro host.
+
+    O escalonador segue o pattern Singleton (`get_instance`), de modo que todos os scrapers de um processo compartilham os
+    mesmos limites por host.
+
+    Constants:
+        - DEFAULT_RATE (float): Taxa padrão (requisições por segundo) de um host sem taxa configurada.
+        - DEFAULT_BURST (float): Quantidade padrão de requisições que podem ser feitas em rajada.
+        - DEFAULT_RETRY_AFTER (float): Pausa (segundos) aplicada quando o servidor limita as requisições sem informar Retry-After.
+        - THROTTLING_STATUS (tuple): Códigos de status HTTP que indicam limitação de requisições pelo servidor.
+    """
+
+    DEFAULT_RATE = 2.0
+    DEFAULT_BURST = 4.0
+    DEFAULT_RETRY_AFTER = 30.0
+    THROTTLING_STATUS = (429, 503)
+    __instance = None
+    __instance_lock = Lock()
+
+    def __init__(self, default_rate: float = DEFAULT_RATE, default_burst: float = DEFAULT_BURST):
+        self._default_rate = default_rate
+        self._default_burst = default_burst
+        self._buckets = {}
+        self._stats = {}
+        self._lock = Lock()
+
+    @classmethod
+    def get_instance(cls):
+        with cls.__instance_lock:
+            if not cls.__instance:
+                cls.__instance = PolitenessScheduler()
+            return cls.__instance
+
+    @staticmethod
+    def get_host(url: str):
+        return urllib.parse.urlparse(url).netloc
+
+    def set_rate(self, host: str, rate: float, burst: float = None):
+        """Configura a taxa (requisições por segundo) e a rajada permitidas para o host informado."""
+        with self._lock:
+            self._buckets[host] = TokenBucket(rate, burst if burst else max(1.0, rate))
+
+    def has_rate(self, host: str):
+        with self._lock:
+            return host in self._buckets
+
+    def _get_bucket(self, host: str):
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self._default_rate, self._default_burst)
+            if host not in self._stats:
+                self._stats[host] = {'requests': 0, 'throttled': 0, 'waited': 0.0, 'first': None, 'last': None}
+            return self._buckets[host]
+
+    def reserve(self, url: str):
+        """Reserva uma requisição ao host da url e retorna quantos segundos devem ser aguardados antes de fazê-la."""
+        host = PolitenessScheduler.get_host(url)
+        wait = self._get_bucket(host).reserve()
+        with self._lock:
+            stats = self._stats[host]
+            granted_at = monotonic() + wait
+            stats['requests'] += 1
+            stats['waited'] += wait
+            stats['first'] = granted_at if stats['first'] is None else min(stats['first'], granted_at)
+            stats['last'] = granted_at if stats['last'] is None else max(stats['last'], granted_at)
+        return wait
+
+    def acquire(self, url: str):
+        """Bloqueia a thread atual até que uma requisição ao host da url seja permitida."""
+        wait = self.reserve(url)
+        if wait > 0:
+            sleep(wait)
+
+    async def acquire_async(self, url: str):
+        """Suspende a corrotina atual até que uma requisição ao host da url seja permitida."""
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def retry_after(self, url: str, retry_after: str = None):
+        """
+        Pausa o host da url após uma resposta de limitação (429/503), respeitando o cabeçalho Retry-After.
+
+        :param url: Url da requisição limitada.
+        :param retry_after: Valor do cabeçalho Retry-After (segundos ou data HTTP), se presente.
+        """
+        host = PolitenessScheduler.get_host(url)
+        seconds = PolitenessScheduler.parse_retry_after(retry_after)
+        self._get_bucket(host).pause(seconds)
+        with self._lock:
+            self._stats[host]['throttled'] += 1
+        Logger.warn(f"\tHOST {host} THROTTLED, PAUSING FOR {seconds:.1f}s")
+
+    @staticmethod
+    def parse_retry_after(retry_after: str = None):
+        if not retry_after:
+            return PolitenessScheduler.DEFAULT_RETRY_AFTER
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return PolitenessScheduler.DEFAULT_RETRY_AFTER
+
+    def report(self):
+        """
+        Retorna, por host, a taxa permitida e a taxa efetivamente obtida, para calibração dos limites.
+
+        :return: Um dicionário {host: {'allowed', 'achieved', 'requests', 'throttled', 'waited'}}.
+        """
+        with self._lock:
+            report = {}
+            for host, stats in self._stats.items():
+                elapsed = (stats['last'] - stats['first']) if stats['requests'] > 1 else 0.0
+                report[host] = {
+                    'allowed': self._buckets[host].rate,
+                    'achieved': (stats['requests'] - 1) / elapsed if elapsed > 0 else 0.0,
+                    'requests': stats['requests'],
+                    'throttled': stats['throttled'],
+                    'waited': stats['waited'],
+                }
+            return report
+
+    def log_report(self):
+        for host, stats in self.report().items():
+            Logger.info(
+                f"RATE [{host}]: ALLOWED={stats['allowed']:.2f}/s ACHIEVED={stats['achieved']:.2f}/s "
+                f"REQUESTS={stats['requests']} THROTTLED={stats['throttled']} WAITED={stats['waited']:.1f}s"
+            )
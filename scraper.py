@@ -1,25 +1,82 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import io
+import multiprocessing
 import os
 import re
 import urllib.parse
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
+from queue import Queue
+from threading import Thread, Lock
 from time import sleep
 from typing import List
 
-from bs4 import BeautifulSoup
-from bs4.element import Comment
-from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
+from bs4.element import Comment, NavigableString
 
-from database import ArticleController, ArticleTopicController, ArticleHyperlinkController, ArticleCategoryController, \
-    ArticleMediaController
+from archive import PageArchive
+from browser_session import BrowserSessionManager
+from bulk_loader import BulkLoader
+from database import ArticleController
+from fetch_cache import FetchCache
+from fetcher import BrowserFetcher, BrowserProfile, HttpFetcher, FallbackFetcher, PoliteFetcher, PageSource
 from logs import Logger
-from model import ArticleParser, ArticleTopic, ArticleMedia, ArticleHyperlink, ArticleCategory, Article
+from metrics import LatencyHistogram, TransferCounter, HitCounter
+from model import ArticleParser, ArticleTopic, ArticleMedia, ArticleHyperlink, ArticleCategory, ArticleBundle
+from parsing import LinkedDataReader
+from retry import RetryPolicy, CircuitBreaker, DeadLetterFile
+from rules import SiteRules, RuleMismatchError
+from scheduler import PolitenessScheduler
+from write_behind import WriteBehindQueue
+
+# scraper utilizado pelos processos de extração (definido uma única vez, na inicialização de cada processo)
+_parse_process_scraper = None
+
+
+def _init_parse_process(scraper):
+    global _parse_process_scraper
+    Logger.configure()
+    _parse_process_scraper = scraper
+
+
+def _build_bundle_in_process(document_url: str, page_source: str):
+    return _parse_process_scraper._build_bundle(document_url, page_source)
 
 
 class WebScraper:
 
-    def __init__(self, wait_time: int, from_timestamp: float, to_timestamp: float, save_html: bool, save_txt: bool, save_db: bool):
+    ENGINE_BROWSER = 'browser'
+    ENGINE_HTTP = 'http'
+
+    FETCH_ENGINE = ENGINE_BROWSER
+    FIRST_LISTING_PAGE = 1
+    RULES = None
+    LISTING_REQUIRED_SELECTORS = ()
+    DOCUMENT_REQUIRED_SELECTORS = ()
+    REQUESTS_PER_SECOND = PolitenessScheduler.DEFAULT_RATE
+    REQUESTS_BURST = PolitenessScheduler.DEFAULT_BURST
+    QUEUE_SIZE_PER_WORKER = 10
+    PENDING_DOCUMENTS_PER_WORKER = 4
+    DATABASE_WRITERS = 2
+    DATABASE_QUEUE_SIZE = 100
+    DATABASE_BATCH_SIZE = 20
+    DATABASE_FLUSH_INTERVAL = 1.0
+    BROWSER_PROFILE = BrowserProfile()
+    RETRY_POLICY = RetryPolicy()
+    CIRCUIT_FAILURE_THRESHOLD = 5
+    CIRCUIT_RESET_TIMEOUT = 60.0
+    DEAD_LETTER_DIR_NAME = 'dead_letter'
+    FETCH_CACHE_DIR_NAME = 'fetch_cache'
+    HTML_DIR_NAME = 'html'
+    TXT_DIR_NAME = 'txt'
+    SOURCE_LINKED_DATA = 'ld+json'
+    SOURCE_OPEN_GRAPH = 'og'
+    SOURCE_DOM = 'dom'
+    COMPRESS_HTML = True
+    MEDIA_TAGS = ('video', 'audio', 'img')
+
+    def __init__(self, wait_time: int, from_timestamp: float, to_timestamp: float, save_html: bool, save_txt: bool, save_db: bool, workers: int = 1, fetch_engine: str = None, parse_processes: int = 0, incremental: bool = False, recrawl: bool = False, bulk_load: bool = False):
         self._NAME = 'Scrapper'
         self._BASE_URL = 'https://'
         self._OUTPUT_DIR_NAME = 'news_output'
@@ -29,34 +86,510 @@ class WebScraper:
         self._SAVE_HTML = save_html
         self._SAVE_TXT = save_txt
         self._SAVE_DB = save_db
+        self._WORKERS = max(1, workers)
+        self._FETCH_ENGINE = fetch_engine if fetch_engine else self.FETCH_ENGINE
+        self._PARSE_PROCESSES = max(0, parse_processes)
+        self._INCREMENTAL = incremental
+        self._RECRAWL = recrawl
+        self._BULK_LOAD = bulk_load
+        self._parse_pool = None
+        self._page_archive = None
+        self._fetch_cache = None
+        self._bulk_loader = None
+        self._write_queue = None
+        self._stats = WebScraper._new_stats()
+        self._stats_lock = Lock()
+        self._circuit_breaker = self._new_circuit_breaker()
+
+    def __getstate__(self):
+        # locks, o pool de processos e o arquivo de páginas não podem ser serializados (pickle), são recriados no processo de destino
+        state = self.__dict__.copy()
+        del state['_stats_lock']
+        del state['_circuit_breaker']
+        del state['_parse_pool']
+        del state['_page_archive']
+        del state['_fetch_cache']
+        del state['_bulk_loader']
+        del state['_write_queue']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._stats_lock = Lock()
+        self._circuit_breaker = self._new_circuit_breaker()
+        self._parse_pool = None
+        self._page_archive = None
+        self._fetch_cache = None
+        self._bulk_loader = None
+        self._write_queue = None
+
+    def _new_circuit_breaker(self):
+        return CircuitBreaker(self.CIRCUIT_FAILURE_THRESHOLD, self.CIRCUIT_RESET_TIMEOUT)
+
+    @staticmethod
+    def _new_stats():
+        return {'found': 0, 'skipped': 0, 'pruned': 0, 'downloaded': 0, 'unchanged': 0, 'failed': 0, 'retried': 0, 'errors': []}
+
+    def get_circuit_breaker(self):
+        return self._circuit_breaker
+
+    def get_dead_letter(self):
+        return DeadLetterFile(os.path.join(os.getcwd(), self.DEAD_LETTER_DIR_NAME, f'{self.get_scrapper_name()}.jsonl'))
+
+    def _record_download(self, page_url: str, err: Exception = None):
+        with self._stats_lock:
+            if err:
+                self._stats['failed'] += 1
+                self._stats['errors'].append(f'{page_url}: {str(err)}')
+            else:
+                self._stats['downloaded'] += 1
+
+    def _record_unchanged(self, document_url: str):
+        Logger.info(f"\tARTICLE NOT MODIFIED SINCE THE LAST DOWNLOAD: {document_url}")
+        with self._stats_lock:
+            self._stats['unchanged'] += 1
+
+    def get_stats(self):
+        with self._stats_lock:
+            return {key: list(value) if isinstance(value, list) else value for key, value in self._stats.items()}
+
+    def _get_listing_url(self, search_term: str, page: int):
+        return None
+
+    def _parse_document_links(self, extraction):
+        # retorna os links de artigos da página de resultados e se existe uma próxima página
+        return [], False
+
+    def _get_listing_dates(self, extraction):
+        # retorna o timestamp exibido na página de resultados para cada link de artigo (se o site o exibir)
+        return {}
+
+    def _get_listing_timestamp(self, element):
+        # data/hora de um resultado da busca: atributo `datetime` (ISO 8601) ou o texto no formato `listing` das regras
+        value = element.get('datetime')
+        try:
+            if value:
+                return datetime.fromisoformat(value.strip().replace('z', 'Z').replace('Z', '+00:00')).timestamp()
+            date_format = self.RULES.listing.date_formats.get('listing')
+            return datetime.strptime(element.get_text(' ', strip=True), date_format).timestamp() if date_format else None
+        except ValueError:
+            return None
+
+    def _parse_listing(self, page_source: str, listing_url: str = None):
+        try:
+            extraction, missing_fields = self.RULES.listing.extract(page_source, listing_url)
+        except RuleMismatchError as err:
+            self.RULES.listing.record_matches(err.missing_fields)
+            raise
+        self.RULES.listing.record_matches(missing_fields)
+        links, has_next = self._parse_document_links(extraction)
+        # uma página sem resultados encerra a paginação
+        has_next = has_next and bool(links)
+        dates = self._get_listing_dates(extraction)
+        if not dates:
+            return links, has_next
+
+        # os links fora do intervalo da busca são descartados antes do download
+        in_interval = [
+            link for link in links
+            if link not in dates or self._FROM_TIMESTAMP <= dates[link] <= self._TO_TIMESTAMP
+        ]
+        if len(in_interval) < len(links):
+            Logger.info(f"\tLISTING: {len(links) - len(in_interval)} ARTICLES OUT OF SEARCH INTERVAL")
+            with self._stats_lock:
+                self._stats['pruned'] += len(links) - len(in_interval)
+
+        # resultados ordenados do mais recente para o mais antigo: a partir de um resultado anterior ao intervalo, todas
+        # as páginas seguintes também estão fora dele
+        dated = [dates[link] for link in links if link in dates]
+        if has_next and self.RULES.listing.sorted_by_date and dated and dated[-1] < self._FROM_TIMESTAMP:
+            Logger.info(f"\tLISTING: RESULTS OLDER THAN THE SEARCH INTERVAL, STOPPING PAGINATION")
+            has_next = False
+        # mesmo sem links no intervalo (resultados mais recentes que ele) a paginação continua
+        return in_interval, has_next
+
+    def _extract_document(self, page_source: str, document_url: str = None):
+        # todos os campos do artigo (regras do site) são coletados num único percurso da árvore
+        return self.RULES.document.extract(page_source, document_url)
+
+    def _iter_document_links(self, fetcher, search_term: str):
+        Logger.info(f'GETTING ARTICLES FOR SEARCH TERM="{search_term}" ')
+        page = self.FIRST_LISTING_PAGE
+        while True:
+            listing_url = self._get_listing_url(search_term, page)
+            page_source = fetcher.fetch(listing_url, self.LISTING_REQUIRED_SELECTORS)
+            links, has_next = self._parse_listing(page_source, listing_url)
+            for article_url in links:
+                Logger.info(f'\tARTICLE FOUND: {article_url}')
+                yield article_url
+            if not has_next:
+                break
+            page += 1
 
-    def _get_document_links(self, browser, search_term: str):
-        return set()
+    def _get_document_url(self, page_url: str):
+        return urllib.parse.urljoin(self.get_base_url(), page_url)
+
+    def _normalize_article_url(self, article_url: str):
+        # forma canônica (minúsculas) da url do artigo, utilizada na gravação e na comparação com os links das buscas
+        return article_url.lower()
+
+    def _load_known_urls(self):
+        """
+        Carrega o resumo (`_link_key`) das urls dos artigos do portal já gravados no banco de dados, utilizado pelo modo
+        incremental para não baixar novamente esses artigos.
+        """
+        known_urls = set()
+        try:
+            for article_url in ArticleController.fetch_urls(self.get_base_url()):
+                known_urls.add(WebScraper._link_key(self._normalize_article_url(article_url)))
+        except Exception as err:
+            Logger.error(f"[{self.get_scrapper_name()}]: COULD NOT LOAD KNOWN ARTICLES ({str(err)})")
+        Logger.info(f"[{self.get_scrapper_name()}]: {len(known_urls)} KNOWN ARTICLES LOADED")
+        return known_urls
+
+    def _is_known_article(self, page_url: str, known_urls):
+        return WebScraper._link_key(self._normalize_article_url(self._get_document_url(page_url))) in known_urls
+
+    def _get_request_headers(self, document_url: str):
+        # no modo de atualização a requisição é condicional aos dados de validação do último download
+        return self.get_fetch_cache().get_conditional_headers(document_url) if self._RECRAWL else None
+
+    def _get_document(self, fetcher, page_url: str):
+        document_url = self._get_document_url(page_url)
+        Logger.info(f"DOWNLOADING ARTICLE: {document_url}")
+        return document_url, fetcher.fetch(document_url, self.DOCUMENT_REQUIRED_SELECTORS, self._get_request_headers(document_url))
 
-    def _get_document(self, browser, page_url: str):
-        pass
+    def _is_unchanged_page(self, document_url: str, page_source: str):
+        # a página não mudou se o servidor respondeu 304 ou se o conteúdo é idêntico ao do último download
+        if not self._RECRAWL:
+            return False
+        if PageSource.is_not_modified(page_source):
+            return True
+        entry = self.get_fetch_cache().get(document_url)
+        return bool(entry) and entry.get('content_hash') == FetchCache.get_content_hash(page_source)
 
-    def start(self, search_terms: List[str]):
-        Logger.info(f"[{self.get_scrapper_name()}]: STARTED")
-        op = webdriver.ChromeOptions()
-        # op.add_argument('headless')
-        browser = webdriver.Chrome(ChromeDriverManager().install(), options=op)
-        browser.maximize_window()
+    def _build_bundle(self, document_url: str, page_source: str):
+        # extrai o artigo da página (CPU), retorna None se o artigo deve ser ignorado
+        return None
 
-        page_urls = set()
-        for term in search_terms:
-            page_urls.update(self._get_document_links(browser, term))
+    def _store_bundle(self, document_url: str, page_source: str, bundle: ArticleBundle):
+        if not self._SAVE_DB:
+            return
+        # os dados de validação da página só entram no cache depois que o artigo for gravado (`_record_saved`)
+        context = (document_url, FetchCache.new_entry(document_url, page_source, bundle.article.modified))
+        if self.is_bulk_load():
+            # carga em massa: o artigo é acumulado e gravado junto com os demais do lote
+            self.get_bulk_loader().add(bundle, context)
+            return
+        # o artigo, os tópicos, os links, as categorias e as mídias são gravados em segundo plano, numa única transação (tudo
+        # ou nada). No modo de atualização o artigo é atualizado e as entidades relacionadas são substituídas pelas extraídas agora
+        Logger.info(f"\tQUEUEING ARTICLE FOR DATABASE {'UPDATE' if self._RECRAWL else 'INSERT'}")
+        self.get_write_queue().put(bundle, context)
+
+    def _record_saved(self, context):
+        _, cache_entry = context
+        self.get_fetch_cache().put(cache_entry)
+
+    def _record_already_saved(self, context):
+        # carga em massa: o artigo já estava gravado e não foi alterado. Ele não entra no cache, que descreve a versão gravada
+        document_url, _ = context
+        Logger.info(f"\tARTICLE ALREADY IN DATABASE, NOT LOADED: {document_url}")
+        with self._stats_lock:
+            self._stats['skipped'] += 1
+
+    def _record_save_failure(self, context, err: Exception):
+        # o artigo já foi contado como baixado: passa a ser uma falha, vai para o arquivo de falhas e sai do cache, para
+        # que seja baixado e gravado novamente
+        document_url, _ = context
+        Logger.warn(f"\tARTICLE NOT SAVED INTO DATABASE: {document_url}")
+        with self._stats_lock:
+            self._stats['downloaded'] -= 1
+            self._stats['failed'] += 1
+            self._stats['errors'].append(f'{document_url}: {str(err)}')
+        self.get_dead_letter().add(document_url, err, 1)
+        self.get_fetch_cache().remove(document_url)
+
+    def _process_document(self, document_url: str, page_source: str):
+        try:
+            bundle = self._build_bundle(document_url, page_source)
+        except RuleMismatchError as err:
+            self.RULES.document.record_matches(err.missing_fields)
+            raise
+        if bundle:
+            self._save_bundle(document_url, page_source, bundle)
+
+    def _save_bundle(self, document_url: str, page_source: str, bundle: ArticleBundle):
+        self._record_bundle_stats(bundle)
+        entry = self.get_fetch_cache().get(document_url) if self._RECRAWL else None
+        # no modo de atualização, um artigo com a mesma data/hora de modificação da última gravação não é gravado novamente
+        if entry and entry.get('modified') and entry['modified'] == str(bundle.article.modified):
+            self._record_unchanged(document_url)
+            # o artigo já está gravado: apenas os dados de validação da página são atualizados
+            self.get_fetch_cache().update(document_url, page_source, bundle.article.modified)
+        else:
+            self._store_bundle(document_url, page_source, bundle)
+
+    def _record_bundle_stats(self, bundle: ArticleBundle):
+        # acertos das regras do site e do caminho rápido (JSON-LD/OpenGraph), registrados no processo principal
+        self.RULES.document.record_matches(bundle.missing_fields)
+        for property_name, source in bundle.metadata_sources.items():
+            HitCounter.get(f'{self.get_scrapper_name()} {property_name}').record(
+                source in (WebScraper.SOURCE_LINKED_DATA, WebScraper.SOURCE_OPEN_GRAPH), source
+            )
 
-        for page_url in page_urls:
+    def _new_parse_pool(self):
+        if not self._PARSE_PROCESSES:
+            return None
+        return ProcessPoolExecutor(
+            max_workers=self._PARSE_PROCESSES,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_parse_process,
+            initargs=(self,)
+        )
+
+    def _submit_document(self, document_url: str, page_source: str):
+        # sem pool de processos a extração é feita na própria thread, e o resultado é entregue num Future já concluído
+        if self._parse_pool:
+            # apenas o texto é enviado ao processo, os bytes originais da página ficam no worker
+            return self._parse_pool.submit(_build_bundle_in_process, document_url, str(page_source))
+        future = Future()
+        try:
+            future.set_result(self._build_bundle(document_url, page_source))
+        except Exception as err:
+            future.set_exception(err)
+        return future
+
+    def _complete_document(self, worker_id: int, page_url: str, document_url: str, page_source: str, future: Future):
+        try:
+            bundle = future.result()
+            if bundle:
+                self._save_bundle(document_url, page_source, bundle)
+            self._record_download(page_url)
+        except Exception as err:
+            if isinstance(err, RuleMismatchError):
+                self.RULES.document.record_matches(err.missing_fields)
+            self.get_dead_letter().add(page_url, err, 1)
+            self._record_download(page_url, err)
+            Logger.error(f"[{self.get_scrapper_name()}][WORKER {worker_id}]: {str(err)}")
+
+    def get_scheduler(self):
+        scheduler = PolitenessScheduler.get_instance()
+        host = PolitenessScheduler.get_host(self.get_base_url())
+        if not scheduler.has_rate(host):
+            scheduler.set_rate(host, self.REQUESTS_PER_SECOND, self.REQUESTS_BURST)
+        return scheduler
+
+    def _create_browser_fetcher(self):
+        return PoliteFetcher(
+            BrowserFetcher(BrowserSessionManager.get_instance(), self.BROWSER_PROFILE, self.get_load_waiting_time()),
+            self.get_scheduler()
+        )
+
+    def _create_fetcher(self):
+        browser_fetcher = self._create_browser_fetcher()
+        if self.get_fetch_engine() == WebScraper.ENGINE_HTTP:
+            return FallbackFetcher(PoliteFetcher(HttpFetcher(), self.get_scheduler()), browser_fetcher)
+        return browser_fetcher
+
+    def _download_worker(self, worker_id: int, page_queue: Queue, fetcher=None):
+        if not fetcher:
+            fetcher = self._create_fetcher()
+
+        # páginas baixadas cuja extração ainda está em andamento no pool de processos
+        pending = deque()
+        try:
+            while True:
+                page_url = page_queue.get()
+                if page_url is None:
+                    break
+                try:
+                    document_url, page_source = self._download_with_retry(fetcher, page_url)
+                    if self._is_unchanged_page(document_url, page_source):
+                        self._record_unchanged(document_url)
+                    else:
+                        pending.append((page_url, document_url, page_source, self._submit_document(document_url, page_source)))
+                except Exception as err:
+                    self._record_download(page_url, err)
+                    Logger.error(f"[{self.get_scrapper_name()}][WORKER {worker_id}]: {str(err)}")
+                # o worker só aguarda a extração quando atinge o limite de páginas pendentes
+                while pending and (pending[0][3].done() or len(pending) >= self.PENDING_DOCUMENTS_PER_WORKER):
+                    self._complete_document(worker_id, *pending.popleft())
+        finally:
+            fetcher.close()
+            while pending:
+                self._complete_document(worker_id, *pending.popleft())
+
+    def _download_with_retry(self, fetcher, page_url: str):
+        attempt = 1
+        while True:
+            # com o disjuntor aberto o site está fora do ar: o link aguarda a reabertura em vez de ser descartado
+            pause = self._get_circuit_pause(page_url)
+            while pause > 0:
+                sleep(pause)
+                pause = self._circuit_breaker.retry_in()
             try:
-                self._get_document(browser, page_url)
+                document = self._get_document(fetcher, page_url)
+                self._circuit_breaker.record_success()
+                return document
             except Exception as err:
-                Logger.error(str(err))
+                delay = self._record_attempt_failure(page_url, err, attempt)
+                if delay is None:
+                    raise
+                sleep(delay)
+                attempt += 1
+
+    def _get_circuit_pause(self, page_url: str):
+        pause = self._circuit_breaker.retry_in()
+        if pause > 0:
+            Logger.warn(f"\t[{self.get_scrapper_name()}]: CIRCUIT OPEN, WAITING {pause:.1f}s TO RETRY {page_url}")
+        return pause
+
+    def _record_attempt_failure(self, page_url: str, err: Exception, attempt: int):
+        """
+        Registra a falha da tentativa `attempt` de download do link no disjuntor e retorna o tempo (segundos) a aguardar
+        antes da próxima tentativa, ou `None` se o link não deve ser repetido (e foi registrado no arquivo de falhas).
+        """
+        transient = self.RETRY_POLICY.is_transient(err)
+        if not transient:
+            # o site respondeu (ex.: 404): a falha é da página, não do site
+            self._circuit_breaker.record_success()
+        elif self._circuit_breaker.record_failure():
+            Logger.warn(f"\t[{self.get_scrapper_name()}]: CIRCUIT OPENED FOR {self.CIRCUIT_RESET_TIMEOUT:.0f}s")
+        if not transient or attempt >= self.RETRY_POLICY.max_attempts:
+            self.get_dead_letter().add(page_url, err, attempt)
+            return None
+        delay = self.RETRY_POLICY.get_delay(attempt)
+        Logger.warn(f"\tATTEMPT {attempt} FAILED ({str(err)}), RETRYING IN {delay:.1f}s: {page_url}")
+        with self._stats_lock:
+            self._stats['retried'] += 1
+        return delay
+
+    @staticmethod
+    def _link_key(page_url: str):
+        # resumo de 8 bytes do link, para que o conjunto de links já vistos ocupe pouca memória
+        return hashlib.blake2b(page_url.encode('utf-8'), digest_size=8).digest()
+
+    def _discover_links(self, search_terms: List[str], page_queue: Queue, known_urls=frozenset()):
+        fetcher = self._create_fetcher()
+        seen = set()
+        try:
+            for term in search_terms:
+                try:
+                    for page_url in self._iter_document_links(fetcher, term):
+                        if self._accept_link(page_url, seen, known_urls):
+                            # bloqueia enquanto a fila estiver cheia, até que os workers consumam os links
+                            page_queue.put(page_url)
+                except Exception as err:
+                    with self._stats_lock:
+                        self._stats['errors'].append(f'{term}: {str(err)}')
+                    Logger.error(f"[{self.get_scrapper_name()}]: {str(err)}")
+        finally:
+            fetcher.close()
+
+    def _accept_link(self, page_url: str, seen: set, known_urls=frozenset()):
+        """
+        Registra o link encontrado na busca e retorna `True` se o artigo deve ser baixado: links repetidos (`seen` guarda o
+        `_link_key` dos links já vistos) são ignorados e, no modo incremental, os artigos já gravados também.
+        """
+        key = WebScraper._link_key(page_url)
+        if key in seen:
+            return False
+        seen.add(key)
+        with self._stats_lock:
+            self._stats['found'] += 1
+        # modo incremental: artigos já gravados no banco de dados não são baixados novamente
+        if known_urls and self._is_known_article(page_url, known_urls):
+            with self._stats_lock:
+                self._stats['skipped'] += 1
+            return False
+        return True
+
+    def _enqueue_links(self, page_urls: List[str], page_queue: Queue):
+        with self._stats_lock:
+            self._stats['found'] += len(page_urls)
+        for page_url in page_urls:
+            page_queue.put(page_url)
+
+    def begin_run(self):
+        """
+        Prepara o scraper para uma execução: zera as estatísticas e cria o pool de processos de extração (se configurado).
+        Toda execução iniciada precisa ser encerrada com `finish_run`.
+        """
+        self._stats = WebScraper._new_stats()
+        self._parse_pool = self._new_parse_pool()
+        if self._parse_pool:
+            Logger.info(f"[{self.get_scrapper_name()}]: PARSING ARTICLES WITH {self._PARSE_PROCESSES} PROCESSES")
+
+    def finish_run(self):
+        """
+        Encerra a execução iniciada com `begin_run`: aguarda as extrações e gravações pendentes, fecha o arquivo de páginas
+        e o cache de downloads, registra as métricas no log e retorna as estatísticas da execução.
+        """
+        if self._parse_pool:
+            self._parse_pool.shutdown(wait=True)
+            self._parse_pool = None
+        self._close_page_archive()
+        # os artigos pendentes são gravados antes do fechamento do cache, que recebe os dados dos artigos gravados
+        self._close_bulk_loader()
+        self._close_write_queue()
+        self._close_fetch_cache()
+
+        LatencyHistogram.log_all()
+        TransferCounter.log_all()
+        HitCounter.log_all()
+        self.get_scheduler().log_report()
+        stats = self.get_stats()
+        if self.is_incremental():
+            Logger.info(f"[{self.get_scrapper_name()}]: {WebScraper.get_skip_summary(stats)}")
+        return stats
+
+    def _run(self, producer):
+        self.begin_run()
+
+        # os links produzidos são baixados à medida que a busca avança, numa fila limitada
+        page_queue = Queue(maxsize=self.get_workers() * WebScraper.QUEUE_SIZE_PER_WORKER)
+        Logger.info(f"[{self.get_scrapper_name()}]: DOWNLOADING ARTICLES WITH {self.get_workers()} WORKERS")
+        workers = [
+            Thread(
+                target=self._download_worker,
+                args=(worker_id, page_queue),
+                name=f'{self.get_scrapper_name()}-worker-{worker_id}'
+            )
+            for worker_id in range(1, self.get_workers() + 1)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            producer(page_queue)
+        finally:
+            for _ in workers:
+                page_queue.put(None)
+            for worker in workers:
+                worker.join()
+            stats = self.finish_run()
+        return stats
+
+    @staticmethod
+    def get_skip_summary(stats):
+        ratio = stats['skipped'] / stats['found'] if stats['found'] else 0.0
+        return f"SKIPPED {stats['skipped']}/{stats['found']} KNOWN ARTICLES ({ratio * 100:.1f}%)"
+
+    def start(self, search_terms: List[str]):
+        mode = ' (RECRAWL)' if self._RECRAWL else ' (INCREMENTAL)' if self._INCREMENTAL else ''
+        Logger.info(f"[{self.get_scrapper_name()}]: STARTED{mode}")
+        # no modo de atualização os artigos já gravados são verificados novamente, em vez de ignorados
+        known_urls = self._load_known_urls() if self._INCREMENTAL and not self._RECRAWL else frozenset()
+        stats = self._run(lambda page_queue: self._discover_links(search_terms, page_queue, known_urls))
+        Logger.info(f"[{self.get_scrapper_name()}]: FINISHED")
+        return stats
 
+    def replay_dead_letters(self):
+        page_urls = self.get_dead_letter().pop_all()
+        Logger.info(f"[{self.get_scrapper_name()}]: REPLAYING {len(page_urls)} FAILED ARTICLES")
+        stats = self._run(lambda page_queue: self._enqueue_links(page_urls, page_queue))
         Logger.info(f"[{self.get_scrapper_name()}]: FINISHED")
-        browser.get(r'https://www.google.com.br')
-        browser.close()
-        browser.quit()
+        return stats
 
     def get_scrapper_name(self):
         return self._NAME
@@ -70,10 +603,65 @@ class WebScraper:
     def get_load_waiting_time(self):
         return self._LOAD_WAITING_TIME
 
-    def _get_article_metadata(self, soup):
+    def get_workers(self):
+        return self._WORKERS
+
+    def is_incremental(self):
+        return self._INCREMENTAL and not self._RECRAWL
+
+    def is_recrawl(self):
+        return self._RECRAWL
+
+    def is_bulk_load(self):
+        # a carga em massa apenas acrescenta artigos, no modo de atualização os artigos são gravados um a um
+        return self._SAVE_DB and self._BULK_LOAD and not self._RECRAWL
+
+    def get_fetch_engine(self):
+        return self._FETCH_ENGINE
+
+    def get_parse_processes(self):
+        return self._PARSE_PROCESSES
+
+    def _get_article_metadata(self, extraction):
         Logger.info(f"\tGETTING ARTICLE METADATA")
-        return {meta['property']: str(meta['content']).upper().strip() for meta in
-                soup.findAll('meta', {'property': True})}
+        article_metadata = {meta['property']: str(meta['content']).upper().strip() for meta in extraction.all('meta')}
+        if article_metadata.get(ArticleParser.ARTICLE_URL_PROPERTY):
+            article_metadata[ArticleParser.ARTICLE_URL_PROPERTY] = self._normalize_article_url(
+                article_metadata[ArticleParser.ARTICLE_URL_PROPERTY]
+            )
+        return article_metadata
+
+    def _get_fast_metadata(self, extraction, article_metadata: dict):
+        """
+        Retorna o autor e as datas de publicação e modificação do artigo lidos do bloco JSON-LD do artigo ou, na falta
+        deles, das tags OpenGraph (`article:*`), sem percorrer o DOM, e a origem de cada valor encontrado.
+        """
+        node = LinkedDataReader.read_article(extraction.all('ld_json'))
+        values = {}
+        sources = {}
+
+        author = LinkedDataReader.get_author(node)
+        source = WebScraper.SOURCE_LINKED_DATA
+        if not author:
+            # no OpenGraph o autor costuma ser a url do perfil, que não serve como nome
+            author = article_metadata.get(ArticleParser.ARTICLE_AUTHOR_PROPERTY)
+            author = None if not author or author.startswith('HTTP') else author
+            source = WebScraper.SOURCE_OPEN_GRAPH
+        if author:
+            values[ArticleParser.ARTICLE_AUTHOR_PROPERTY] = author.upper().strip()
+            sources[ArticleParser.ARTICLE_AUTHOR_PROPERTY] = source
+
+        for property_name, key in ((ArticleParser.ARTICLE_PUBLISHED_PROPERTY, 'datePublished'),
+                                   (ArticleParser.ARTICLE_MODIFIED_PROPERTY, 'dateModified')):
+            value = LinkedDataReader.parse_datetime(node.get(key), self.RULES.document.datetime_utc)
+            source = WebScraper.SOURCE_LINKED_DATA
+            if not value:
+                value = LinkedDataReader.parse_datetime(article_metadata.get(property_name), self.RULES.document.datetime_utc)
+                source = WebScraper.SOURCE_OPEN_GRAPH
+            if value:
+                values[property_name] = value
+                sources[property_name] = source
+        return values, sources
 
     def _get_article_topics(self, soup, article_url: str):
         Logger.info(f"\tGETTING ARTICLE TOPICS")
@@ -119,11 +707,11 @@ class WebScraper:
                 )
         return categories
 
-    def _get_document_medias(self, soup, article_url: str):
+    def _get_document_medias(self, extraction, article_url: str):
         Logger.info(f"\tGETTING ARTICLE MEDIAS")
         medias = []
-        for media_tag in ['video', 'audio', 'img']:
-            for order, tag in enumerate(soup.findChildren(media_tag, {'src': True}), start=1):
+        for media_tag in WebScraper.MEDIA_TAGS:
+            for order, tag in enumerate(extraction.all(media_tag), start=1):
                 medias.append(
                     ArticleMedia(
                         tag['src'],
@@ -132,8 +720,9 @@ class WebScraper:
                         media_tag.upper(),
                     )
                 )
-        for order, video_embed_div in enumerate(soup.findChildren('div', {'class': 'video-embed-wrapper'}), start=1):
-            video_iframe = video_embed_div.findChild('iframe', {'src': True})
+        embed_medias = {id(video_embed_div): tags for video_embed_div, tags in extraction.grouped('embed_media')}
+        for order, video_embed_div in enumerate(extraction.all('embed'), start=1):
+            video_iframe = embed_medias[id(video_embed_div)][0]
             medias.append(
                 ArticleMedia(
                     video_iframe['src'],
@@ -146,13 +735,108 @@ class WebScraper:
 
     def _tag_visible(self, element):
         if element.parent.name in [
-            'style', 'script', 'head', 'title', 'meta', '[document]'
+            'style', 'script', 'noscript', 'head', 'title', 'meta', '[document]'
         ]:
             return False
         if isinstance(element, Comment):
             return False
         return True
 
+    def _get_visible_text(self, element):
+        # percorre os textos visíveis uma única vez, normalizando espaços e caixa à medida que escreve no buffer
+        buffer = io.StringIO()
+        pending_space = False
+        for node in element.descendants:
+            if not isinstance(node, NavigableString) or not self._tag_visible(node):
+                continue
+            words = node.split()
+            if not words:
+                pending_space = pending_space or bool(node)
+                continue
+            if buffer.tell() and (pending_space or node[0].isspace()):
+                buffer.write(' ')
+            buffer.write(' '.join(words).upper())
+            pending_space = node[-1].isspace()
+        return buffer.getvalue()
+
+    def get_page_archive(self):
+        with self._stats_lock:
+            if not self._page_archive:
+                self._page_archive = PageArchive(os.path.join(os.getcwd(), self.HTML_DIR_NAME), self.COMPRESS_HTML)
+            return self._page_archive
+
+    def get_fetch_cache(self):
+        with self._stats_lock:
+            if not self._fetch_cache:
+                self._fetch_cache = FetchCache(
+                    os.path.join(os.getcwd(), self.FETCH_CACHE_DIR_NAME, f'{self.get_scrapper_name()}.jsonl')
+                )
+            return self._fetch_cache
+
+    def _close_fetch_cache(self):
+        with self._stats_lock:
+            fetch_cache = self._fetch_cache
+            self._fetch_cache = None
+        if fetch_cache:
+            fetch_cache.close()
+
+    def get_bulk_loader(self):
+        with self._stats_lock:
+            if not self._bulk_loader:
+                self._bulk_loader = BulkLoader(
+                    on_saved=self._record_saved, on_skipped=self._record_already_saved, on_failure=self._record_save_failure
+                )
+            return self._bulk_loader
+
+    def get_write_queue(self):
+        with self._stats_lock:
+            if not self._write_queue:
+                self._write_queue = WriteBehindQueue(
+                    self.get_scrapper_name(), self.DATABASE_WRITERS, self.DATABASE_QUEUE_SIZE, self.DATABASE_BATCH_SIZE,
+                    self.DATABASE_FLUSH_INTERVAL, replace=self._RECRAWL, on_saved=self._record_saved,
+                    on_failure=self._record_save_failure
+                )
+            return self._write_queue
+
+    def _close_write_queue(self):
+        with self._stats_lock:
+            write_queue = self._write_queue
+            self._write_queue = None
+        if write_queue:
+            write_queue.close()
+
+    def _close_bulk_loader(self):
+        with self._stats_lock:
+            bulk_loader = self._bulk_loader
+            self._bulk_loader = None
+        if bulk_loader:
+            bulk_loader.close()
+
+    def _close_page_archive(self):
+        with self._stats_lock:
+            page_archive = self._page_archive
+            self._page_archive = None
+        if page_archive:
+            page_archive.close()
+
+    @staticmethod
+    def _get_file_name(document_url: str):
+        path = urllib.parse.urlparse(document_url).path
+        return re.sub(r'[^0-9A-Za-z]+', '_', path).strip('_').upper()[:150]
+
+    def _save_html(self, document_url: str, page_source: str, file_name: str = None):
+        Logger.info(f"\tSAVING ARTICLE HTML")
+        self.get_page_archive().add(file_name if file_name else WebScraper._get_file_name(document_url), page_source, document_url)
+
+    def _save_txt(self, document_url: str, content: str, file_name: str = None):
+        Logger.info(f"\tSAVING ARTICLE CONTENT TO TXT FILE")
+        WebScraper._save_to_file(
+            self,
+            os.path.join(os.getcwd(), self.TXT_DIR_NAME),
+            f'{file_name if file_name else WebScraper._get_file_name(document_url)}.txt',
+            content
+        )
+
     def _save_to_file(self, file_path: str, file_name: str, content_str: str):
         os.makedirs(file_path, exist_ok=True)
         with open(os.path.join(file_path, file_name), 'w', encoding='utf-8') as arq:
@@ -161,123 +845,76 @@ class WebScraper:
 
 class AcriticaScraper(WebScraper):
 
-    DIV_ARTICLE_BLOCK_CLASS = 'eOExTH'
-    DIV_ARTICLE_SECTION_CLASS = 'eaVrfa'
-    SPAN_HAT_CLASS = 'fCwtAq'
-    DIV_META_CLASS = 'Block__Component-sc-1uj1scg-0 fTFJxo article_style acritica'
+    RULES = SiteRules.load('acritica.json')
+    FETCH_ENGINE = WebScraper.ENGINE_HTTP
+    LISTING_REQUIRED_SELECTORS = RULES.listing.required_selectors
+    DOCUMENT_REQUIRED_SELECTORS = RULES.document.required_selectors
 
-    def __init__(self, load_wait: int, from_timestamp: float, to_timestamp: float, save_html: bool, save_txt: bool, save_db: bool):
-        WebScraper.__init__(self, load_wait, from_timestamp, to_timestamp, save_html, save_txt, save_db)
+    def __init__(self, load_wait: int, from_timestamp: float, to_timestamp: float, save_html: bool, save_txt: bool, save_db: bool, workers: int = 1, fetch_engine: str = None, parse_processes: int = 0, incremental: bool = False, recrawl: bool = False, bulk_load: bool = False):
+        WebScraper.__init__(self, load_wait, from_timestamp, to_timestamp, save_html, save_txt, save_db, workers, fetch_engine, parse_processes, incremental, recrawl, bulk_load)
         self._BASE_URL = r'https://www.acritica.com'
         self._NAME = 'AcriticaScraper'
 
-    def _get_document_links(self, browser, search_term: str):
-        Logger.info(f'GETTING ARTICLES FOR SEARCH TERM="{search_term}" ')
-        document_links = set()
-        page_number = 1
-        browser.get(f'{self.get_base_url()}/page/{page_number}/{search_term}')
-        sleep(self.get_load_waiting_time())
-        soup = BeautifulSoup(browser.page_source, 'html.parser')
-        div_article_list = soup.find('div', {'class': AcriticaScraper.DIV_ARTICLE_BLOCK_CLASS})
-        links = div_article_list.findChildren('a', {'class': AcriticaScraper.DIV_ARTICLE_SECTION_CLASS, 'href': True})
-
-        while links:
-            for link in links:
-                article_url = link['href']
-                document_links.add(article_url)
-                Logger.info(f'\tARTICLE FOUND: {article_url}')
-            page_number += 1
-            browser.get(f'{self.get_base_url()}/page/{page_number}/{search_term}')
-            sleep(self.get_load_waiting_time())
-            soup = BeautifulSoup(browser.page_source, 'html.parser')
-            div_article_list = soup.find('div', {'class': AcriticaScraper.DIV_ARTICLE_BLOCK_CLASS})
-            links = div_article_list.findChildren('a', {'class': AcriticaScraper.DIV_ARTICLE_SECTION_CLASS, 'href': True})
+    def _get_listing_url(self, search_term: str, page: int):
+        return f'{self.get_base_url()}/page/{page}/{search_term}'
 
-        return document_links
+    def _parse_document_links(self, extraction):
+        # `list` é obrigatório nas regras: sem ele a página não corresponde ao layout esperado (RuleMismatchError)
+        links = extraction.all('links')
+        return [link['href'] for link in links], bool(links)
 
-    def _get_article_metadata(self, soup):
+    def _get_listing_dates(self, extraction):
+        dates = {}
+        for link, times in extraction.grouped('dates'):
+            timestamp = self._get_listing_timestamp(times[0])
+            if timestamp is not None:
+                dates[link['href']] = timestamp
+        return dates
+
+    def _get_article_metadata(self, extraction):
         Logger.info(f"\tGETTING ARTICLE METADATA")
-        article_metadata = WebScraper._get_article_metadata(self, soup)
-        hat_span = soup.find('span', {'class': AcriticaScraper.SPAN_HAT_CLASS})
+        article_metadata = WebScraper._get_article_metadata(self, extraction)
+        hat_span = extraction.first('hat')
         article_metadata[ArticleParser.ARTICLE_HAT_PROPERTY] = hat_span.text.upper().strip() if hat_span else None
 
-        div_content = soup.find('div', class_=AcriticaScraper.DIV_META_CLASS)
-        article_metadata['content'] = div_content.text.upper()
+        div_content = extraction.first('text')
+        article_metadata['content'] = self._get_visible_text(div_content)
 
         return article_metadata
 
-    def _get_document(self, browser, page_url: str):
-        document_url = f'{self.get_base_url()}{page_url}'
-        Logger.info(f"DOWNLOADING ARTICLE: {document_url}")
-        browser.get(document_url)
-        sleep(self.get_load_waiting_time())
-        soup = BeautifulSoup(browser.page_source, 'html.parser')
+    def _build_bundle(self, document_url: str, page_source: str):
+        extraction, missing_fields = self._extract_document(page_source, document_url)
 
-        article_metadata = self._get_article_metadata(soup)
+        article_metadata = self._get_article_metadata(extraction)
         article = ArticleParser.parse_article(article_metadata)
 
-        if not self._FROM_TIMESTAMP < datetime.strptime(article.published, '%Y-%m-%d %H:%M:%S').timestamp() < self._TO_TIMESTAMP:
+        if not self._FROM_TIMESTAMP < datetime.strptime(article.published, self.RULES.document.date_formats['published']).timestamp() < self._TO_TIMESTAMP:
             Logger.warn(f"\tARTICLE DATETIME IS OUT OF SEARCH INTERVAL")
-            return
+            return None
 
-        article_filename = ''.join([x.upper() for x in article.title if x.isalnum() or x.isspace()])
+        bundle = ArticleBundle(article, article_metadata['content'], metadata_sources=article_metadata.get('sources'),
+                               missing_fields=missing_fields)
+        if self._SAVE_DB:
+            bundle.topics = WebScraper._get_article_topics(self, extraction.all('topics'), article.article_url)
+            bundle.hyperlinks = WebScraper._get_article_hyperlinks(self, extraction.all('hyperlinks'), article.article_url)
+            bundle.categories = self._get_article_categories(extraction, article.article_url)
+            bundle.medias = WebScraper._get_document_medias(self, extraction, article.article_url)
+        return bundle
+
+    def _store_bundle(self, document_url: str, page_source: str, bundle: ArticleBundle):
+        article_filename = ''.join([x.upper() for x in bundle.article.title if x.isalnum() or x.isspace()])
         article_filename = article_filename.replace(' ', '_')
         if self._SAVE_HTML:
-            Logger.info(f"\tSAVING ARTICLE HTML")
-            AcriticaScraper._save_to_file(
-                self,
-                os.path.join(os.getcwd(), 'html'),
-                f'{article_filename}.html',
-                soup.prettify()
-            )
+            self._save_html(document_url, page_source, article_filename)
 
         if self._SAVE_TXT:
-            Logger.info(f"\tSAVING ARTICLE CONTENT TO TXT FILE")
-            AcriticaScraper._save_to_file(
-                self,
-                os.path.join(os.getcwd(), 'txt'),
-                f'{article_filename}.txt',
-                re.sub(r"\s+", " ", ''.join(article_metadata['content']).upper())
-            )
-
-        if self._SAVE_DB:
-            Logger.info(f"\tSAVING ARTICLE INTO DATABASE")
-            ArticleController.insert_one(article)
-            article_row = ArticleController.fetch_by_text_field(article.article_url, 'article_url')
-            article = Article.from_tuple(article_row[0])
-
-            div_content = soup.find('div', {'class': 'gzQsJ'})
-            topics = WebScraper._get_article_topics(
-                self,
-                div_content.findChildren('a', {'class': 'knlcwJ', 'href': True}),
-                article.article_id
-            )
-            Logger.info(f"\t\ttSAVING ARTICLE TOPICS INTO DATABASE")
-            for topic in topics:
-                ArticleTopicController.insert_one(topic)
+            self._save_txt(document_url, bundle.content, article_filename)
 
-            hyperlinks = WebScraper._get_article_hyperlinks(
-                self,
-                div_content.findChildren('a', {'href': True}),
-                article.article_id
-            )
-            Logger.info(f"\t\tSAVING ARTICLE HYPERLINKS INTO DATABASE")
-            for hyperlink in hyperlinks:
-                ArticleHyperlinkController.insert_one(hyperlink)
+        WebScraper._store_bundle(self, document_url, page_source, bundle)
 
-            categories = self._get_article_categories(soup, article.article_id)
-            Logger.info(f"\t\tSAVING ARTICLE CATEGORIES INTO DATABASE")
-            for category in categories:
-                ArticleCategoryController.insert_one(category)
-
-            medias = WebScraper._get_document_medias(self, div_content, article.article_id)
-            Logger.info(f"\t\tSAVING ARTICLE MEDIAS INTO DATABASE")
-            for media in medias:
-                ArticleMediaController.insert_one(media)
-
-    def _get_article_categories(self, soup, article_url: str):
+    def _get_article_categories(self, extraction, article_url: str):
         Logger.info(f"\tGETTING ARTICLE CATEGORIES")
-        meta_url = soup.find('meta', {'property': 'og:url', 'content': True})
+        meta_url = extraction.first('url')
         document_url = meta_url['content']
         document_url = document_url.replace(self.get_base_url(), '')
         categories = []
@@ -296,239 +933,196 @@ class AcriticaScraper(WebScraper):
 
 class PortalAmazoniaScraper(WebScraper):
 
-    def __init__(self, load_wait: int, from_timestamp: float, to_timestamp: float, save_html: bool, save_txt: bool, save_db: bool):
-        WebScraper.__init__(self, load_wait, from_timestamp, to_timestamp, save_html, save_txt, save_db)
+    RULES = SiteRules.load('portalamazonia.json')
+    FETCH_ENGINE = WebScraper.ENGINE_HTTP
+    FIRST_LISTING_PAGE = 0
+    LISTING_REQUIRED_SELECTORS = RULES.listing.required_selectors
+    DOCUMENT_REQUIRED_SELECTORS = RULES.document.required_selectors
+
+    def __init__(self, load_wait: int, from_timestamp: float, to_timestamp: float, save_html: bool, save_txt: bool, save_db: bool, workers: int = 1, fetch_engine: str = None, parse_processes: int = 0, incremental: bool = False, recrawl: bool = False, bulk_load: bool = False):
+        WebScraper.__init__(self, load_wait, from_timestamp, to_timestamp, save_html, save_txt, save_db, workers, fetch_engine, parse_processes, incremental, recrawl, bulk_load)
         self._BASE_URL = r'https://portalamazonia.com'
         self._NAME = 'PortalAmazoniaScraper'
 
-    def _get_article_metadata(self, soup):
-        article_metadata = WebScraper._get_article_metadata(self, soup)
+    def _get_article_metadata(self, extraction):
+        article_metadata = WebScraper._get_article_metadata(self, extraction)
+
+        div_id = extraction.first('text')
+
+        fast_metadata, sources = self._get_fast_metadata(extraction, article_metadata)
+        for property_name in (ArticleParser.ARTICLE_PUBLISHED_PROPERTY, ArticleParser.ARTICLE_MODIFIED_PROPERTY):
+            if property_name in fast_metadata:
+                fast_metadata[property_name] = fast_metadata[property_name].strftime(self.RULES.document.date_formats['published'])
+        article_metadata.update(fast_metadata)
 
-        div_id = soup.find('div', {'data-id': True})
+        # o DOM só é consultado para os metadados que não foram encontrados no JSON-LD nem no OpenGraph
+        if ArticleParser.ARTICLE_AUTHOR_PROPERTY not in fast_metadata:
+            span_author = extraction.first('author')
+            article_metadata[
+                ArticleParser.ARTICLE_AUTHOR_PROPERTY] = span_author.text.upper().strip() if span_author else None
+            sources[ArticleParser.ARTICLE_AUTHOR_PROPERTY] = WebScraper.SOURCE_DOM
 
-        span_author = div_id.findChild('span', {'class': 'eb-meta-author', 'itemprop': 'author'})
-        article_metadata[
-            ArticleParser.ARTICLE_AUTHOR_PROPERTY] = span_author.text.upper().strip() if span_author else None
+        if ArticleParser.ARTICLE_PUBLISHED_PROPERTY not in fast_metadata:
+            article_metadata[ArticleParser.ARTICLE_PUBLISHED_PROPERTY] = extraction.first('published').text.strip()
+            sources[ArticleParser.ARTICLE_PUBLISHED_PROPERTY] = WebScraper.SOURCE_DOM
+        if ArticleParser.ARTICLE_MODIFIED_PROPERTY not in fast_metadata:
+            article_metadata[ArticleParser.ARTICLE_MODIFIED_PROPERTY] = extraction.first('modified').text.strip()
+            sources[ArticleParser.ARTICLE_MODIFIED_PROPERTY] = WebScraper.SOURCE_DOM
 
-        article_metadata[ArticleParser.ARTICLE_PUBLISHED_PROPERTY] = soup.find('time', {'itemprop': 'datePublished'}).text.strip()
-        article_metadata[ArticleParser.ARTICLE_MODIFIED_PROPERTY] = soup.find('time', {'itemprop': 'dateModified'}).text.strip()
+        article_metadata['sources'] = sources
 
-        article_metadata['content'] = div_id.text.upper()
+        article_metadata['content'] = self._get_visible_text(div_id)
         return article_metadata
 
-    def _get_document_links(self, search_term: str, browser):
-        article_links = set()
-        browser.get(f'{self.get_base_url()}/busca?q={search_term}')
-        sleep(self.get_load_waiting_time())
-        soup = BeautifulSoup(browser.page_source, 'html.parser')
-        for div_item in soup.find_all('div', {'class': 'result-item'}):
-            article_links.add(div_item.findChild('a', {'href': True})['href'])
+    def _get_listing_url(self, search_term: str, page: int):
+        if page == 0:
+            return f'{self.get_base_url()}/busca?q={search_term}'
+        return f'{self.get_base_url()}/busca?q={search_term}&start={page * 20}'
 
-        if soup.find('ul', {'class': 'pagination'}):
-            page = 1
-            while True:
-                browser.get(f'{self.get_base_url()}/busca?q={search_term}&start={page * 20}')
-                sleep(self.get_load_waiting_time())
-                soup = BeautifulSoup(browser.page_source, 'html.parser')
-                items = soup.find_all('div', {'class': 'result-item'})
-                if not items:
-                    break
-                for item in items:
-                    article_links.add(item.findChild('a', {'href': True})['href'])
-                page += 1
-        return article_links
-
-    def _get_document(self, browser, page_url: str):
-        document_url = f'{self.get_base_url()}{page_url}'
-        browser.get(page_url)
-        sleep(self.get_load_waiting_time())
-        soup = BeautifulSoup(browser.page_source, 'html.parser')
-
-        article_metadata = self._get_article_metadata(soup)
+    def _parse_document_links(self, extraction):
+        links = [item_links[0]['href'] for _, item_links in extraction.grouped('item_links')]
+        return links, extraction.has('pagination')
+
+    def _get_listing_dates(self, extraction):
+        item_links = {id(item): links[0]['href'] for item, links in extraction.grouped('item_links')}
+        dates = {}
+        for item, times in extraction.grouped('dates'):
+            timestamp = self._get_listing_timestamp(times[0])
+            if id(item) in item_links and timestamp is not None:
+                dates[item_links[id(item)]] = timestamp
+        return dates
+
+    def _build_bundle(self, document_url: str, page_source: str):
+        extraction, missing_fields = self._extract_document(page_source, document_url)
+
+        article_metadata = self._get_article_metadata(extraction)
         article = ArticleParser.parse_article(article_metadata)
 
-        if not self._FROM_TIMESTAMP < datetime.strptime(article.published, '%Y-%m-%d %H:%M').timestamp() < self._TO_TIMESTAMP:
-            return
+        if not self._FROM_TIMESTAMP < datetime.strptime(article.published, self.RULES.document.date_formats['published']).timestamp() < self._TO_TIMESTAMP:
+            return None
 
+        bundle = ArticleBundle(article, article_metadata['content'], metadata_sources=article_metadata.get('sources'),
+                               missing_fields=missing_fields)
+        if self._SAVE_DB:
+            bundle.topics = WebScraper._get_article_topics(self, extraction.all('topics'), article.article_url)
+            bundle.hyperlinks = WebScraper._get_article_hyperlinks(self, extraction.all('hyperlinks'), article.article_url)
+            bundle.categories = WebScraper._get_article_categories(self, extraction.all('categories'), article.article_url)
+            bundle.medias = WebScraper._get_document_medias(self, extraction, article.article_url)
+        return bundle
+
+    def _store_bundle(self, document_url: str, page_source: str, bundle: ArticleBundle):
         if self._SAVE_HTML:
             PortalAmazoniaScraper._save_html(
                 self,
-                page_url,
-                soup.prettify()
+                document_url,
+                page_source
             )
 
         if self._SAVE_TXT:
             PortalAmazoniaScraper._save_txt(
                 self,
                 document_url,
-                re.sub(r"\s+", " ", ''.join(article_metadata['content']).upper())
+                bundle.content
             )
 
-        if self._SAVE_DB:
-            ArticleController.insert_one(article)
-            article_row = ArticleController.fetch_by_text_field(article.article_url, 'article_url')
-            article = Article.from_tuple(article_row[0])
+        WebScraper._store_bundle(self, document_url, page_source, bundle)
 
-            div_content = soup.find('div', {'id': True, 'class': 'eb-entry', 'data-id': True, 'data-uid': True})
 
-            cell_tags = div_content.find('div', {'class': 'cell-tags'})
-            topics = WebScraper._get_article_topics(
-                self,
-                cell_tags.findChildren('a', {'href': True}) if cell_tags else None,
-                article.article_id
-            )
-            for topic in topics:
-                ArticleTopicController.insert_one(topic)
+class G1Scraper(WebScraper):
 
-            hyperlinks = WebScraper._get_article_hyperlinks(
-                self,
-                div_content.findChildren('a', {'href': True}),
-                article.article_id
-            )
-            for hyperlink in hyperlinks:
-                ArticleHyperlinkController.insert_one(hyperlink)
+    # as datas do G1 no DOM estão em UTC (`datetime_utc` em rules/g1.json)
+    RULES = SiteRules.load('g1.json')
+    FETCH_ENGINE = WebScraper.ENGINE_HTTP
+    LISTING_REQUIRED_SELECTORS = RULES.listing.required_selectors
+    DOCUMENT_REQUIRED_SELECTORS = RULES.document.required_selectors
 
-            div_categories = soup.findChild('div', {'class': 'eb-meta-category'})
-            categories = WebScraper._get_article_categories(
-                self,
-                div_categories.findChildren('a', {'href': True}),
-                article.article_id
-            )
-            for category in categories:
-                ArticleCategoryController.insert_one(category)
+    def __init__(self, load_wait: int, from_timestamp: float, to_timestamp: float, save_html: bool, save_txt: bool, save_db: bool, workers: int = 1, fetch_engine: str = None, parse_processes: int = 0, incremental: bool = False, recrawl: bool = False, bulk_load: bool = False):
+        WebScraper.__init__(self, load_wait, from_timestamp, to_timestamp, save_html, save_txt, save_db, workers, fetch_engine, parse_processes, incremental, recrawl, bulk_load)
+        self._BASE_URL = r'https://g1.globo.com'
+        self._NAME = 'G1Scraper'
 
-            medias = WebScraper._get_document_medias(self, div_content, article.article_id)
-            for media in medias:
-                ArticleMediaController.insert_one(media)
+    def _get_article_metadata(self, extraction):
+        article_metadata = WebScraper._get_article_metadata(self, extraction)
 
+        fast_metadata, sources = self._get_fast_metadata(extraction, article_metadata)
+        article_metadata.update(fast_metadata)
 
-class G1Scraper(WebScraper):
+        # o DOM só é consultado para os metadados que não foram encontrados no JSON-LD nem no OpenGraph
+        if ArticleParser.ARTICLE_AUTHOR_PROPERTY not in fast_metadata:
+            span_author = extraction.first('author')
+            article_metadata[ArticleParser.ARTICLE_AUTHOR_PROPERTY] = span_author.text.upper().strip()[4:] if span_author else None
+            sources[ArticleParser.ARTICLE_AUTHOR_PROPERTY] = WebScraper.SOURCE_DOM
 
-    def __init__(self, load_wait: int, from_timestamp: float, to_timestamp: float, save_html: bool, save_txt: bool, save_db: bool):
-        WebScraper.__init__(self, load_wait, from_timestamp, to_timestamp, save_html, save_txt, save_db)
-        self._BASE_URL = r'https://g1.globo.com'
-        self._NAME = 'G1Scraper'
+        dates = (ArticleParser.ARTICLE_PUBLISHED_PROPERTY, ArticleParser.ARTICLE_MODIFIED_PROPERTY)
+        if not all(property_name in fast_metadata for property_name in dates):
+            published_str = extraction.first('published')
+            modified_str = extraction.first('modified')
+            dt_fmt = self.RULES.document.date_formats['time']
+            if not published_str:
+                published_str = {'datetime': extraction.first('published_abbr').text}
+                modified_str = {'datetime': extraction.first('updated_abbr').text}
+                dt_fmt = self.RULES.document.date_formats['abbr']
+
+            for property_name, value in zip(dates, (published_str, modified_str)):
+                if property_name not in fast_metadata:
+                    article_metadata[property_name] = datetime.strptime(value['datetime'], dt_fmt)
+                    sources[property_name] = WebScraper.SOURCE_DOM
 
-    def _get_article_metadata(self, soup):
-        article_metadata = WebScraper._get_article_metadata(self, soup)
-        article_metadata['og:url'] = article_metadata['og:url'].lower()
-
-        body = soup.find('body', {'data-content-id': True})
-        if not body:
-            body = soup.find('div', {'id': 'glb-materia'})
-        elif not body:
-            print('')
-
-        span_author = body.find('p', {'class': 'content-publication-data__from', 'title': True})
-        if not span_author:
-            span_author = body.find('p', class_='vcard author')
-        elif not span_author:
-            print('')
-        article_metadata[ArticleParser.ARTICLE_AUTHOR_PROPERTY] = span_author.text.upper().strip()[4:] if span_author else None
-
-        published_str = body.find('time', {'itemprop': 'datePublished'})
-        modified_str = body.find('time', {'itemprop': 'dateModified'})
-        dt_fmt = '%Y-%m-%dT%H:%M:%S.%fZ'
-        if not published_str:
-            published_str = {'datetime': body.find('abbr', class_='published').text}
-            modified_str = {'datetime': body.find('abbr', class_='updated').text}
-            dt_fmt = '%d/%m/%Y %Hh%M'
-        elif not published_str:
-            print('')
-
-        article_metadata[ArticleParser.ARTICLE_PUBLISHED_PROPERTY] = datetime.strptime(published_str['datetime'], dt_fmt)
-        article_metadata[ArticleParser.ARTICLE_MODIFIED_PROPERTY] = datetime.strptime(modified_str['datetime'], dt_fmt)
-
-        div_content = body.find('article', {'itemprop': 'articleBody'})
-        if not div_content:
-            div_content = soup.find('div', {'id': 'glb-materia'})
-
-        article_metadata['content'] = div_content.text.upper()
+        article_metadata['sources'] = sources
+
+        div_content = extraction.first('content')
+
+        article_metadata['content'] = self._get_visible_text(div_content)
         return article_metadata
 
-    def _get_document_links(self, browser, search_term: str):
-        article_links = set()
+    def _get_listing_url(self, search_term: str, page: int):
         from_str = datetime.fromtimestamp(self._FROM_TIMESTAMP).strftime('%Y-%m-%dT00:00:00-0400').replace(':', '%3A')
         to_str = datetime.fromtimestamp(self._TO_TIMESTAMP).strftime('%Y-%m-%dT23:59:59-0400').replace(':', '%3A')
+        return f'{self.get_base_url()}/busca/?q={search_term}&page={page}&order=recent&from={from_str}&to={to_str}&species=notícias'
 
-        page = 1
-        browser.get(f'{self.get_base_url()}/busca/?q={search_term}&page={page}&order=recent&from={from_str}&to={to_str}&species=notícias')
-        sleep(self.get_load_waiting_time())
-        soup = BeautifulSoup(browser.page_source, 'html.parser')
-
-        div_pagination = True
-        while div_pagination:
-            for div_item in soup.find_all('li', {'data-position': True}, class_='widget widget--card widget--info'):
-                a_link = div_item.findChild('div', class_='widget--info__text-container').findChild('a', {'href': True})
-                link = a_link['href']
-                start_index = link.index('&u=https') + 3
-                end_index = link.index('&syn')
-                article_links.add(urllib.parse.unquote(link[start_index: end_index]))
-            page += 1
-            browser.get(f'{self.get_base_url()}/busca/?q={search_term}&page={page}&order=recent&from={from_str}&to={to_str}&species=notícias')
-            sleep(self.get_load_waiting_time())
-            soup = BeautifulSoup(browser.page_source, 'html.parser')
-            div_pagination = soup.find('div', class_='pagination widget')
-
-        return article_links
+    def _parse_document_links(self, extraction):
+        article_links = []
+        for _, item_links in extraction.grouped('item_links'):
+            link = item_links[0]['href']
+            start_index = link.index('&u=https') + 3
+            end_index = link.index('&syn')
+            article_links.append(urllib.parse.unquote(link[start_index: end_index]))
+        return article_links, extraction.has('pagination')
 
-    def _get_document(self, browser, page_url: str):
-        browser.get(page_url)
-        sleep(self.get_load_waiting_time())
-        soup = BeautifulSoup(browser.page_source, 'html.parser')
+    def _build_bundle(self, document_url: str, page_source: str):
+        extraction, missing_fields = self._extract_document(page_source, document_url)
 
-        article_metadata = self._get_article_metadata(soup)
+        article_metadata = self._get_article_metadata(extraction)
         article = ArticleParser.parse_article(article_metadata)
 
+        bundle = ArticleBundle(article, article_metadata['content'], metadata_sources=article_metadata.get('sources'),
+                               missing_fields=missing_fields)
+        if self._SAVE_DB:
+            bundle.topics = WebScraper._get_article_topics(self, extraction.all('topics'), article.article_url)
+            bundle.hyperlinks = WebScraper._get_article_hyperlinks(self, extraction.all('hyperlinks'), article.article_url)
+            bundle.categories = WebScraper._get_article_categories(self, extraction.all('categories'), article.article_url)
+            bundle.medias = G1Scraper._get_document_medias(self, extraction, article.article_url)
+        return bundle
+
+    def _store_bundle(self, document_url: str, page_source: str, bundle: ArticleBundle):
         if self._SAVE_HTML:
             G1Scraper._save_html(
                 self,
-                page_url,
-                soup.prettify()
+                document_url,
+                page_source
             )
         if self._SAVE_TXT:
             G1Scraper._save_txt(
                 self,
-                page_url,
-                article_metadata['content'].upper()
-            )
-        if self._SAVE_DB:
-            ArticleController.insert_one(article)
-            article_row = ArticleController.fetch_by_text_field(article.article_url, 'article_url')
-            article = Article.from_tuple(article_row[0])
-
-            div_content = soup.find('article', {'itemprop': 'articleBody'})
-            if not div_content:
-                div_content = soup.find('div', {'id': 'glb-materia'})
-
-            cell_tags = div_content.find('ul', {'class': 'entities__list-item'})
-            if not cell_tags:
-                cell_tags = div_content.findChild('div', {'class': 'lista-de-entidades'})
-            topics = WebScraper._get_article_topics(
-                self,
-                cell_tags.findChildren('a', {'href': True}) if cell_tags else None,
-                article.article_id
+                document_url,
+                bundle.content
             )
-            for topic in topics:
-                ArticleTopicController.insert_one(topic)
-
-            hyperlinks = WebScraper._get_article_hyperlinks(self, div_content.findChildren('a', {'href': True}), article.article_id)
-            for hyperlink in hyperlinks:
-                ArticleHyperlinkController.insert_one(hyperlink)
-
-            div_categories = soup.findAll('a', {'href': True}, class_='header-editoria--link ellip-line')
-            categories = WebScraper._get_article_categories(self, div_categories, article.article_id)
-            for category in categories:
-                ArticleCategoryController.insert_one(category)
+        WebScraper._store_bundle(self, document_url, page_source, bundle)
 
-            medias = G1Scraper._get_document_medias(self, div_content, article.article_id)
-            for media in medias:
-                ArticleMediaController.insert_one(media)
-
-    def _get_document_medias(self, soup, article_url: str):
+    def _get_document_medias(self, extraction, article_url: str):
         medias = []
-        for media_tag in ['video', 'audio', 'img']:
-            for order, tag in enumerate(soup.findChildren(media_tag, {'src': True}), start=1):
+        for media_tag in WebScraper.MEDIA_TAGS:
+            for order, tag in enumerate(extraction.all(media_tag), start=1):
                 medias.append(
                     ArticleMedia(
                         tag['src'],
@@ -537,16 +1131,15 @@ class G1Scraper(WebScraper):
                         media_tag.upper()
                     )
                 )
-        for order, video_embed_div in enumerate(soup.findChildren('div', {'itemtype': 'http://schema.org/VideoObject', 'itemprop':'video'}), start=1):
-            metas = video_embed_div.findChildren('meta', {'itemprop': True})
-            for meta in metas:
-                if str(meta['itemprop']).lower() == 'contenturl':
-                    medias.append(
-                        ArticleMedia(
-                            meta['content'],
-                            article_url,
-                            order,
-                            'VIDEO',
-                        )
+        embed_medias = {id(video_embed_div): metas for video_embed_div, metas in extraction.grouped('embed_media')}
+        for order, video_embed_div in enumerate(extraction.all('embed'), start=1):
+            for meta in embed_medias.get(id(video_embed_div), []):
+                medias.append(
+                    ArticleMedia(
+                        meta['content'],
+                        article_url,
+                        order,
+                        'VIDEO',
                     )
+                )
         return medias
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from logs import Logger
+
+ARTICLE_PAGE = '''<html><head><meta property="og:url" content="https://example.com/noticia"></head>
+<body><article itemprop="articleBody"><p>Notícia sobre a região amazônica.</p></article></body></html>'''
+INCOMPLETE_PAGE = '<html><head><title>Carregando...</title></head><body><div id="app"></div></body></html>'
+ETAG = '"v1"'
+SLOW_RESPONSE_DELAY = 1.0
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    """Servidor local que simula as respostas dos portais de notícias."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, status: int, body: bytes = b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        if self.path == '/article':
+            self._send(200, ARTICLE_PAGE.encode('utf-8'), {'Content-Type': 'text/html; charset=utf-8'})
+        elif self.path == '/article-gzip':
+            self._send(200, gzip.compress(ARTICLE_PAGE.encode('utf-8')),
+                       {'Content-Type': 'text/html; charset=utf-8', 'Content-Encoding': 'gzip'})
+        elif self.path == '/incomplete':
+            self._send(200, INCOMPLETE_PAGE.encode('utf-8'), {'Content-Type': 'text/html; charset=utf-8'})
+        elif self.path == '/latin1':
+            self._send(200, ARTICLE_PAGE.encode('iso-8859-1'), {'Content-Type': 'text/html; charset=ISO-8859-1'})
+        elif self.path == '/no-charset':
+            self._send(200, ARTICLE_PAGE.encode('utf-8'), {'Content-Type': 'text/html'})
+        elif self.path == '/invalid-bytes':
+            self._send(200, ARTICLE_PAGE.encode('utf-8') + b'\xff\xfe', {'Content-Type': 'text/html; charset=utf-8'})
+        elif self.path == '/etag':
+            if self.headers.get('If-None-Match') == ETAG:
+                self._send(304, headers={'ETag': ETAG})
+            else:
+                self._send(200, ARTICLE_PAGE.encode('utf-8'), {'Content-Type': 'text/html; charset=utf-8', 'ETag': ETAG})
+        elif self.path.startswith('/status/'):
+            self._send(int(self.path.rsplit('/', 1)[1]), b'erro', {'Content-Type': 'text/plain', 'Retry-After': '1'})
+        elif self.path == '/slow':
+            time.sleep(SLOW_RESPONSE_DELAY)
+            self._send(200, ARTICLE_PAGE.encode('utf-8'), {'Content-Type': 'text/html; charset=utf-8'})
+        else:
+            self._send(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope='session', autouse=True)
+def logger(tmp_path_factory):
+    # os logs dos testes são gravados num diretório temporário, e não no diretório corrente
+    Logger._Logger__path = str(tmp_path_factory.mktemp('logs'))
+    Logger.configure()
+
+
+@pytest.fixture(scope='session')
+def http_server():
+    """Servidor HTTP local (em uma thread) com as páginas de teste; retorna a url base."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+    server.daemon_threads = True
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+    thread.join()
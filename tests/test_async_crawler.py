@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+from async_crawler import AsyncCrawler
+from conftest import ARTICLE_PAGE, ETAG
+from fetcher import PageFetcher, PageSource
+from retry import RetryPolicy
+from scheduler import PolitenessScheduler
+from scraper import WebScraper
+
+ARTICLE_PATHS = ['/article', '/status/404', '/status/500', '/etag', '/incomplete']
+
+
+class StubBrowserFetcher(PageFetcher):
+    """Substitui o navegador: registra as páginas solicitadas."""
+
+    def __init__(self):
+        self.urls = []
+
+    def fetch(self, url, selectors=(), headers=None):
+        self.urls.append(url)
+        return PageSource(ARTICLE_PAGE, final_url=url)
+
+
+class LocalScraper(WebScraper):
+    """Scraper do servidor local de testes: a listagem retorna sempre os mesmos artigos, que não são gravados."""
+
+    DOCUMENT_REQUIRED_SELECTORS = ('meta[property="og:url"]', 'article[itemprop="articleBody"]')
+    RETRY_POLICY = RetryPolicy(max_attempts=2, base_delay=0.01, max_delay=0.01)
+
+    def __init__(self, base_url: str, browser_fetcher: PageFetcher, recrawl: bool = False):
+        WebScraper.__init__(self, 1, 0, 0, False, False, False, fetch_engine=WebScraper.ENGINE_HTTP, recrawl=recrawl)
+        self._BASE_URL = base_url
+        self._NAME = 'LocalScraper'
+        self._browser_fetcher = browser_fetcher
+
+    def _get_listing_url(self, search_term: str, page: int):
+        return f'{self.get_base_url()}/article'
+
+    def _parse_listing(self, page_source: str, listing_url: str = None):
+        return [f'{self.get_base_url()}{path}' for path in ARTICLE_PATHS], False
+
+    def _create_browser_fetcher(self):
+        return self._browser_fetcher
+
+
+@pytest.fixture
+def browser_fetcher():
+    return StubBrowserFetcher()
+
+
+@pytest.fixture(autouse=True)
+def workdir(http_server, tmp_path, monkeypatch):
+    # o arquivo de falhas e o cache de downloads são gravados no diretório corrente
+    monkeypatch.chdir(tmp_path)
+    PolitenessScheduler.get_instance().set_rate(PolitenessScheduler.get_host(http_server), 1000, 100)
+    return tmp_path
+
+
+def _dead_letters(workdir):
+    with open(workdir / WebScraper.DEAD_LETTER_DIR_NAME / 'LocalScraper.jsonl', encoding='utf-8') as arq:
+        return {letter['url'].rsplit('/', 1)[1]: letter['attempts'] for letter in map(json.loads, arq)}
+
+
+def test_async_crawl_matches_sync_rules(http_server, browser_fetcher, workdir):
+    stats = AsyncCrawler([LocalScraper(http_server, browser_fetcher)]).run(['termo'])['LocalScraper']
+    assert stats['found'] == len(ARTICLE_PATHS)
+    # /article, /etag e /incomplete (pelo navegador)
+    assert stats['downloaded'] == 3
+    assert stats['failed'] == 2
+    assert stats['retried'] == 1
+    assert stats['browser'] == 1
+    assert browser_fetcher.urls == [f'{http_server}/incomplete']
+    assert _dead_letters(workdir) == {'404': 1, '500': 2}
+
+
+def test_async_recrawl_sends_conditional_request(http_server, browser_fetcher):
+    scraper = LocalScraper(http_server, browser_fetcher, recrawl=True)
+    scraper.get_fetch_cache().update(f'{http_server}/etag', PageSource(ARTICLE_PAGE, headers={'ETag': ETAG}))
+    stats = AsyncCrawler([scraper]).run(['termo'])['LocalScraper']
+    assert stats['unchanged'] == 1
+    assert stats['downloaded'] == 2
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import csv
+import re
+from contextlib import contextmanager
+
+import pytest
+
+from bulk_loader import BulkLoader
+from database import DatabaseManager
+from model import Article, ArticleTopic, ArticleBundle
+
+
+class FakeCursor:
+    """Simula o SGBD nas cargas do `BulkLoader`: as tabelas temporárias recebem o COPY e o INSERT ignora os artigos já gravados."""
+
+    def __init__(self, database):
+        self._database = database
+        self._staging = {}
+        self._result = []
+        self.rowcount = -1
+
+    def execute(self, query, args=None):
+        self._database.queries.append(query)
+        match = re.match(r'INSERT INTO (\w+) \(([^)]*)\).* FROM (staging_\w+)', query)
+        if not match:
+            return
+        table_name, columns, staging_table = match.group(1), match.group(2).split(', '), match.group(3)
+        rows = [dict(zip(columns, row)) for row in self._staging[staging_table]]
+        if table_name == 'article':
+            new_urls = {row['article_url'] for row in rows} - self._database.article_urls
+            self._database.article_urls |= new_urls
+            self._result = [(article_url,) for article_url in new_urls]
+            self.rowcount = len(new_urls)
+        else:
+            self._result = []
+            self.rowcount = len([row for row in rows if row['article_url'] in self._database.article_urls])
+
+    def copy_expert(self, query, spool):
+        # a carga é feita fora do lock do acumulador
+        assert not self._database.loader._lock.locked()
+        if self._database.fail_on_copy:
+            raise RuntimeError('copy failed')
+        self._staging[re.match(r'COPY (\w+)', query).group(1)] = list(csv.reader(spool))
+
+    def fetchall(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+
+    def __init__(self, database):
+        self._database = database
+
+    def cursor(self):
+        return FakeCursor(self._database)
+
+
+class FakeDatabase:
+
+    def __init__(self):
+        self.article_urls = {'https://example.com/existente'}
+        self.queries = []
+        self.fail_on_copy = False
+        self.loader = None
+
+
+@pytest.fixture
+def database(monkeypatch):
+    fake = FakeDatabase()
+
+    @contextmanager
+    def connection(sgbd_name):
+        yield FakeConnection(fake)
+
+    monkeypatch.setattr(DatabaseManager, 'connection', connection)
+    return fake
+
+
+def _bundle(article_url: str):
+    article = Article(article_url, 'site', '2022-01-01 10:00:00', None, 'Título, "com aspas"', None)
+    return ArticleBundle(article, 'texto', topics=[ArticleTopic(f'{article_url}/topico', article_url, 'tópico', 1)])
+
+
+def _new_loader(database, batch_size: int):
+    calls = {'saved': [], 'skipped': [], 'failed': []}
+    loader = BulkLoader(
+        batch_size=batch_size,
+        on_saved=calls['saved'].append,
+        on_skipped=calls['skipped'].append,
+        on_failure=lambda context, error: calls['failed'].append(context)
+    )
+    database.loader = loader
+    return loader, calls
+
+
+def test_loads_batches_and_reports_saved_and_skipped(database):
+    loader, calls = _new_loader(database, batch_size=2)
+    for article_url in ('https://example.com/a', 'https://example.com/existente', 'https://example.com/b'):
+        loader.add(_bundle(article_url), article_url)
+    # o primeiro lote é carregado ao atingir `batch_size`, o restante em `close`
+    assert calls['saved'] == ['https://example.com/a']
+    loader.close()
+    assert calls == {'saved': ['https://example.com/a', 'https://example.com/b'], 'skipped': ['https://example.com/existente'], 'failed': []}
+    assert database.queries.count('COMMIT') == 2
+
+
+def test_failed_batch_reports_every_article(database):
+    loader, calls = _new_loader(database, batch_size=10)
+    database.fail_on_copy = True
+    loader.add(_bundle('https://example.com/a'), 'a')
+    loader.add(_bundle('https://example.com/b'), 'b')
+    loader.close()
+    assert calls == {'saved': [], 'skipped': [], 'failed': ['a', 'b']}
+    assert 'ROLLBACK' in database.queries
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+import requests
+
+from fetcher import PageFetcher, PageSource, HttpFetcher, FallbackFetcher, AsyncHttpFetcher
+from conftest import ARTICLE_PAGE, ETAG
+
+REQUIRED_SELECTORS = ('meta[property="og:url"]', 'article[itemprop="articleBody"], div#glb-materia')
+BROWSER_PAGE = '<html><body><article itemprop="articleBody">renderizada</article></body></html>'
+
+
+class StubBrowserFetcher(PageFetcher):
+    """Substitui o navegador: registra as páginas solicitadas e retorna sempre a mesma página."""
+
+    def __init__(self):
+        self.requests = []
+
+    def fetch(self, url, selectors=(), headers=None):
+        self.requests.append((url, tuple(selectors)))
+        return PageSource(BROWSER_PAGE, final_url=url)
+
+
+@pytest.fixture
+def http_fetcher():
+    fetcher = HttpFetcher(timeout=5)
+    yield fetcher
+    fetcher.close()
+
+
+@pytest.fixture
+def browser_fetcher():
+    return StubBrowserFetcher()
+
+
+@pytest.fixture
+def fallback_fetcher(browser_fetcher):
+    fetcher = FallbackFetcher(HttpFetcher(timeout=0.3), browser_fetcher)
+    yield fetcher
+    fetcher.close()
+
+
+def test_http_fetch_returns_page_and_capture_data(http_server, http_fetcher):
+    page_source = http_fetcher.fetch(f'{http_server}/article')
+    assert page_source == ARTICLE_PAGE
+    assert page_source.status == 200
+    assert page_source.final_url == f'{http_server}/article'
+    assert page_source.content == ARTICLE_PAGE.encode('utf-8')
+    assert page_source.headers['Content-Type'] == 'text/html; charset=utf-8'
+
+
+def test_http_fetch_decompresses_gzip(http_server, http_fetcher):
+    page_source = http_fetcher.fetch(f'{http_server}/article-gzip')
+    assert page_source == ARTICLE_PAGE
+    assert page_source.headers['Content-Encoding'] == 'gzip'
+
+
+def test_http_fetch_conditional_request_not_modified(http_server, http_fetcher):
+    page_source = http_fetcher.fetch(f'{http_server}/etag', headers={'If-None-Match': ETAG})
+    assert PageSource.is_not_modified(page_source)
+    assert page_source == ''
+
+
+@pytest.mark.parametrize('status', [404, 500, 503])
+def test_http_fetch_raises_on_error_status(http_server, http_fetcher, status):
+    with pytest.raises(requests.HTTPError) as error:
+        http_fetcher.fetch(f'{http_server}/status/{status}')
+    assert error.value.response.status_code == status
+
+
+def test_http_fetch_timeout(http_server):
+    fetcher = HttpFetcher(timeout=0.2)
+    try:
+        with pytest.raises(requests.Timeout):
+            fetcher.fetch(f'{http_server}/slow')
+    finally:
+        fetcher.close()
+
+
+def test_http_fetch_uses_charset_from_header(http_server, http_fetcher):
+    page_source = http_fetcher.fetch(f'{http_server}/latin1')
+    assert page_source.encoding.lower() == 'iso-8859-1'
+    assert 'região amazônica' in page_source
+
+
+def test_http_fetch_without_charset_decodes_utf8(http_server, http_fetcher):
+    page_source = http_fetcher.fetch(f'{http_server}/no-charset')
+    assert page_source.encoding == 'utf-8'
+    assert 'região amazônica' in page_source
+
+
+def test_has_selectors():
+    assert FallbackFetcher.has_selectors(ARTICLE_PAGE, REQUIRED_SELECTORS)
+    assert FallbackFetcher.has_selectors('<meta property="og:url"><div id="glb-materia"></div>', REQUIRED_SELECTORS)
+    assert not FallbackFetcher.has_selectors('<meta property="og:url">', REQUIRED_SELECTORS)
+    assert FallbackFetcher.has_selectors('', ())
+
+
+def test_fallback_keeps_complete_http_page(http_server, fallback_fetcher, browser_fetcher):
+    page_source = fallback_fetcher.fetch(f'{http_server}/article', REQUIRED_SELECTORS)
+    assert page_source == ARTICLE_PAGE
+    assert browser_fetcher.requests == []
+
+
+def test_fallback_to_browser_when_selectors_missing(http_server, fallback_fetcher, browser_fetcher):
+    page_source = fallback_fetcher.fetch(f'{http_server}/incomplete', REQUIRED_SELECTORS)
+    assert page_source == BROWSER_PAGE
+    assert browser_fetcher.requests == [(f'{http_server}/incomplete', REQUIRED_SELECTORS)]
+
+
+def test_fallback_to_browser_when_http_times_out(http_server, fallback_fetcher, browser_fetcher):
+    page_source = fallback_fetcher.fetch(f'{http_server}/slow', REQUIRED_SELECTORS)
+    assert page_source == BROWSER_PAGE
+    assert [url for url, _ in browser_fetcher.requests] == [f'{http_server}/slow']
+
+
+def test_fallback_to_browser_when_connection_fails(fallback_fetcher, browser_fetcher):
+    # porta sem servidor: a conexão é recusada
+    page_source = fallback_fetcher.fetch('http://127.0.0.1:9/article', REQUIRED_SELECTORS)
+    assert page_source == BROWSER_PAGE
+    assert [url for url, _ in browser_fetcher.requests] == ['http://127.0.0.1:9/article']
+
+
+@pytest.mark.parametrize('status', [404, 429, 500, 503])
+def test_fallback_raises_error_status(http_server, fallback_fetcher, browser_fetcher, status):
+    with pytest.raises(requests.HTTPError) as error:
+        fallback_fetcher.fetch(f'{http_server}/status/{status}', REQUIRED_SELECTORS)
+    assert error.value.response.status_code == status
+    assert browser_fetcher.requests == []
+
+
+def test_fallback_keeps_not_modified_response(http_server, fallback_fetcher, browser_fetcher):
+    page_source = fallback_fetcher.fetch(f'{http_server}/etag', REQUIRED_SELECTORS, {'If-None-Match': ETAG})
+    assert PageSource.is_not_modified(page_source)
+    assert browser_fetcher.requests == []
+
+
+def _async_fetch(url: str):
+    async def fetch():
+        fetcher = AsyncHttpFetcher(timeout=5)
+        await fetcher.open()
+        try:
+            return await fetcher.fetch(url)
+        finally:
+            await fetcher.close()
+    return asyncio.run(fetch())
+
+
+def test_async_fetch_uses_charset_from_header(http_server):
+    page_source = _async_fetch(f'{http_server}/latin1')
+    assert page_source.encoding.lower() == 'iso-8859-1'
+    assert 'região amazônica' in page_source
+
+
+def test_async_fetch_replaces_invalid_bytes(http_server):
+    page_source = _async_fetch(f'{http_server}/invalid-bytes')
+    assert page_source.startswith(ARTICLE_PAGE)
+    assert page_source.endswith('\ufffd\ufffd')
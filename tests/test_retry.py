@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import aiohttp
+import pytest
+import requests
+
+import retry
+from retry import RetryPolicy, CircuitBreaker, DeadLetterFile
+
+
+class Clock:
+    """Relógio controlado pelo teste, no lugar de `monotonic`."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(retry, 'monotonic', fake)
+    return fake
+
+
+def http_error(status: int):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f'{status} Error', response=response)
+
+
+@pytest.mark.parametrize('status', RetryPolicy.RETRY_STATUS)
+def test_transient_status(status):
+    assert RetryPolicy.is_transient(http_error(status))
+    assert RetryPolicy.is_transient(aiohttp.ClientResponseError(None, (), status=status))
+
+
+@pytest.mark.parametrize('status', [400, 403, 404, 410])
+def test_permanent_status(status):
+    assert not RetryPolicy.is_transient(http_error(status))
+    assert not RetryPolicy.is_transient(aiohttp.ClientResponseError(None, (), status=status))
+
+
+@pytest.mark.parametrize('err', [
+    requests.ConnectionError(), requests.Timeout(), aiohttp.ClientConnectionError(), asyncio.TimeoutError(),
+    ConnectionResetError(),
+])
+def test_transient_network_errors(err):
+    assert RetryPolicy.is_transient(err)
+
+
+@pytest.mark.parametrize('err', [requests.HTTPError('sem resposta'), ValueError(), KeyError('url')])
+def test_permanent_errors(err):
+    assert not RetryPolicy.is_transient(err)
+
+
+def test_delay_is_capped():
+    policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=5.0)
+    assert all(0 <= policy.get_delay(attempt) <= min(5.0, 2 ** (attempt - 1)) for attempt in range(1, 11))
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60.0)
+    assert not breaker.record_failure()
+    assert not breaker.record_failure()
+    assert breaker.retry_in() == 0
+    assert breaker.record_failure()
+    assert breaker.is_open()
+    clock.now += 20
+    assert breaker.retry_in() == pytest.approx(40.0)
+
+
+def test_breaker_success_resets_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60.0)
+    breaker.record_failure()
+    breaker.record_success()
+    assert not breaker.record_failure()
+    assert not breaker.is_open()
+
+
+def test_breaker_half_open_allows_a_single_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.retry_in() == 0
+    # enquanto a requisição de teste não termina, as demais aguardam
+    assert breaker.retry_in() == CircuitBreaker.PROBE_POLL_INTERVAL
+    assert breaker.retry_in() == CircuitBreaker.PROBE_POLL_INTERVAL
+    breaker.record_success()
+    assert not breaker.is_open()
+    assert breaker.retry_in() == 0
+
+
+def test_breaker_reopens_when_probe_fails(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.retry_in() == 0
+    assert breaker.record_failure()
+    assert breaker.retry_in() == pytest.approx(60.0)
+
+
+def test_breaker_reissues_lost_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.retry_in() == 0
+    # o resultado do teste nunca é registrado: após `reset_timeout` outra requisição de teste é liberada
+    clock.now += 59.5
+    assert breaker.retry_in() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert breaker.retry_in() == 0
+    assert breaker.retry_in() == CircuitBreaker.PROBE_POLL_INTERVAL
+
+
+def test_dead_letter_file(tmp_path):
+    dead_letter = DeadLetterFile(str(tmp_path / 'dead_letter' / 'site.jsonl'))
+    assert dead_letter.pop_all() == []
+    dead_letter.add('https://example.com/a', http_error(500), 3)
+    dead_letter.add('https://example.com/b', requests.Timeout(), 3)
+    dead_letter.add('https://example.com/a', http_error(500), 3)
+    assert dead_letter.pop_all() == ['https://example.com/a', 'https://example.com/b']
+    assert dead_letter.pop_all() == []
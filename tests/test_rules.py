@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from rules import RuleMismatchError
+from scraper import AcriticaScraper, PortalAmazoniaScraper, G1Scraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures')
+# intervalo de busca que inclui todas as datas das páginas de exemplo
+TO_TIMESTAMP = 4102444800
+SCRAPERS = {
+    'acritica': AcriticaScraper,
+    'portalamazonia': PortalAmazoniaScraper,
+    'g1': G1Scraper,
+}
+ARTICLES = ['article_1.html', 'article_2.html', 'article_3.html']
+
+
+def read_fixture(site: str, file_name: str):
+    with open(os.path.join(FIXTURES_DIR, site, file_name), encoding='utf-8') as arq:
+        return arq.read()
+
+
+def new_scraper(site: str):
+    return SCRAPERS[site](0, 0, TO_TIMESTAMP, False, False, True)
+
+
+@pytest.mark.parametrize('site', SCRAPERS)
+@pytest.mark.parametrize('file_name', ARTICLES)
+def test_article_fixtures(site, file_name):
+    scraper = new_scraper(site)
+    bundle = scraper._build_bundle(f'{scraper.get_base_url()}/{file_name}', read_fixture(site, file_name))
+    article = bundle.article
+    assert article.article_url.startswith(scraper.get_base_url())
+    assert article.title and article.subtitle and article.author
+    assert article.published and article.modified and article.published <= article.modified
+    assert bundle.content
+    assert bundle.topics and bundle.hyperlinks and bundle.medias
+    assert all(entity.article_url == article.article_url for entity in bundle.topics + bundle.hyperlinks + bundle.medias)
+
+
+@pytest.mark.parametrize('site', SCRAPERS)
+def test_listing_fixtures(site):
+    scraper = new_scraper(site)
+    links, has_next = scraper._parse_listing(read_fixture(site, 'listing_1.html'), 'listing_1')
+    assert links and has_next
+    assert all(link.startswith(scraper.get_base_url()) for link in links)
+    assert scraper._parse_listing(read_fixture(site, 'listing_empty.html'), 'listing_empty') == ([], False)
+
+
+@pytest.mark.parametrize('site', SCRAPERS)
+def test_article_without_required_field_raises(site):
+    scraper = new_scraper(site)
+    with pytest.raises(RuleMismatchError):
+        scraper._build_bundle(scraper.get_base_url(), '<html><head></head><body><p>Página sem artigo</p></body></html>')
+
+
+@pytest.fixture
+def acritica():
+    return new_scraper('acritica')
+
+
+def test_acritica_listing_last_page(acritica):
+    # o portal não indica a última página: a paginação termina na primeira página sem resultados
+    links, has_next = acritica._parse_listing(read_fixture('acritica', 'listing_last.html'), 'listing_last')
+    assert links and has_next
+
+
+def test_acritica_listing_without_results_list_raises(acritica):
+    page_source = read_fixture('acritica', 'listing_1.html').replace('eOExTH', 'layout-novo')
+    with pytest.raises(RuleMismatchError) as err:
+        acritica._parse_listing(page_source, 'listing_1')
+    assert 'list' in err.value.missing_fields
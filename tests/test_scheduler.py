@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+import scheduler
+from scheduler import TokenBucket, PolitenessScheduler
+
+
+class Clock:
+    """Relógio controlado pelo teste, no lugar de `monotonic`."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(scheduler, 'monotonic', fake)
+    return fake
+
+
+def test_bucket_allows_burst_then_rate(clock):
+    bucket = TokenBucket(rate=2.0, capacity=3.0)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # sem fichas, as reservas seguintes aguardam na ordem de chegada
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+    clock.now += 1.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_bucket_pause(clock):
+    bucket = TokenBucket(rate=1.0, capacity=5.0)
+    bucket.pause(10.0)
+    assert bucket.reserve() == pytest.approx(10.0)
+    assert bucket.reserve() == pytest.approx(11.0)
+
+
+def test_hosts_are_independent(clock):
+    politeness = PolitenessScheduler(default_rate=1.0, default_burst=1.0)
+    assert politeness.reserve('https://a.example.com/1') == 0.0
+    assert politeness.reserve('https://a.example.com/2') == pytest.approx(1.0)
+    assert politeness.reserve('https://b.example.com/1') == 0.0
+
+
+def test_retry_after_pauses_host(clock):
+    politeness = PolitenessScheduler(default_rate=10.0, default_burst=10.0)
+    politeness.retry_after('https://a.example.com/1', '5')
+    assert politeness.reserve('https://a.example.com/2') == pytest.approx(5.0)
+    assert politeness.reserve('https://b.example.com/1') == 0.0
+
+
+def test_parse_retry_after():
+    assert PolitenessScheduler.parse_retry_after('12') == 12.0
+    assert PolitenessScheduler.parse_retry_after(None) == PolitenessScheduler.DEFAULT_RETRY_AFTER
+    assert PolitenessScheduler.parse_retry_after('amanhã') == PolitenessScheduler.DEFAULT_RETRY_AFTER
+    http_date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=120), usegmt=True)
+    assert 100 < PolitenessScheduler.parse_retry_after(http_date) <= 120
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+import requests
+
+from conftest import ARTICLE_PAGE
+from fetcher import PageFetcher, PageSource
+from retry import RetryPolicy
+from scraper import WebScraper, G1Scraper
+
+
+class StubBrowserFetcher(PageFetcher):
+    """Substitui o navegador: registra as páginas solicitadas."""
+
+    def __init__(self):
+        self.urls = []
+
+    def fetch(self, url, selectors=(), headers=None):
+        self.urls.append(url)
+        return PageSource(ARTICLE_PAGE, final_url=url)
+
+
+class HttpScraper(G1Scraper):
+    RETRY_POLICY = RetryPolicy(max_attempts=2, base_delay=0.01, max_delay=0.01)
+
+    def __init__(self, browser_fetcher):
+        G1Scraper.__init__(self, 1, 0, 0, False, False, False, fetch_engine=WebScraper.ENGINE_HTTP)
+        self._browser_fetcher = browser_fetcher
+
+    def _create_browser_fetcher(self):
+        return self._browser_fetcher
+
+
+@pytest.fixture
+def browser_fetcher():
+    return StubBrowserFetcher()
+
+
+@pytest.fixture
+def scraper(browser_fetcher, tmp_path, monkeypatch):
+    # o arquivo de falhas (dead letter) é gravado no diretório corrente
+    monkeypatch.chdir(tmp_path)
+    return HttpScraper(browser_fetcher)
+
+
+def _dead_letters(tmp_path):
+    with open(tmp_path / WebScraper.DEAD_LETTER_DIR_NAME / 'G1Scraper.jsonl', encoding='utf-8') as arq:
+        return [json.loads(line) for line in arq]
+
+
+def test_article_downloaded_over_http(http_server, scraper, browser_fetcher):
+    fetcher = scraper._create_fetcher()
+    try:
+        document_url, page_source = scraper._download_with_retry(fetcher, f'{http_server}/article')
+    finally:
+        fetcher.close()
+    assert document_url == f'{http_server}/article'
+    assert page_source == ARTICLE_PAGE
+    assert browser_fetcher.urls == []
+
+
+def test_missing_article_is_not_retried_nor_rendered(http_server, scraper, browser_fetcher, tmp_path):
+    fetcher = scraper._create_fetcher()
+    try:
+        with pytest.raises(requests.HTTPError):
+            scraper._download_with_retry(fetcher, f'{http_server}/status/404')
+    finally:
+        fetcher.close()
+    assert browser_fetcher.urls == []
+    assert scraper.get_stats()['retried'] == 0
+    assert [(letter['url'], letter['attempts']) for letter in _dead_letters(tmp_path)] == [(f'{http_server}/status/404', 1)]
+
+
+def test_server_error_is_retried_over_http(http_server, scraper, browser_fetcher, tmp_path):
+    fetcher = scraper._create_fetcher()
+    try:
+        with pytest.raises(requests.HTTPError):
+            scraper._download_with_retry(fetcher, f'{http_server}/status/500')
+    finally:
+        fetcher.close()
+    assert browser_fetcher.urls == []
+    assert scraper.get_stats()['retried'] == 1
+    assert [letter['attempts'] for letter in _dead_letters(tmp_path)] == [2]
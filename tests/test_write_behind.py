@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import pytest
+
+from database import ArticleBundleController
+from model import Article, ArticleBundle
+from write_behind import WriteBehindQueue
+
+
+class FakeController:
+    """Substitui `ArticleBundleController.save_many`: registra os lotes e falha a gravação dos artigos em `failing_urls`."""
+
+    def __init__(self):
+        self.batches = []
+        self.failing_urls = set()
+        self.fail_batch = False
+        self.release = threading.Event()
+        self.release.set()
+
+    def save_many(self, bundles, replace=False):
+        self.release.wait()
+        if self.fail_batch:
+            raise RuntimeError('database unavailable')
+        self.batches.append([bundle.article.article_url for bundle in bundles])
+        return [ValueError('duplicate') if bundle.article.article_url in self.failing_urls else None for bundle in bundles]
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    fake = FakeController()
+    monkeypatch.setattr(ArticleBundleController, 'save_many', fake.save_many)
+    return fake
+
+
+def _bundle(article_url: str):
+    return ArticleBundle(Article(article_url, 'site', '2022-01-01 10:00:00', None, 'Título', None), 'texto')
+
+
+def _new_queue(**kwargs):
+    calls = {'saved': [], 'failed': []}
+    queue = WriteBehindQueue(
+        'test', on_saved=calls['saved'].append, on_failure=lambda context, error: calls['failed'].append(context), **kwargs
+    )
+    return queue, calls
+
+
+def test_saves_in_batches(controller):
+    queue, calls = _new_queue(writers=1, batch_size=2, flush_interval=60.0)
+    for index in range(5):
+        queue.put(_bundle(f'https://example.com/{index}'), index)
+    # o último lote (incompleto) é gravado no encerramento da fila, sem aguardar `flush_interval`
+    queue.close()
+    assert [len(batch) for batch in controller.batches] == [2, 2, 1]
+    assert calls == {'saved': [0, 1, 2, 3, 4], 'failed': []}
+
+
+def test_flushes_incomplete_batch_after_interval(controller):
+    queue, _ = _new_queue(writers=1, batch_size=10, flush_interval=0.05)
+    saved = threading.Event()
+    queue._on_saved = lambda context: saved.set()
+    queue.put(_bundle('https://example.com/a'), 'a')
+    assert saved.wait(timeout=5)
+    queue.close()
+    assert controller.batches == [['https://example.com/a']]
+
+
+def test_reports_failures(controller):
+    controller.failing_urls = {'https://example.com/b'}
+    queue, calls = _new_queue(writers=1, batch_size=3, flush_interval=60.0)
+    for name in 'abc':
+        queue.put(_bundle(f'https://example.com/{name}'), name)
+    queue.close()
+    assert calls == {'saved': ['a', 'c'], 'failed': ['b']}
+
+
+def test_failed_batch_reports_every_article(controller):
+    controller.fail_batch = True
+    queue, calls = _new_queue(writers=2, batch_size=2, flush_interval=60.0)
+    for name in 'abc':
+        queue.put(_bundle(f'https://example.com/{name}'), name)
+    queue.close()
+    assert calls['saved'] == [] and sorted(calls['failed']) == ['a', 'b', 'c']
+
+
+def test_put_blocks_while_queue_is_full(controller):
+    controller.release.clear()
+    queue, calls = _new_queue(writers=1, max_size=1, batch_size=1, flush_interval=60.0)
+    queue.put(_bundle('https://example.com/a'), 'a')
+    queue.put(_bundle('https://example.com/b'), 'b')
+    producer = threading.Thread(target=queue.put, args=(_bundle('https://example.com/c'), 'c'))
+    producer.start()
+    producer.join(timeout=0.2)
+    # a gravação do primeiro artigo está bloqueada e a fila está cheia: o terceiro artigo aguarda espaço
+    assert producer.is_alive()
+    controller.release.set()
+    producer.join(timeout=5)
+    queue.close()
+    assert calls['saved'] == ['a', 'b', 'c']
@@ -1,4 +1,5 @@
 import datetime
+import os
 import tkinter as tk
 from datetime import datetime as dt
 
@@ -7,12 +8,19 @@ from tkinter import ttk
 from tkinter import messagebox
 from tkcalendar import DateEntry
 
+from async_crawler import AsyncCrawler
 from database import DatabaseManager
+from orchestrator import MultiSiteOrchestrator
 from scraper import AcriticaScraper, G1Scraper, PortalAmazoniaScraper
 
 
 class NewsScraperGUI(Tk):
 
+    DOWNLOAD_WORKERS = 4
+    PAGE_LOAD_TIMEOUT = 15
+    # os núcleos são divididos entre os três scrapers, que são executados ao mesmo tempo
+    PARSE_PROCESSES = max(1, (os.cpu_count() or 1) // 3)
+
     def __init__(self, title, width, height):
         super().__init__()
         self.title(title)
@@ -108,6 +116,18 @@ class NewsScraperGUI(Tk):
         )
         self.check_database.place(x=750, y=220)
 
+        # carga em massa (COPY) no banco de dados, para cargas históricas
+        self.bulk_load = tk.BooleanVar()
+        self.check_bulk_load = ttk.Checkbutton(
+            self.frame_keywords,
+            text='CARGA EM MASSA',
+            style=NewsScraperDefaultTheme.TCHECKBTN_STYLE_NAME,
+            variable=self.bulk_load,
+            onvalue=True,
+            offvalue=False
+        )
+        self.check_bulk_load.place(x=750, y=260)
+
         # date period
         self.label_from = ttk.Label(
             self.frame_keywords,
@@ -148,6 +168,42 @@ class NewsScraperGUI(Tk):
         )
         self.dt_entry_to.place(x=255, y=145)
 
+        # modo incremental: ignora os artigos já gravados no banco de dados
+        self.incremental = tk.BooleanVar()
+        self.check_incremental = ttk.Checkbutton(
+            self.frame_keywords,
+            text='APENAS ARTIGOS NOVOS',
+            style=NewsScraperDefaultTheme.TCHECKBTN_STYLE_NAME,
+            variable=self.incremental,
+            onvalue=True,
+            offvalue=False
+        )
+        self.check_incremental.place(x=25, y=220)
+
+        # modo de atualização: baixa novamente os artigos já gravados e atualiza apenas os que foram modificados
+        self.recrawl = tk.BooleanVar()
+        self.check_recrawl = ttk.Checkbutton(
+            self.frame_keywords,
+            text='ATUALIZAR ARTIGOS',
+            style=NewsScraperDefaultTheme.TCHECKBTN_STYLE_NAME,
+            variable=self.recrawl,
+            onvalue=True,
+            offvalue=False
+        )
+        self.check_recrawl.place(x=255, y=220)
+
+        # downloads HTTP assíncronos de todos os portais num único processo (AsyncCrawler)
+        self.async_download = tk.BooleanVar()
+        self.check_async_download = ttk.Checkbutton(
+            self.frame_keywords,
+            text='DOWNLOAD ASSÍNCRONO',
+            style=NewsScraperDefaultTheme.TCHECKBTN_STYLE_NAME,
+            variable=self.async_download,
+            onvalue=True,
+            offvalue=False
+        )
+        self.check_async_download.place(x=25, y=260)
+
         # action buttons - test database connection
         self.btn_conn = ttk.Button(
             master=self,
@@ -157,6 +213,15 @@ class NewsScraperGUI(Tk):
         )
         self.btn_conn.place(x=self.window_width-460, y=self.window_height-60)
 
+        # action buttons - download again the articles that failed in previous runs
+        self.btn_replay = ttk.Button(
+            master=self,
+            text='REPROCESSAR FALHAS',
+            style=NewsScraperDefaultTheme.TBUTTON_STYLE_NAME,
+            command=self.replay_failures
+        )
+        self.btn_replay.place(x=self.window_width-760, y=self.window_height-60)
+
         # action buttons - start scraper
         self.btn_iniciar = ttk.Button(
             master=self,
@@ -182,20 +247,42 @@ class NewsScraperGUI(Tk):
         except Exception as err:
             messagebox.showerror(title='ERRO!', message=f'NÃO FOI POSSÍVEL CONECTAR COM O BANCO DE DADOS: {str(err)}')
 
-    def start_scraping(self):
-        search_terms = [x.strip() for x in self.svar_keywords.get().split(',')]
+    def _create_scrapers(self):
         from_timestamp = dt.strptime(f"{self.dt_entry_from.get()} 00:00:00", '%d/%m/%Y %H:%M:%S').timestamp()
         to_timestamp = dt.strptime(f"{self.dt_entry_to.get()} 23:59:59", '%d/%m/%Y %H:%M:%S').timestamp()
 
         save_opt = [bool(x.get()) for x in self.save_options]
+        incremental = bool(self.incremental.get())
+        recrawl = bool(self.recrawl.get())
+        bulk_load = bool(self.bulk_load.get())
         scrapers = [
-            AcriticaScraper(5, from_timestamp, to_timestamp, save_opt[0], save_opt[1], save_opt[2]),
-            PortalAmazoniaScraper(5, from_timestamp, to_timestamp, save_opt[0], save_opt[1], save_opt[2]),
-            G1Scraper(5, from_timestamp, to_timestamp, save_opt[0], save_opt[1], save_opt[2])
+            AcriticaScraper(NewsScraperGUI.PAGE_LOAD_TIMEOUT, from_timestamp, to_timestamp, save_opt[0], save_opt[1], save_opt[2], NewsScraperGUI.DOWNLOAD_WORKERS, parse_processes=NewsScraperGUI.PARSE_PROCESSES, incremental=incremental, recrawl=recrawl, bulk_load=bulk_load),
+            PortalAmazoniaScraper(NewsScraperGUI.PAGE_LOAD_TIMEOUT, from_timestamp, to_timestamp, save_opt[0], save_opt[1], save_opt[2], NewsScraperGUI.DOWNLOAD_WORKERS, parse_processes=NewsScraperGUI.PARSE_PROCESSES, incremental=incremental, recrawl=recrawl, bulk_load=bulk_load),
+            G1Scraper(NewsScraperGUI.PAGE_LOAD_TIMEOUT, from_timestamp, to_timestamp, save_opt[0], save_opt[1], save_opt[2], NewsScraperGUI.DOWNLOAD_WORKERS, parse_processes=NewsScraperGUI.PARSE_PROCESSES, incremental=incremental, recrawl=recrawl, bulk_load=bulk_load)
         ]
-        for scraper, use in zip(scrapers, [x.get() for x in self.use_scraper]):
-            if use:
-                scraper.start(search_terms)
+        return [scraper for scraper, use in zip(scrapers, [x.get() for x in self.use_scraper]) if use]
+
+    def start_scraping(self):
+        search_terms = [x.strip() for x in self.svar_keywords.get().split(',')]
+        if self.async_download.get():
+            results = AsyncCrawler(self._create_scrapers()).run(search_terms)
+        else:
+            results = MultiSiteOrchestrator(self._create_scrapers()).run(search_terms)
+        self._show_results(results)
+
+    def replay_failures(self):
+        # as urls do arquivo de falhas não passam pela busca, por isso o período e os termos de busca são ignorados
+        results = MultiSiteOrchestrator(self._create_scrapers()).replay_dead_letters()
+        self._show_results(results)
+
+    @staticmethod
+    def _show_results(results):
+        if results:
+            summary = '\n'.join(
+                f"{name}: {result['downloaded']}/{result['found']} ARTIGOS, {result['skipped']} JÁ GRAVADOS, {result['unchanged']} SEM ALTERAÇÕES, {result['failed']} FALHAS"
+                for name, result in results.items()
+            )
+            messagebox.showinfo(title='BUSCA FINALIZADA', message=summary)
 
     def on_closing(self):
         if messagebox.askokcancel("SAIR", "Deseja realmente finalizar a aplicação?"):
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+from queue import Queue, Empty
+from threading import Thread, Lock
+from time import perf_counter, monotonic
+
+from database import ArticleBundleController
+from logs import Logger
+from metrics import LatencyHistogram
+from model import ArticleBundle
+
+
+class WriteBehindQueue:
+    """
+    Fila de gravação em segundo plano (write-behind) dos artigos no banco de dados.
+
+    Os artigos extraídos são enfileirados (`put`) numa fila limitada, e threads de gravação dedicadas retiram-nos em lotes
+    de até `batch_size` artigos, ou com os artigos que chegarem em até `flush_interval` segundos, gravando cada lote numa
+    única transação (`ArticleBundleController.save_many`). Assim, a latência do SGBD não atrasa o download das páginas.
+
+    Cada artigo pode ser enfileirado com um contexto (ex.: a url da página), entregue à função `on_saved` depois que o
+    artigo for gravado, ou à função `on_failure` (junto com o erro) se a gravação falhar.
+
+    Quando a fila está cheia, `put` bloqueia até que as threads de gravação liberem espaço (backpressure), e o tempo de
+    espera é registrado no `LatencyHistogram` `WAIT_LATENCY_NAME`. `close` grava os artigos pendentes e encerra as threads.
+
+    Constants:
+        - WAIT_LATENCY_NAME (str): Nome do histograma com o tempo de espera por espaço na fila.
+    """
+
+    WAIT_LATENCY_NAME = 'DATABASE WRITE QUEUE WAIT'
+
+    def __init__(self, name: str, writers: int = 2, max_size: int = 100, batch_size: int = 20, flush_interval: float = 1.0,
+                 replace: bool = False, on_saved=None, on_failure=None):
+        """
+        :param name: Nome da fila, utilizado no nome das threads de gravação.
+        :param writers: Quantidade de threads de gravação.
+        :param max_size: Quantidade máxima de artigos na fila.
+        :param batch_size: Quantidade máxima de artigos de cada lote.
+        :param flush_interval: Tempo máximo (em segundos) de espera pelos artigos de um lote incompleto.
+        :param replace: Se `True` os artigos já gravados são atualizados (`ArticleBundleController.save_many`).
+        :param on_saved: Função chamada com o contexto de cada artigo gravado.
+        :param on_failure: Função chamada com o contexto e o erro de cada artigo que não foi gravado.
+        """
+        self.name = name
+        self.writers = max(1, writers)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.replace = replace
+        self._on_saved = on_saved
+        self._on_failure = on_failure
+        self._queue = Queue(maxsize=max(1, max_size))
+        self._threads = []
+        self._lock = Lock()
+
+    def _start(self):
+        with self._lock:
+            if not self._threads:
+                self._threads = [
+                    Thread(target=self._writer, name=f'{self.name}-writer-{writer_id}', daemon=True)
+                    for writer_id in range(1, self.writers + 1)
+                ]
+                for thread in self._threads:
+                    thread.start()
+
+    def put(self, bundle: ArticleBundle, context=None):
+        """Enfileira o artigo (e o seu contexto) para gravação, aguardando espaço na fila se ela estiver cheia."""
+        self._start()
+        started = perf_counter()
+        self._queue.put((bundle, context))
+        LatencyHistogram.get(WriteBehindQueue.WAIT_LATENCY_NAME).observe(perf_counter() - started)
+
+    def _writer(self):
+        stop = False
+        while not stop:
+            batch = []
+            # `None` indica o encerramento da thread, depois de gravar o lote em andamento
+            item = self._queue.get()
+            deadline = monotonic() + self.flush_interval
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - monotonic()))
+                except Empty:
+                    break
+            stop = item is None
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        Logger.info(f"\tSAVING {len(batch)} ARTICLES INTO DATABASE")
+        try:
+            errors = ArticleBundleController.save_many([bundle for bundle, _ in batch], self.replace)
+        except Exception as error:
+            Logger.error(f"BATCH OF {len(batch)} ARTICLES NOT SAVED: {str(error)}")
+            errors = [error] * len(batch)
+        for (_, context), error in zip(batch, errors):
+            try:
+                if error is None:
+                    if self._on_saved:
+                        self._on_saved(context)
+                elif self._on_failure:
+                    self._on_failure(context, error)
+            except Exception as err:
+                Logger.error(f"WRITE QUEUE CALLBACK FAILED: {str(err)}")
+
+    def close(self):
+        """Grava os artigos pendentes da fila e encerra as threads de gravação."""
+        with self._lock:
+            threads = self._threads
+            self._threads = []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()